@@ -3,11 +3,12 @@ import re
 
 from django import forms
 from django.conf import settings
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.http import JsonResponse
 from django.urls import path, reverse
 from django.utils.html import format_html, mark_safe
 
+from core.services.bulk_publication import bulk_set_published
 from core.services.vk_cloud_storage import upload_media_to_vk_cloud
 
 from .models import Articles, ArticlesContentBlock
@@ -229,6 +230,7 @@ class ArticlesAdmin(admin.ModelAdmin):
     list_display = ("title", "slug", "is_published", "created_at", "updated_at")
     list_editable = ("is_published",)
     list_filter = ("is_published", "created_at", "updated_at")
+    actions = ("publish_selected", "unpublish_selected")
     search_fields = ("title", "slug", "seo_title", "seo_description", "excerpt")
     prepopulated_fields = {"slug": ("title",)}
     inlines = [ContentBlockInline]
@@ -298,6 +300,16 @@ class ArticlesAdmin(admin.ModelAdmin):
         ]
         return custom_urls + super().get_urls()
 
+    @admin.action(description="Publish selected articles")
+    def publish_selected(self, request, queryset):
+        updated = bulk_set_published(queryset, True)
+        self.message_user(request, f"Published {updated} article(s).", messages.SUCCESS)
+
+    @admin.action(description="Unpublish selected articles")
+    def unpublish_selected(self, request, queryset):
+        updated = bulk_set_published(queryset, False)
+        self.message_user(request, f"Unpublished {updated} article(s).", messages.SUCCESS)
+
     def inline_image_upload_view(self, request):
         if request.method != "POST":
             return JsonResponse({"success": False, "error": "POST method is required."}, status=405)
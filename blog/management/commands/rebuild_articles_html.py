@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
 
 from blog.models import Articles
+from blog.services.article_cards import refresh_article_cards
 from core.services.build_item_html import build_item_detail_static_html, delete_item_detail_static_html
+from core.services.response_cache import ARTICLES_CONTENT, bump_content_versions
 
 
 class Command(BaseCommand):
@@ -29,4 +31,7 @@ class Command(BaseCommand):
                 delete_item_detail_static_html(article, 'articles')
                 deleted += 1
 
-        self.stdout.write(self.style.SUCCESS(f"Rebuilt: {rebuilt}, deleted: {deleted}"))
+        cards = refresh_article_cards()
+        bump_content_versions(ARTICLES_CONTENT)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt: {rebuilt}, deleted: {deleted}, API cards: {cards}"))
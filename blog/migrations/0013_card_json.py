@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_alter_articlescontentblock_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articles',
+            name='card_json',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Card JSON'),
+        ),
+    ]
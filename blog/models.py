@@ -24,6 +24,8 @@ class Articles(BaseContentItem):
     seo_keywords = models.CharField(max_length=500, blank=True, default="", verbose_name="SEO keywords")
     seo_robots = models.CharField(max_length=32, default="index,follow", verbose_name="SEO robots")
     canonical_url = models.URLField(max_length=1024, blank=True, default="", verbose_name="Canonical URL")
+    # List API card (with photos) serialized on save; empty until the first refresh.
+    card_json = models.TextField(blank=True, default="", editable=False, verbose_name="Card JSON")
 
     class Meta:
         verbose_name = "\u0421\u0442\u0430\u0442\u044c\u044f"
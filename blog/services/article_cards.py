@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from django.db.models import Prefetch
+
+from blog.models import Articles, ArticlesContentBlock
+from blog.services.article_rendering import build_public_article_path
+from core.services.json_fragments import dump_json_fragment
+from core.services.sparse_fields import build_only_columns
+
+# Columns the list API reads when the cards are already materialized (plus the keyset ordering).
+ARTICLE_CARD_COLUMNS = ("id", "created_at", "card_json")
+
+
+def _image_blocks_prefetch() -> Prefetch:
+    return Prefetch(
+        "blocks",
+        queryset=ArticlesContentBlock.objects.filter(
+            type=ArticlesContentBlock.IMAGE,
+            media__isnull=False,
+        )
+        .exclude(media="")
+        .order_by("order"),
+        to_attr="image_blocks",
+    )
+
+
+def _build_article_photos(article: Articles) -> list[dict[str, str]]:
+    image_blocks = getattr(article, "image_blocks", None)
+    if image_blocks is None:
+        image_blocks = (
+            article.blocks.filter(type=ArticlesContentBlock.IMAGE, media__isnull=False)
+            .exclude(media="")
+            .order_by("order")
+        )
+
+    return [
+        {
+            "url": block.media,
+            "alt": (block.media_alt or "").strip() or article.title,
+        }
+        for block in image_blocks
+    ]
+
+
+# Keys of a list API card, in response order.
+_ARTICLE_CARD_BUILDERS = {
+    "id": lambda article: article.id,
+    "slug": lambda article: article.slug,
+    "title": lambda article: article.title,
+    "excerpt": lambda article: (article.excerpt or article.seo_description or "").strip(),
+    "preview_image": lambda article: article.preview_image or None,
+    "preview_image_alt": lambda article: (article.preview_image_alt or "").strip(),
+    "url": lambda article: build_public_article_path(article.slug),
+    "photos": _build_article_photos,
+    "publication_date": lambda article: article.created_at.isoformat(),
+}
+ARTICLE_CARD_KEYS = tuple(_ARTICLE_CARD_BUILDERS)
+ARTICLE_CARD_COLUMNS_BY_KEY = {
+    "excerpt": ("excerpt", "seo_description"),
+    "url": ("slug",),
+    "photos": ("title",),
+    "publication_date": ("created_at",),
+}
+
+
+def build_article_card_payload(article: Articles, keys: tuple[str, ...] = ARTICLE_CARD_KEYS) -> dict[str, object]:
+    return {key: _ARTICLE_CARD_BUILDERS[key](article) for key in keys}
+
+
+def get_sparse_article_cards_queryset(queryset, keys: tuple[str, ...]):
+    """`queryset` narrowed to the columns (and prefetch) the card `keys` need."""
+    queryset = queryset.only(*build_only_columns(keys, ARTICLE_CARD_COLUMNS_BY_KEY, always=("id", "created_at")))
+    if "photos" in keys:
+        queryset = queryset.prefetch_related(_image_blocks_prefetch())
+    return queryset
+
+
+def refresh_article_cards(article_ids=None) -> int:
+    """Re-serialize the list cards of `article_ids` (all articles when None) with one prefetch."""
+    queryset = Articles.objects.prefetch_related(_image_blocks_prefetch()).order_by("pk")
+    if article_ids is not None:
+        queryset = queryset.filter(pk__in=list(article_ids))
+
+    articles = list(queryset)
+    for article in articles:
+        article.card_json = dump_json_fragment(build_article_card_payload(article))
+    Articles.objects.bulk_update(articles, ["card_json"], batch_size=500)
+    return len(articles)
+
+
+def get_article_card_fragments(articles) -> list[str]:
+    """
+    Serialized cards of `articles`, loaded with `ARTICLE_CARD_COLUMNS` only.
+
+    Rows saved before cards were materialized are built in one extra query.
+    """
+    articles = list(articles)
+    missing_ids = [article.pk for article in articles if not article.card_json]
+    built_cards = {}
+    if missing_ids:
+        for article in Articles.objects.prefetch_related(_image_blocks_prefetch()).filter(pk__in=missing_ids):
+            built_cards[article.pk] = dump_json_fragment(build_article_card_payload(article))
+    return [
+        article.card_json or built_cards[article.pk]
+        for article in articles
+        if article.card_json or article.pk in built_cards
+    ]
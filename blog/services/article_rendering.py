@@ -5,8 +5,13 @@ from django.conf import settings
 from django.utils import timezone
 from django.utils.safestring import mark_safe
 
+from core.services.resource_hints import build_page_resource_hints, get_media_preview_url
+
 from .rich_text import sanitize_article_body_html
 
+# Sidebar media sits below the article text once the grid collapses (see article.css).
+ARTICLE_MEDIA_HERO_MEDIA_QUERY = "(min-width: 969px)"
+
 
 def build_public_article_path(slug: str) -> str:
     return f"/articles/{slug}/"
@@ -123,6 +128,11 @@ def build_article_render_context(article):
     sanitized_body_html = sanitize_article_body_html(getattr(article, "body_html", ""))
     media_list, has_video = _build_article_media(article)
     related_articles = _build_related_articles(article)
+    resource_hints = build_page_resource_hints(
+        hero_image=get_media_preview_url(media_list[0] if media_list else None),
+        hero_media=ARTICLE_MEDIA_HERO_MEDIA_QUERY,
+        media_urls=[get_media_preview_url(item) for item in media_list[1:]],
+    )
 
     article_path = build_public_article_path(article.slug)
     article_url = build_public_article_url(article.slug)
@@ -190,5 +200,6 @@ def build_article_render_context(article):
     return {
         "article": article,
         "related_articles": related_articles,
+        "resource_hints": resource_hints,
         "article_json_ld": mark_safe(json.dumps(article_json_ld, ensure_ascii=False)),
     }
@@ -1,44 +1,22 @@
-from django.db import transaction
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.utils import timezone
 
-from core.services.build_item_html import build_item_detail_static_html, delete_item_detail_static_html
-from core.services.sitemap import build_public_sitemaps
+from core.services.regeneration import regeneration_batch
+from core.services.response_cache import ARTICLES_CONTENT
 
 from .models import Articles, ArticlesContentBlock
 
 
 def _schedule_article_rebuild(instance, previous_slug=None, previous_is_published=False):
-    def callback():
+    with regeneration_batch() as batch:
         if previous_slug and previous_slug != instance.slug and previous_is_published:
-            delete_item_detail_static_html(instance, "articles", slug_override=previous_slug)
+            batch.remove_article_page(instance, previous_slug)
+        batch.add_article(instance.pk, saved=True)
 
-        if instance.is_published:
-            build_item_detail_static_html(instance, "article_detail.html", "articles")
-        else:
-            delete_item_detail_static_html(instance, "articles")
 
-        build_public_sitemaps()
-
-    transaction.on_commit(callback)
-
-
-def _schedule_article_rebuild_by_id(article_id: int):
-    def callback():
-        article = Articles.objects.filter(pk=article_id).first()
-        if not article:
-            build_public_sitemaps()
-            return
-
-        if article.is_published:
-            build_item_detail_static_html(article, "article_detail.html", "articles")
-        else:
-            delete_item_detail_static_html(article, "articles")
-
-        build_public_sitemaps()
-
-    transaction.on_commit(callback)
+def _schedule_article_touch(article_id: int):
+    with regeneration_batch() as batch:
+        batch.touch_article(article_id)
 
 
 @receiver(pre_save, sender=Articles)
@@ -48,14 +26,13 @@ def article_pre_save_handler(sender, instance, **kwargs):
         instance._previous_is_published = False
         return
 
-    previous = sender.objects.filter(pk=instance.pk).values("slug", "is_published").first()
-    if not previous:
-        instance._previous_slug = None
-        instance._previous_is_published = False
-        return
+    previous = instance.get_loaded_values()
+    if not set(Articles.TRACKED_FIELDS) <= previous.keys():
+        # Built by hand or loaded with deferred fields: ask the database.
+        previous = sender.objects.filter(pk=instance.pk).values("slug", "is_published").first() or {}
 
-    instance._previous_slug = previous["slug"]
-    instance._previous_is_published = previous["is_published"]
+    instance._previous_slug = previous.get("slug")
+    instance._previous_is_published = previous.get("is_published", False)
 
 
 @receiver(post_save, sender=Articles)
@@ -65,26 +42,33 @@ def article_save_handler(sender, instance, **kwargs):
         previous_slug=getattr(instance, "_previous_slug", None),
         previous_is_published=getattr(instance, "_previous_is_published", False),
     )
+    instance.remember_tracked_fields()
 
 
 @receiver(post_delete, sender=Articles)
 def article_delete_handler(sender, instance, **kwargs):
-    _schedule_article_rebuild(instance)
+    with regeneration_batch() as batch:
+        batch.remove_article_page(instance)
 
 
 @receiver(post_save, sender=ArticlesContentBlock)
 def block_save_handler(sender, instance, **kwargs):
-    article_id = instance.article_id
-    Articles.objects.filter(pk=article_id).update(updated_at=timezone.now())
-    _schedule_article_rebuild_by_id(article_id)
+    _schedule_article_touch(instance.article_id)
 
 
 @receiver(post_delete, sender=ArticlesContentBlock)
 def block_delete_handler(sender, instance, **kwargs):
     article_id = instance.article_id
     if not article_id:
-        transaction.on_commit(build_public_sitemaps)
+        with regeneration_batch() as batch:
+            batch.add_sitemaps()
         return
 
-    Articles.objects.filter(pk=article_id).update(updated_at=timezone.now())
-    _schedule_article_rebuild_by_id(article_id)
+    _schedule_article_touch(article_id)
+
+
+@receiver([post_save, post_delete], sender=Articles)
+@receiver([post_save, post_delete], sender=ArticlesContentBlock)
+def article_api_responses_handler(sender, using=None, **kwargs):
+    with regeneration_batch(using) as batch:
+        batch.add_api_content(ARTICLES_CONTENT)
@@ -1,4 +1,6 @@
 import tempfile
+import json
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
@@ -12,12 +14,14 @@ from django.urls import reverse
 from django.utils import timezone
 
 from blog.models import Articles, ArticlesContentBlock
+from blog.services.article_cards import refresh_article_cards
 from blog.services.article_rendering import _format_article_date_ru, build_article_render_context
 from blog.services.rich_text import (
     normalize_legacy_text_to_html,
     sanitize_article_body_html,
     validate_lead_block_structure,
 )
+from core.services.keyset_pagination import encode_cursor
 
 
 class RichTextServiceTests(TestCase):
@@ -164,6 +168,125 @@ class ArticleDetailViewTests(TestCase):
         self.assertContains(response, '/js/video-player.js?v=2026-03-10-1')
         self.assertContains(response, 'data-page="article"')
 
+    def test_static_first_article_detail_serves_fresh_file_and_queues_stale_one_for_rebuild(self):
+        article = Articles.objects.create(
+            title="Static First",
+            slug="static-first",
+            body_html="<p>Body</p>",
+            seo_title="SEO Title",
+            seo_description="SEO Description",
+            is_published=True,
+        )
+        other_article = Articles.objects.create(
+            title="Other",
+            slug="other-article",
+            body_html="<p>Body</p>",
+            is_published=True,
+        )
+        url = reverse("blog:article_detail", kwargs={"slug": article.slug})
+
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(
+            GENERATED_HTML_PAGES_PATH=temp_dir,
+            STATIC_FIRST_VIEWS_ENABLED=True,
+        ):
+            page_path = Path(temp_dir) / "articles" / article.slug / "index.html"
+
+            # A missing page is rendered by the view and written alone once the response is closed.
+            with (
+                patch("core.services.regeneration.request_sitemap_rebuild") as sitemap_rebuild_mock,
+                patch("core.services.regeneration.bump_content_versions") as bump_versions_mock,
+            ):
+                missed = self.client.get(url)
+            sitemap_rebuild_mock.assert_not_called()
+            bump_versions_mock.assert_not_called()
+            self.assertFalse((Path(temp_dir) / "articles" / other_article.slug).exists())
+            self.assertFalse(missed.streaming)
+            self.assertContains(missed, "Static First")
+            self.assertIn("Static First", page_path.read_text(encoding="utf-8"))
+
+            page_path.write_text("<p>served from disk</p>", encoding="utf-8")
+            served = self.client.get(url)
+            self.assertEqual(b"".join(served.streaming_content), b"<p>served from disk</p>")
+            self.assertNotIn("Content-Disposition", served)
+            self.assertIn("ETag", served)
+
+            # The page lists other articles as related, so editing one of them makes the file stale.
+            other_article.title = "Other edited"
+            other_article.save()
+            related_changed = self.client.get(url)
+            self.assertFalse(related_changed.streaming)
+            self.assertContains(related_changed, "Other edited")
+            self.assertIn("Other edited", page_path.read_text(encoding="utf-8"))
+
+            os.utime(page_path, (0, 0))
+            stale = self.client.get(url)
+            self.assertContains(stale, "Static First")
+            self.assertIn("Static First", page_path.read_text(encoding="utf-8"))
+
+            with override_settings(STATIC_PAGES_ACCEL_REDIRECT_PREFIX="/_generated/"):
+                handed_off = self.client.get(url)
+            self.assertEqual(handed_off["X-Accel-Redirect"], f"/_generated/articles/{article.slug}/index.html")
+            self.assertEqual(handed_off.content, b"")
+
+    def test_article_detail_etag_changes_when_a_related_article_is_published(self):
+        article = Articles.objects.create(
+            title="Main",
+            slug="main-article",
+            body_html="<p>Body</p>",
+            is_published=True,
+        )
+        draft = Articles.objects.create(
+            title="Draft",
+            slug="draft-article",
+            body_html="<p>Body</p>",
+            is_published=False,
+        )
+        url = reverse("blog:article_detail", kwargs={"slug": article.slug})
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        draft.is_published = True
+        draft.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertContains(changed, "Draft")
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_article_detail_preloads_first_sidebar_media_and_lazy_loads_the_rest(self):
+        article = Articles.objects.create(
+            title="Article",
+            slug="article-with-hints",
+            body_html="<p>Body</p>",
+            seo_title="SEO Title",
+            seo_description="SEO Description",
+            is_published=True,
+        )
+        ArticlesContentBlock.objects.create(
+            article=article,
+            type=ArticlesContentBlock.IMAGE,
+            order=1,
+            media="https://media.example.net/hero.jpg",
+            media_alt="Hero alt",
+        )
+        ArticlesContentBlock.objects.create(
+            article=article,
+            type=ArticlesContentBlock.IMAGE,
+            order=2,
+            media="https://media.example.net/second.jpg",
+            media_alt="Second alt",
+        )
+
+        response = self.client.get(reverse("blog:article_detail", kwargs={"slug": article.slug}))
+        html = response.content.decode("utf-8")
+
+        self.assertIn('<link rel="preconnect" href="https://media.example.net" />', html)
+        self.assertIn('href="https://media.example.net/hero.jpg"', html)
+        self.assertIn('media="(min-width: 969px)"', html)
+        self.assertEqual(html.count('fetchpriority="high"'), 2)
+        self.assertRegex(html, r'src="https://media\.example\.net/second\.jpg"\s+alt="Second alt"\s+loading="lazy"')
+
 
 class ArticleApiTests(TestCase):
     def test_articles_list_returns_publication_date_and_sidebar_photos_only(self):
@@ -218,6 +341,40 @@ class ArticleApiTests(TestCase):
         self.assertNotIn("https://example.com/inline.jpg", str(item["photos"]))
         self.assertNotIn("video.mp4", str(item["photos"]))
 
+    def test_articles_list_cursor_mode_rejects_badly_typed_cursor_values(self):
+        for cursor in (["2026-01-01T00:00:00+00:00", "abc"], [1, 2]):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse("blog:articles_list"), {"cursor": encode_cursor(cursor)})
+
+                self.assertEqual(response.status_code, 400)
+
+    def test_articles_list_splices_materialized_cards_into_the_same_response(self):
+        for index in range(3):
+            article = Articles.objects.create(
+                title=f"Card Article {index}",
+                slug=f"card-article-{index}",
+                body_html="<p>Body</p>",
+                seo_description="SEO Description",
+                is_published=True,
+            )
+            ArticlesContentBlock.objects.create(
+                article=article,
+                type=ArticlesContentBlock.IMAGE,
+                order=1,
+                media=f"https://example.com/card-{index}.jpg",
+                media_alt="Кадр",
+            )
+
+        params = {"limit": 2, "page": 1}
+        built_on_the_fly = self.client.get(reverse("blog:articles_list"), params).content
+
+        self.assertEqual(refresh_article_cards(), 3)
+        with self.assertNumQueries(3):
+            materialized = self.client.get(reverse("blog:articles_list"), params).content
+
+        self.assertEqual(materialized, built_on_the_fly)
+        self.assertEqual(len(json.loads(materialized)["data"]), 2)
+
     def test_articles_list_returns_empty_photos_and_keeps_photos_scoped_per_article(self):
         first_article = Articles.objects.create(
             title="First Article",
@@ -257,6 +414,70 @@ class ArticleApiTests(TestCase):
         )
         self.assertEqual(items_by_slug["second-article"]["photos"], [])
 
+    def test_articles_list_returns_sparse_fields_without_photos_prefetch(self):
+        article = Articles.objects.create(
+            title="Sparse Article",
+            slug="sparse-article",
+            body_html="<p>Body</p>",
+            excerpt="Excerpt",
+            is_published=True,
+        )
+        ArticlesContentBlock.objects.create(
+            article=article,
+            type=ArticlesContentBlock.IMAGE,
+            order=1,
+            media="https://example.com/sparse.jpg",
+        )
+
+        # Validators, COUNT and the page: no photos prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog:articles_list"), {"fields": "slug,publication_date"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"],
+            [{"slug": "sparse-article", "publication_date": article.created_at.isoformat()}],
+        )
+
+        with_photos = self.client.get(reverse("blog:articles_list"), {"fields": "photos"}).json()["data"]
+        self.assertEqual(with_photos, [{"photos": [{"url": "https://example.com/sparse.jpg", "alt": "Sparse Article"}]}])
+
+    def test_articles_list_rejects_unknown_fields(self):
+        response = self.client.get(reverse("blog:articles_list"), {"fields": "slug,body_html"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Unknown fields: body_html."})
+
+    def test_articles_batch_returns_cards_in_requested_order(self):
+        for slug in ("first", "second"):
+            Articles.objects.create(title=slug.title(), slug=slug, body_html="<p>Body</p>", is_published=True)
+        Articles.objects.create(title="Draft", slug="draft", body_html="<p>Body</p>", is_published=False)
+        refresh_article_cards()
+
+        # Validators and the materialized cards.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("blog:articles_batch"), {"slugs": "second,draft,first,gone"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual([item["slug"] for item in payload["data"]], ["second", "first"])
+        self.assertEqual(payload["missing"], ["draft", "gone"])
+        self.assertEqual(
+            payload["data"][1],
+            self.client.get(reverse("blog:articles_list"), {"limit": 10}).json()["data"][1],
+        )
+
+        sparse = self.client.get(reverse("blog:articles_batch"), {"slugs": "first", "fields": "title"}).json()
+        self.assertEqual(sparse, {"missing": [], "data": [{"title": "First"}]})
+        self.assertEqual(self.client.get(reverse("blog:articles_batch")).status_code, 400)
+
+    def test_article_slug_batch_reaches_the_article_detail(self):
+        Articles.objects.create(title="Batch Article", slug="batch", body_html="<p>Body</p>", is_published=True)
+
+        response = self.client.get(reverse("blog:article_detail", kwargs={"slug": "batch"}))
+
+        self.assertContains(response, "Batch Article")
+
 
 class MigrationTestCase(TransactionTestCase):
     migrate_from = None
@@ -423,6 +644,51 @@ class ArticleStaticGenerationSignalTests(TestCase):
                 self.assertFalse(renamed_target.exists())
                 self.assertNotIn("/articles/renamed-article/", sitemap_path.read_text(encoding="utf-8"))
 
+    def test_article_and_block_saves_run_no_extra_queries(self):
+        Articles.objects.create(
+            title="Query Article",
+            slug="query-article",
+            body_html="<p>Body</p>",
+            seo_title="SEO",
+            seo_description="SEO",
+        )
+        article = Articles.objects.get(slug="query-article")
+
+        with self.captureOnCommitCallbacks():
+            with self.assertNumQueries(1):
+                article.slug = "renamed-query-article"
+                article.save()
+            with self.assertNumQueries(3):
+                for order in range(1, 4):
+                    ArticlesContentBlock.objects.create(
+                        article=article,
+                        type=ArticlesContentBlock.TEXT,
+                        order=order,
+                        text="Text",
+                    )
+
+        self.assertEqual(article._previous_slug, "query-article")
+        self.assertEqual(article.get_loaded_values()["slug"], "renamed-query-article")
+
+    def test_partial_refresh_keeps_loaded_values_of_other_fields(self):
+        article = Articles.objects.create(
+            title="Refresh Article",
+            slug="refresh-article",
+            body_html="<p>Body</p>",
+            seo_title="SEO",
+            seo_description="SEO",
+        )
+        Articles.objects.filter(pk=article.pk).update(is_published=True)
+
+        article.slug = "unsaved-slug"
+        article.refresh_from_db(fields=["is_published"])
+
+        self.assertEqual(article.get_loaded_values(), {"slug": "refresh-article", "is_published": True})
+
+        article.refresh_from_db()
+
+        self.assertEqual(article.get_loaded_values(), {"slug": "refresh-article", "is_published": True})
+
     @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
     def test_block_save_updates_article_lastmod_in_sitemap(self):
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -6,5 +6,6 @@ app_name = 'blog'
 
 urlpatterns = [
     path('api/articles/', views.get_articles_list, name='articles_list'),
+    path('api/batch/articles/', views.get_articles_batch, name='articles_batch'),
     path('api/articles/<slug:slug>/', views.get_article_detail, name='article_detail'),
 ]
@@ -1,14 +1,33 @@
 from django.core.paginator import Paginator
-from django.db.models import Prefetch
+from django.db.models import Count, Max
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 
-from blog.services.article_rendering import (
-    build_article_render_context,
-    build_public_article_path,
+from blog.services.article_cards import (
+    ARTICLE_CARD_COLUMNS,
+    ARTICLE_CARD_KEYS,
+    build_article_card_payload,
+    get_article_card_fragments,
+    get_sparse_article_cards_queryset,
 )
+from blog.services.article_rendering import build_article_render_context, build_public_article_path
+from core.services.batch_lookup import InvalidBatchError, order_by_slugs, parse_batch_slugs
+from core.services.build_item_html import build_item_detail_static_html
+from core.services.conditional_get import (
+    DETAIL_CACHE_CONTROL,
+    LIST_CACHE_CONTROL,
+    build_content_validators,
+    conditional_content,
+)
+from core.services.json_fragments import build_json_list_response, dump_json_fragment
+from core.services.keyset_pagination import InvalidCursorError, paginate_by_keyset
+from core.services.response_cache import ARTICLES_CONTENT, cached_response
+from core.services.sparse_fields import InvalidFieldsError, select_fields
+from core.services.static_first import serve_generated_page
+
+from .models import Articles
 
-from .models import Articles, ArticlesContentBlock
+ARTICLES_KEYSET_ORDERING = ("-created_at", "-id")
 
 
 def _sanitize_limit(raw_value, default=10, max_value=100):
@@ -19,25 +38,49 @@ def _sanitize_limit(raw_value, default=10, max_value=100):
     return min(max(value, 1), max_value)
 
 
+def _get_articles_aggregates():
+    # Block edits bump the article's `updated_at`, so the articles table alone covers them.
+    return Articles.objects.aggregate(changed_at=Max("updated_at"), count=Count("pk"))
+
+
+def _articles_validators(request, *args, **kwargs):
+    return build_content_validators("articles", _get_articles_aggregates())
+
+
+def _article_detail_validators(request, slug):
+    # The page lists the latest other articles, so publishing, unpublishing or editing any article changes it.
+    return build_content_validators(f"article:{slug}", _get_articles_aggregates())
+
+
+@conditional_content(_articles_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(ARTICLES_CONTENT)
 def get_articles_list(request):
     page = request.GET.get("page", 1)
+    cursor = request.GET.get("cursor")
     limit = _sanitize_limit(request.GET.get("limit", 10))
+    try:
+        selection = select_fields(request, available=ARTICLE_CARD_KEYS, default=ARTICLE_CARD_KEYS)
+    except InvalidFieldsError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    articles_qs = Articles.objects.filter(is_published=True).order_by(*ARTICLES_KEYSET_ORDERING)
+    if selection.is_default:
+        articles_qs = articles_qs.only(*ARTICLE_CARD_COLUMNS)
+    else:
+        articles_qs = get_sparse_article_cards_queryset(articles_qs, selection.keys)
+
+    if cursor is not None:
+        try:
+            articles_page = paginate_by_keyset(articles_qs, ARTICLES_KEYSET_ORDERING, cursor=cursor, limit=limit)
+        except InvalidCursorError:
+            return JsonResponse({"error": "Invalid cursor."}, status=400)
+
+        payload = {
+            "has_next": articles_page.has_next,
+            "next_cursor": articles_page.next_cursor,
+        }
+        return build_json_list_response(payload, _get_article_fragments(articles_page, selection))
 
-    image_blocks_prefetch = Prefetch(
-        "blocks",
-        queryset=ArticlesContentBlock.objects.filter(
-            type=ArticlesContentBlock.IMAGE,
-            media__isnull=False,
-        )
-        .exclude(media="")
-        .order_by("order"),
-        to_attr="image_blocks",
-    )
-    articles_qs = (
-        Articles.objects.filter(is_published=True)
-        .prefetch_related(image_blocks_prefetch)
-        .order_by("-created_at")
-    )
     paginator = Paginator(articles_qs, limit)
     articles_page = paginator.get_page(page)
 
@@ -47,35 +90,43 @@ def get_articles_list(request):
         "has_next": has_next_page,
         "has_previous": articles_page.has_previous(),
         "next_page": articles_page.next_page_number() if has_next_page else None,
-        "data": [],
     }
 
-    for article in articles_page:
-        photos = [
-            {
-                "url": block.media,
-                "alt": (block.media_alt or "").strip() or article.title,
-            }
-            for block in getattr(article, "image_blocks", [])
-        ]
-        payload["data"].append(
-            {
-                "id": article.id,
-                "slug": article.slug,
-                "title": article.title,
-                "excerpt": (article.excerpt or article.seo_description or "").strip(),
-                "preview_image": article.preview_image or None,
-                "preview_image_alt": (article.preview_image_alt or "").strip(),
-                "url": build_public_article_path(article.slug),
-                "photos": photos,
-                "publication_date": article.created_at.isoformat(),
-            }
-        )
-
-    return JsonResponse(payload, safe=False)
+    return build_json_list_response(payload, _get_article_fragments(articles_page, selection))
+
+
+@conditional_content(_articles_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(ARTICLES_CONTENT)
+def get_articles_batch(request):
+    try:
+        slugs = parse_batch_slugs(request.GET.get("slugs"))
+        selection = select_fields(request, available=ARTICLE_CARD_KEYS, default=ARTICLE_CARD_KEYS)
+    except (InvalidBatchError, InvalidFieldsError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
 
+    articles_qs = Articles.objects.filter(is_published=True, slug__in=slugs)
+    if selection.is_default:
+        articles_qs = articles_qs.only(*ARTICLE_CARD_COLUMNS, "slug")
+    else:
+        articles_qs = get_sparse_article_cards_queryset(articles_qs, selection.keys + ("slug",))
+    articles, missing = order_by_slugs(articles_qs, slugs)
 
+    return build_json_list_response({"missing": missing}, _get_article_fragments(articles, selection))
+
+
+def _get_article_fragments(articles, selection):
+    if selection.is_default:
+        return get_article_card_fragments(articles)
+    return [dump_json_fragment(build_article_card_payload(article, selection.keys)) for article in articles]
+
+
+@conditional_content(_article_detail_validators, cache_control=DETAIL_CACHE_CONTROL)
+@cached_response(ARTICLES_CONTENT)
 def get_article_detail(request, slug):
     article = get_object_or_404(Articles, slug=slug, is_published=True)
-    context = build_article_render_context(article)
-    return render(request, "article_detail.html", context)
+    return serve_generated_page(
+        request,
+        build_public_article_path(article.slug),
+        render_page=lambda: render(request, "article_detail.html", build_article_render_context(article)),
+        write_page=lambda: build_item_detail_static_html(article, "article_detail.html", "articles"),
+    )
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from core.services.response_cache import RESPONSE_CACHE_ALIAS
+
+# Backends whose entries live in one process: other workers never see a version bump.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_api_response_cache_backend(app_configs, **kwargs):
+    if not getattr(settings, "API_RESPONSE_CACHE_ENABLED", False):
+        return []
+
+    backend = settings.CACHES.get(RESPONSE_CACHE_ALIAS, {}).get("BACKEND", "")
+    if backend in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [
+            Error(
+                "API_RESPONSE_CACHE_ENABLED needs a cache shared by all workers.",
+                hint=(
+                    f"The '{RESPONSE_CACHE_ALIAS}' cache uses {backend}, so workers that did not handle an "
+                    "edit keep serving the old responses. Set API_RESPONSE_CACHE_PATH."
+                ),
+                id="core.E001",
+            )
+        ]
+    return []
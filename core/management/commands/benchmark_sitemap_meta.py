@@ -0,0 +1,114 @@
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from core.services.html_sitemap import build_html_sitemap, build_static_html_sitemap_page
+from core.services.page_meta import read_full_page_meta
+from core.services.sitemap import build_public_sitemaps, build_sitemap
+
+SYNTHETIC_HEAD_LINKS = "".join(
+    f'<link rel="stylesheet" href="/css/part-{index}.css?v=2026-01-01-1">' for index in range(20)
+)
+SYNTHETIC_NAV = "".join(f'<li><a href="/section-{index}/">Раздел {index}</a></li>' for index in range(60))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare head-only page metadata reads with full-document parsing, and the single-pass "
+        "public sitemaps build with writing sitemap.xml and reading it back, and cold with warm page metadata "
+        "cache builds, on a synthetic generated tree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=10_000, help="Synthetic pages to generate.")
+        parser.add_argument("--body-kb", type=int, default=16, help="Approximate body size of each page, in KB.")
+
+    def handle(self, *args, **options):
+        page_count = max(options["pages"], 1)
+        body_kb = max(options["body_kb"], 0)
+
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as cache_dir:
+            root = Path(temp_dir)
+            self._write_synthetic_tree(root, page_count, body_kb)
+            self.stdout.write(f"Generated {page_count} pages with ~{body_kb} KB bodies in {temp_dir}")
+
+            with override_settings(
+                GENERATED_HTML_PAGES_PATH=temp_dir,
+                SITEMAP_INDEX_ENABLED=False,
+                SITEMAP_META_CACHE_PATH="",
+                FRONTEND_PARTIALS_AUTO_SYNC=False,
+            ):
+                for label, build in (("build_sitemap", build_sitemap), ("build_html_sitemap", build_html_sitemap)):
+                    full_ms = self._time_with_full_parse(build)
+                    head_ms = self._time(build)
+                    self.stdout.write(
+                        "{label}: full parse {full_ms:.0f} ms, head-only {head_ms:.0f} ms; speedup: {speedup:.2f}x".format(
+                            label=label,
+                            full_ms=full_ms,
+                            head_ms=head_ms,
+                            speedup=full_ms / max(head_ms, 1e-9),
+                        )
+                    )
+
+                two_pass_ms = self._time(self._build_public_sitemaps_two_pass)
+                single_pass_ms = self._time(build_public_sitemaps)
+                self.stdout.write(
+                    "build_public_sitemaps: xml then html {two_pass_ms:.0f} ms, single pass {single_pass_ms:.0f} ms; "
+                    "speedup: {speedup:.2f}x".format(
+                        two_pass_ms=two_pass_ms,
+                        single_pass_ms=single_pass_ms,
+                        speedup=two_pass_ms / max(single_pass_ms, 1e-9),
+                    )
+                )
+
+                with override_settings(SITEMAP_META_CACHE_PATH=str(Path(cache_dir) / "page_meta.json")):
+                    cold_ms = self._time(build_sitemap)
+                    warm_ms = self._time(build_sitemap)
+                self.stdout.write(
+                    "build_sitemap with meta cache: cold {cold_ms:.0f} ms, warm {warm_ms:.0f} ms; "
+                    "speedup: {speedup:.2f}x".format(
+                        cold_ms=cold_ms,
+                        warm_ms=warm_ms,
+                        speedup=cold_ms / max(warm_ms, 1e-9),
+                    )
+                )
+
+    def _build_public_sitemaps_two_pass(self):
+        # The previous flow: write sitemap.xml, then parse it back and re-read every page.
+        build_sitemap()
+        build_static_html_sitemap_page()
+
+    def _time(self, build) -> float:
+        # The builds record page fingerprints; rolling back keeps the synthetic pages out of the real table.
+        with transaction.atomic():
+            started_at = perf_counter()
+            build()
+            elapsed_ms = (perf_counter() - started_at) * 1000
+            transaction.set_rollback(True)
+        return elapsed_ms
+
+    def _time_with_full_parse(self, build) -> float:
+        with patch("core.services.page_meta_cache.read_page_meta", read_full_page_meta):
+            return self._time(build)
+
+    def _write_synthetic_tree(self, root: Path, page_count: int, body_kb: int):
+        paragraph = "<p>" + "Cultnova создаёт музеи и выставочные пространства. " * 8 + "</p>\n"
+        body = paragraph * max(body_kb * 1024 // len(paragraph.encode("utf-8")), 1)
+
+        for index in range(page_count):
+            robots = "noindex,nofollow" if index % 10 == 0 else "index,follow"
+            page_dir = root / "bench" / f"page-{index}"
+            page_dir.mkdir(parents=True)
+            (page_dir / "index.html").write_text(
+                "<!DOCTYPE html>\n<html lang=\"ru\">\n<head>\n"
+                f'<meta charset="utf-8"><meta name="robots" content="{robots}">'
+                f"<title>Страница {index} | Cultnova</title>{SYNTHETIC_HEAD_LINKS}\n"
+                f"</head>\n<body>\n<header><nav><ul>{SYNTHETIC_NAV}</ul></nav></header>\n"
+                f"<main><h1>Страница {index}</h1>\n{body}</main>\n</body>\n</html>\n",
+                encoding="utf-8",
+            )
@@ -0,0 +1,79 @@
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Articles
+from blog.services.article_rendering import build_article_render_context
+from core.services.html_sitemap import SitemapXmlMissingError, build_html_sitemap, iter_html_sitemap_pages
+from core.services.template_rendering import (
+    DJANGO_ENGINE,
+    GENERATION_TEMPLATE_ENGINES,
+    JINJA2_ENGINE,
+    ImproperlyConfiguredTemplateEngine,
+    render_generation_template,
+)
+from projects.models import ProjectCategories, Projects
+from projects.services.project_listing import build_projects_listing_context
+from projects.services.project_rendering import build_project_render_context
+
+
+class Command(BaseCommand):
+    help = "Compare per-page render time of the Django and Jinja2 static generation templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Renders per page and engine.")
+        parser.add_argument("--limit", type=int, default=5, help="Pages per page kind to sample.")
+
+    def handle(self, *args, **options):
+        iterations = max(options["iterations"], 1)
+        samples = list(self._iter_samples(max(options["limit"], 1)))
+        if not samples:
+            raise CommandError("Nothing to render: publish an article or a project first.")
+
+        for label, template_name, context in samples:
+            timings = {}
+            outputs = {}
+            for engine in GENERATION_TEMPLATE_ENGINES:
+                try:
+                    outputs[engine] = render_generation_template(template_name, context, engine=engine)
+                except ImproperlyConfiguredTemplateEngine as exc:
+                    raise CommandError(str(exc)) from exc
+
+                started_at = perf_counter()
+                for _ in range(iterations):
+                    render_generation_template(template_name, context, engine=engine)
+                timings[engine] = (perf_counter() - started_at) * 1000 / iterations
+
+            parity = "ok" if outputs[DJANGO_ENGINE] == outputs[JINJA2_ENGINE] else "MISMATCH"
+            self.stdout.write(
+                "{label}: django {django_ms:.2f} ms, jinja2 {jinja2_ms:.2f} ms; speedup: {speedup:.2f}x; parity: {parity}".format(
+                    label=label,
+                    django_ms=timings[DJANGO_ENGINE],
+                    jinja2_ms=timings[JINJA2_ENGINE],
+                    speedup=timings[DJANGO_ENGINE] / max(timings[JINJA2_ENGINE], 1e-9),
+                    parity=parity,
+                )
+            )
+
+    def _iter_samples(self, limit):
+        for article in Articles.objects.filter(is_published=True).order_by("-created_at")[:limit]:
+            yield f"article {article.slug}", "article_detail.html", build_article_render_context(article)
+
+        for project in Projects.objects.select_related("category").filter(is_published=True).order_by("-created_at")[:limit]:
+            yield f"project {project.slug}", "project_detail.html", build_project_render_context(project)
+
+        yield "projects listing", "projects_listing.html", build_projects_listing_context()
+        for category in ProjectCategories.objects.order_by("-created_at", "title")[:limit]:
+            yield (
+                f"projects category {category.slug}",
+                "projects_listing.html",
+                build_projects_listing_context(active_category=category),
+            )
+
+        try:
+            sections = build_html_sitemap()
+        except SitemapXmlMissingError:
+            return
+        for public_path, context in islice(iter_html_sitemap_pages(sections), limit + 1):
+            yield f"html sitemap {public_path}", "sitemap_page.html", context
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from core.services.compression import get_compression_stats, reset_compression_stats
+
+
+class Command(BaseCommand):
+    help = "Show how much the response compression middleware saves and what it costs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing them.")
+
+    def handle(self, *args, **options):
+        stats = get_compression_stats()
+        self.stdout.write(
+            "Response compression: {responses} responses ({cached} from cached variants), "
+            "{original} -> {compressed} bytes; ratio: {ratio:.1%}; CPU: {cpu_ms:.3f} ms per compressed response".format(
+                responses=stats.responses,
+                cached=stats.cached_variants,
+                original=stats.original_bytes,
+                compressed=stats.compressed_bytes,
+                ratio=stats.ratio,
+                cpu_ms=stats.cpu_ms_per_response,
+            )
+        )
+        if options["reset"]:
+            reset_compression_stats()
@@ -8,14 +8,31 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         result = build_public_sitemaps()
+        section_files = ""
+        if result.xml_result.section_files:
+            section_files = "; section files: {count} ({rewritten} rewritten)".format(
+                count=len(result.xml_result.section_files),
+                rewritten=result.xml_result.rewritten_file_count,
+            )
         self.stdout.write(
             self.style.SUCCESS(
-                "XML: {xml_path}; HTML: {html_path}; URLs: {urls}; sections: {sections}; skipped noindex: {skipped}".format(
+                "XML: {xml_path}; HTML: {html_path} ({html_pages} pages, {html_rewritten} rewritten); URLs: {urls}; "
+                "sections: {sections}; skipped noindex: {skipped}"
+                "{section_files}; scan: {scan_ms:.0f} ms on {workers} threads; "
+                "meta cache: {cache_hits} hits, {cache_misses} misses, {cache_evictions} evicted".format(
                     xml_path=result.xml_result.output_path,
                     html_path=result.html_result.output_path,
+                    html_pages=result.html_result.page_count,
+                    html_rewritten=result.html_result.rewritten_page_count,
                     urls=result.xml_result.url_count,
                     sections=result.html_result.section_count,
                     skipped=result.xml_result.skipped_noindex_count,
+                    section_files=section_files,
+                    scan_ms=result.xml_result.scan_seconds * 1000,
+                    workers=result.xml_result.scan_workers,
+                    cache_hits=result.xml_result.meta_cache_stats.hits,
+                    cache_misses=result.xml_result.meta_cache_stats.misses,
+                    cache_evictions=result.xml_result.meta_cache_stats.evictions,
                 )
             )
         )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.services.response_cache import get_response_cache_stats, reset_response_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hits, misses and the hit ratio of the public API response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing them.")
+
+    def handle(self, *args, **options):
+        stats = get_response_cache_stats()
+        self.stdout.write(
+            "API response cache: {hits} hits, {misses} misses; hit ratio: {ratio:.1%}".format(
+                hits=stats.hits,
+                misses=stats.misses,
+                ratio=stats.hit_ratio,
+            )
+        )
+        if options["reset"]:
+            reset_response_cache_stats()
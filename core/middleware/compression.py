@@ -0,0 +1,83 @@
+import time
+
+from django.conf import settings
+
+from core.middleware.cors import _append_vary
+from core.services.compression import (
+    compress_body,
+    is_compressible_content_type,
+    is_compressible_path,
+    negotiate_encoding,
+    record_compression,
+)
+from core.services.response_cache import get_cached_variant, set_cached_variant
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip compression for dynamic responses.
+
+    Only paths under RESPONSE_COMPRESSION_PATHS with a content type from
+    RESPONSE_COMPRESSION_CONTENT_TYPES and at least RESPONSE_COMPRESSION_MIN_SIZE
+    bytes are touched. Responses served by `cached_response` keep their
+    compressed variants in the response cache, so a cache hit is not
+    compressed again. Each compressed response reports its ratio and CPU time
+    in `Server-Timing`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not getattr(settings, "RESPONSE_COMPRESSION_ENABLED", False) or not self._is_eligible(request, response):
+            return response
+
+        # The body depends on Accept-Encoding from here on, whether or not this client gets it compressed.
+        _append_vary(response, "Accept-Encoding")
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        original = response.content
+        cpu_ns = 0
+        compressed = get_cached_variant(response, encoding)
+        cached_variant = compressed is not None
+        if compressed is None:
+            started_at = time.process_time_ns()
+            compressed = compress_body(original, encoding)
+            cpu_ns = time.process_time_ns() - started_at
+            if len(compressed) >= len(original):
+                return response
+            set_cached_variant(response, encoding, compressed)
+
+        record_compression(
+            original_bytes=len(original),
+            compressed_bytes=len(compressed),
+            cpu_ns=cpu_ns,
+            cached_variant=cached_variant,
+        )
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # A strong ETag promises byte-identical bodies across encodings.
+            response["ETag"] = f"W/{etag}"
+        response["Server-Timing"] = 'compress;dur={dur:.3f};desc="{encoding} {ratio:.0%}{cached}"'.format(
+            dur=cpu_ns / 1_000_000,
+            encoding=encoding,
+            ratio=len(compressed) / len(original),
+            cached=" cached" if cached_variant else "",
+        )
+        return response
+
+    def _is_eligible(self, request, response) -> bool:
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.has_header("Content-Encoding")
+            and is_compressible_path(request.path)
+            and is_compressible_content_type(response.get("Content-Type", ""))
+            and len(response.content) >= getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 0)
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=1024, unique=True, verbose_name='Публичный путь')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='Хэш содержимого')),
+                ('content_changed_at', models.DateTimeField(verbose_name='Содержимое изменено')),
+            ],
+            options={
+                'verbose_name': 'Сгенерированная страница',
+                'verbose_name_plural': 'Сгенерированные страницы',
+            },
+        ),
+    ]
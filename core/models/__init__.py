@@ -0,0 +1,3 @@
+from core.models.generated_page import GeneratedPage
+
+__all__ = ["GeneratedPage"]
@@ -9,9 +9,45 @@ class BaseContentItem(models.Model):
     is_published = models.BooleanField(default=False, verbose_name='Опубликовано')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
 
+    # Поля, исходные значения которых нужны сигналам при сохранении (см. `get_loaded_values`).
+    TRACKED_FIELDS = ('slug', 'is_published')
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self.remember_tracked_fields(fields)
+
+    def remember_tracked_fields(self, fields=None):
+        """
+        Запоминает значения отслеживаемых полей, как они лежат в базе.
+
+        `fields` — только что перечитанные поля: остальные сохраняют
+        запомненные значения, ведь в экземпляре могут быть несохранённые правки.
+        """
+        deferred_fields = self.get_deferred_fields()
+        loaded_values = {}
+        if fields is not None:
+            fields = set(fields)
+            loaded_values = self.get_loaded_values()
+        for name in self.TRACKED_FIELDS:
+            if name in deferred_fields:
+                continue
+            if fields is None or name in fields or self._meta.get_field(name).name in fields:
+                loaded_values[name] = getattr(self, name)
+        self._loaded_values = loaded_values
+
+    def get_loaded_values(self):
+        """Значения отслеживаемых полей на момент загрузки или последнего сохранения."""
+        return dict(getattr(self, '_loaded_values', {}))
+
 
 class BaseContentBlock(models.Model):
     """Абстрактная модель для блоков контента"""
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class GeneratedPage(models.Model):
+    """Отпечаток содержимого сгенерированной страницы для `lastmod` в картах сайта."""
+    path = models.CharField(max_length=1024, unique=True, verbose_name='Публичный путь')
+    content_hash = models.CharField(max_length=64, verbose_name='Хэш содержимого')
+    content_changed_at = models.DateTimeField(verbose_name='Содержимое изменено')
+
+    class Meta:
+        verbose_name = 'Сгенерированная страница'
+        verbose_name_plural = 'Сгенерированные страницы'
+
+    def __str__(self):
+        return self.path
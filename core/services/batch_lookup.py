@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from operator import attrgetter
+
+BATCH_MAX_SLUGS = 50
+
+
+class InvalidBatchError(ValueError):
+    pass
+
+
+def parse_batch_slugs(raw_value: str | None, *, max_slugs: int = BATCH_MAX_SLUGS) -> list[str]:
+    """Comma-separated `slugs` param as a de-duplicated list in request order."""
+    slugs = list(dict.fromkeys(slug.strip() for slug in (raw_value or "").split(",") if slug.strip()))
+    if not slugs:
+        raise InvalidBatchError("Pass at least one slug in `slugs`.")
+    if len(slugs) > max_slugs:
+        raise InvalidBatchError(f"At most {max_slugs} slugs per request.")
+    return slugs
+
+
+def order_by_slugs(items, slugs: list[str], *, key=attrgetter("slug")) -> tuple[list, list[str]]:
+    """`items` in the order of `slugs`, and the slugs nothing was found for."""
+    items_by_slug = {key(item): item for item in items}
+    found = [items_by_slug[slug] for slug in slugs if slug in items_by_slug]
+    missing = [slug for slug in slugs if slug not in items_by_slug]
+    return found, missing
@@ -1,12 +1,22 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.db import connections
 
 from blog.services.article_rendering import build_article_render_context
 from core.models.base_item import BaseContentItem
 from core.services.frontend_partials_sync import sync_frontend_partials
+from core.services.page_fingerprints import (
+    build_generated_page_path,
+    fingerprint_page_html,
+    forget_page_fingerprints,
+    record_page_fingerprints,
+)
+from core.services.template_rendering import render_generation_template
 from projects.services.project_rendering import build_project_render_context
 
 
@@ -49,13 +59,23 @@ def _remove_dir_if_empty(dir_path: str):
         os.rmdir(dir_path)
 
 
-def build_item_detail_static_html(instance: BaseContentItem, template_name: str, folder_name: str):
-    """
-    Generate static HTML and write it into the target directory.
-    """
-    sync_frontend_partials_if_configured()
-    base_gen_root = str(get_generated_pages_root())
+def write_text_atomically(target_path: Path, content: str) -> None:
+    # Generated pages are served while they are rebuilt: readers see the old file or the new one, never half.
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with NamedTemporaryFile("w", encoding="utf-8", dir=target_path.parent, delete=False) as temp_file:
+        temp_file.write(content)
+        temp_path = Path(temp_file.name)
+
+    temp_path.replace(target_path)
+    os.chmod(target_path, 0o644)
+
 
+def get_static_generation_workers() -> int:
+    return max(int(getattr(settings, "STATIC_GENERATION_WORKERS", 1) or 1), 1)
+
+
+def _prepare_item_detail_page(instance: BaseContentItem, folder_name: str, base_gen_root: str):
     if folder_name in {"article", "articles"}:
         context = build_article_render_context(instance)
         save_dir, file_path = _build_article_path(base_gen_root, instance.slug)
@@ -66,14 +86,70 @@ def build_item_detail_static_html(instance: BaseContentItem, template_name: str,
         context = {"item": instance}
         save_dir = os.path.join(base_gen_root, folder_name)
         file_path = os.path.join(save_dir, f"{instance.slug}.html")
+    return save_dir, file_path, context
+
+
+def _write_item_detail_page(template_name: str, page) -> tuple[str, str]:
+    save_dir, file_path, context = page
+    html_content = render_generation_template(template_name, context)
+    write_text_atomically(Path(file_path), html_content)
+
+    return file_path, fingerprint_page_html(html_content)
+
+
+def _write_item_detail_page_in_worker(template_name: str, page) -> tuple[str, str]:
+    # Contexts are built up front, but a template can still follow a lazy relation; that query opens
+    # a connection owned by this worker thread, which nothing else would ever close.
+    try:
+        return _write_item_detail_page(template_name, page)
+    finally:
+        connections.close_all()
+
 
-    html_content = render_to_string(template_name, context)
-    os.makedirs(save_dir, exist_ok=True)
+def _record_item_detail_pages(written_pages, base_gen_root: str) -> list[str]:
+    # Runs in the calling thread: worker threads only render and write files.
+    fingerprints = {}
+    for file_path, fingerprint in written_pages:
+        public_path = build_generated_page_path(file_path, base_gen_root)
+        if public_path:
+            fingerprints[public_path] = fingerprint
+    record_page_fingerprints(fingerprints)
+    return [file_path for file_path, _fingerprint in written_pages]
 
-    with open(file_path, "w", encoding="utf-8") as output:
-        output.write(html_content)
 
-    return file_path
+def build_item_detail_static_html(instance: BaseContentItem, template_name: str, folder_name: str):
+    """
+    Generate static HTML and write it into the target directory.
+    """
+    sync_frontend_partials_if_configured()
+    base_gen_root = str(get_generated_pages_root())
+    page = _prepare_item_detail_page(instance, folder_name, base_gen_root)
+    return _record_item_detail_pages([_write_item_detail_page(template_name, page)], base_gen_root)[0]
+
+
+def build_items_detail_static_html(instances, template_name: str, folder_name: str, *, max_workers: int | None = None):
+    """
+    Generate static HTML for several items of one type.
+
+    Render contexts are built (and all queries run) in the calling thread;
+    template rendering and file writes are spread over a thread pool.
+    """
+    instances = list(instances)
+    if not instances:
+        return []
+
+    sync_frontend_partials_if_configured()
+    base_gen_root = str(get_generated_pages_root())
+    pages = [_prepare_item_detail_page(instance, folder_name, base_gen_root) for instance in instances]
+
+    workers = min(max_workers or get_static_generation_workers(), len(pages))
+    if workers <= 1:
+        written_pages = [_write_item_detail_page(template_name, page) for page in pages]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            written_pages = list(executor.map(partial(_write_item_detail_page_in_worker, template_name), pages))
+
+    return _record_item_detail_pages(written_pages, base_gen_root)
 
 
 def delete_item_detail_static_html(instance: BaseContentItem, folder_name: str, slug_override: str | None = None):
@@ -91,6 +167,7 @@ def delete_item_detail_static_html(instance: BaseContentItem, folder_name: str,
         _remove_file_if_exists(file_path)
         _remove_file_if_exists(legacy_slug_file)
         _remove_file_if_exists(legacy_id_file)
+        forget_page_fingerprints([build_generated_page_path(file_path, base_gen_root)])
 
         _remove_dir_if_empty(article_dir)
         _remove_dir_if_empty(legacy_id_dir)
@@ -107,6 +184,7 @@ def delete_item_detail_static_html(instance: BaseContentItem, folder_name: str,
         _remove_file_if_exists(file_path)
         _remove_file_if_exists(legacy_slug_file)
         _remove_file_if_exists(legacy_id_file)
+        forget_page_fingerprints([build_generated_page_path(file_path, base_gen_root)])
 
         _remove_dir_if_empty(project_dir)
         _remove_dir_if_empty(legacy_id_dir)
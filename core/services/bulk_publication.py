@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Articles
+from core.services.regeneration import regeneration_batch
+from core.services.response_cache import ARTICLES_CONTENT, PROJECTS_CONTENT
+from projects.models import ProjectCategories, Projects
+
+
+def _mark_changed_items(batch, model, item_ids, *, category_ids_by_item=None):
+    category_ids_by_item = category_ids_by_item or {}
+    for item_id in item_ids:
+        if model is Articles:
+            batch.add_article(item_id, saved=True)
+        elif model is Projects:
+            batch.add_project(item_id, saved=True, category_ids=(category_ids_by_item.get(item_id),))
+        else:
+            raise TypeError(f"Bulk publication is not supported for {model.__name__}")
+    # A bulk UPDATE sends no post_save, so the API responses are orphaned here.
+    batch.add_api_content(ARTICLES_CONTENT if model is Articles else PROJECTS_CONTENT)
+
+
+def bulk_set_published(queryset, is_published: bool) -> int:
+    """
+    Publish or unpublish every item of the queryset with one UPDATE.
+
+    Rows already in the requested state are left alone. Pages, listings and
+    sitemaps of the changed rows are regenerated once, after commit.
+    """
+    model = queryset.model
+    with transaction.atomic(using=queryset.db):
+        changed_queryset = queryset.exclude(is_published=is_published)
+        item_ids = list(changed_queryset.values_list("pk", flat=True))
+        if not item_ids:
+            return 0
+
+        model.objects.using(queryset.db).filter(pk__in=item_ids).update(
+            is_published=is_published,
+            updated_at=timezone.now(),
+        )
+        with regeneration_batch(using=queryset.db) as batch:
+            _mark_changed_items(batch, model, item_ids)
+
+    return len(item_ids)
+
+
+def bulk_move_projects_to_category(queryset, category: ProjectCategories) -> int:
+    """Move projects to `category` with one UPDATE; old and new category listings are rebuilt once."""
+    with transaction.atomic(using=queryset.db):
+        previous_category_ids = dict(queryset.exclude(category=category).values_list("pk", "category_id"))
+        if not previous_category_ids:
+            return 0
+
+        Projects.objects.using(queryset.db).filter(pk__in=previous_category_ids).update(
+            category=category,
+            updated_at=timezone.now(),
+        )
+        with regeneration_batch(using=queryset.db) as batch:
+            _mark_changed_items(batch, Projects, previous_category_ids, category_ids_by_item=previous_category_ids)
+
+    return len(previous_category_ids)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from core.services.response_cache import STATS_FLUSH_EVERY, get_response_cache
+
+try:
+    import brotli
+except ImportError:  # Optional: without it responses are only gzipped.
+    brotli = None
+
+BROTLI = "br"
+GZIP = "gzip"
+# Dynamic responses are compressed on the request path: favour speed over the last few percent.
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+_STATS_KEY = "api-response:stats:compression"
+_STATS_FIELDS = ("responses", "original_bytes", "compressed_bytes", "cpu_ns", "cached_variants")
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    responses: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+    cpu_ns: int = 0
+    cached_variants: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a share of the original size (lower is better)."""
+        return self.compressed_bytes / self.original_bytes if self.original_bytes else 0.0
+
+    @property
+    def cpu_ms_per_response(self) -> float:
+        compressed = self.responses - self.cached_variants
+        return self.cpu_ns / compressed / 1_000_000 if compressed > 0 else 0.0
+
+
+class _PendingStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = dict.fromkeys(_STATS_FIELDS, 0)
+
+
+_pending_stats = _PendingStats()
+
+
+def get_available_encodings() -> tuple[str, ...]:
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick `br` over `gzip` from an `Accept-Encoding` header; `q=0` rules a coding out."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in get_available_encodings():
+        quality = accepted[encoding] if encoding in accepted else accepted.get("*", 0.0)
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress_body(content: bytes, encoding: str) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output stable for equal input, like Django's GZipMiddleware.
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def is_compressible_content_type(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in getattr(settings, "RESPONSE_COMPRESSION_CONTENT_TYPES", ())
+
+
+def is_compressible_path(path: str) -> bool:
+    return path.startswith(tuple(getattr(settings, "RESPONSE_COMPRESSION_PATHS", ())))
+
+
+def record_compression(*, original_bytes: int, compressed_bytes: int, cpu_ns: int = 0, cached_variant: bool = False):
+    with _pending_stats.lock:
+        totals = _pending_stats.totals
+        totals["responses"] += 1
+        totals["original_bytes"] += original_bytes
+        totals["compressed_bytes"] += compressed_bytes
+        totals["cpu_ns"] += cpu_ns
+        totals["cached_variants"] += int(cached_variant)
+        should_flush = totals["responses"] >= STATS_FLUSH_EVERY
+    if should_flush:
+        flush_compression_stats()
+
+
+def flush_compression_stats():
+    with _pending_stats.lock:
+        pending = _pending_stats.totals
+        _pending_stats.totals = dict.fromkeys(_STATS_FIELDS, 0)
+    if not pending["responses"]:
+        return
+
+    # Same read-modify-write trade-off as the response cache hit/miss counters.
+    cache = get_response_cache()
+    totals = cache.get(_STATS_KEY) or {}
+    cache.set(_STATS_KEY, {field: totals.get(field, 0) + pending[field] for field in _STATS_FIELDS}, timeout=None)
+
+
+def get_compression_stats() -> CompressionStats:
+    """Totals of every process sharing the response cache (counts not yet flushed are included)."""
+    flush_compression_stats()
+    totals = get_response_cache().get(_STATS_KEY) or {}
+    return CompressionStats(**{field: totals.get(field, 0) for field in _STATS_FIELDS})
+
+
+def reset_compression_stats():
+    with _pending_stats.lock:
+        _pending_stats.totals = dict.fromkeys(_STATS_FIELDS, 0)
+    get_response_cache().delete(_STATS_KEY)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from core.services.pages_version import get_pages_version
+
+LIST_CACHE_CONTROL = {"public": True, "max_age": 60, "stale_while_revalidate": 300}
+DETAIL_CACHE_CONTROL = {"public": True, "max_age": 300, "stale_while_revalidate": 600}
+
+
+@dataclass(frozen=True)
+class ContentValidators:
+    etag: str
+    last_modified: datetime | None
+
+
+def build_content_validators(scope: str, *aggregates: dict) -> ContentValidators:
+    """
+    Turn `Max(updated_at)` / `Count` aggregates of the tables behind a response into validators.
+
+    The counts make deletes change the ETag even though they leave no newer
+    `updated_at` behind; `scope` keeps endpoints sharing tables apart. The
+    pages version is folded in, so a deploy that changes templates or bumps
+    `STATIC_PAGES_VERSION` invalidates client copies of unchanged content.
+    """
+    pages_version = get_pages_version()
+    last_modified = max(
+        (
+            value
+            for aggregate in (*aggregates, {"pages_changed_at": pages_version.changed_at})
+            for value in aggregate.values()
+            if isinstance(value, datetime)
+        ),
+        default=None,
+    )
+    raw = json.dumps([scope, pages_version.token, *aggregates], default=str, sort_keys=True).encode("utf-8")
+    return ContentValidators(etag=f'W/"{hashlib.sha1(raw).hexdigest()[:20]}"', last_modified=last_modified)
+
+
+def conditional_content(validators_func, *, cache_control: dict):
+    """
+    Answer `If-None-Match` / `If-Modified-Since` with 304 before the view runs.
+
+    `validators_func(request, *args, **kwargs)` should cost one small aggregate
+    query; the view itself only runs when the client copy is stale. Like
+    `django.views.decorators.http.condition`, but the validators are computed
+    once and every response gets `cache_control`.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_func(request, *args, **kwargs)
+
+            validators = validators_func(request, *args, **kwargs)
+            # Static-first views compare their generated file against `last_modified`.
+            request.content_validators = validators
+            last_modified = int(validators.last_modified.timestamp()) if validators.last_modified else None
+            response = get_conditional_response(request, etag=validators.etag, last_modified=last_modified)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            if response.status_code not in (200, 304):
+                return response
+
+            response.headers.setdefault("ETag", validators.etag)
+            if last_modified is not None:
+                response.headers.setdefault("Last-Modified", http_date(last_modified))
+            patch_cache_control(response, **cache_control)
+            return response
+
+        return inner
+
+    return decorator
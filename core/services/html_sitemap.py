@@ -2,25 +2,31 @@ from __future__ import annotations
 
 import logging
 import os
-from dataclasses import dataclass
-from html.parser import HTMLParser
+from dataclasses import dataclass, field
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from urllib.parse import urlsplit
-import xml.etree.ElementTree as ET
 
 from django.conf import settings
-from django.template.loader import render_to_string
 
 from core.services.build_item_html import get_generated_pages_root
 from core.services.frontend_partials_sync import sync_frontend_partials
-from core.services.sitemap import SITEMAP_FILENAME
+from core.services.page_fingerprints import (
+    build_generated_page_path,
+    fingerprint_page_html,
+    forget_page_fingerprints,
+    record_page_fingerprints,
+)
+from core.services.page_meta import PageMeta
+from core.services.page_meta_cache import PageMetaCache, PageMetaCacheStats
+from core.services.sitemap import SITEMAP_FILENAME, SitemapEntry, iter_sitemap_entries
+from core.services.template_rendering import render_generation_template
 
 logger = logging.getLogger(__name__)
 
 SITEMAP_PAGE_PATH = "/sitemap/"
 SITEMAP_PAGE_OUTPUT_PATH = ("sitemap", "index.html")
-SITEMAP_XML_NAMESPACE = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+SITEMAP_PAGE_TITLE = "Карта сайта"
+DEFAULT_SITEMAP_HTML_PAGE_SIZE = 500
 
 LEGACY_CREATE_PATHS = frozenset(
     {
@@ -61,12 +67,37 @@ class HtmlSitemapSection:
     title: str
     links: tuple[HtmlSitemapLink, ...]
 
+    @property
+    def path(self) -> str:
+        return build_sitemap_section_path(self.key)
+
+    @property
+    def link_count(self) -> int:
+        return len(self.links)
+
+
+@dataclass(frozen=True)
+class HtmlSitemapSectionSummary:
+    # What the /sitemap/ index shows of a section whose pages this build did not render.
+    key: str
+    title: str
+    link_count: int
+
+    @property
+    def path(self) -> str:
+        return build_sitemap_section_path(self.key)
+
 
 @dataclass(frozen=True)
 class HtmlSitemapBuildResult:
+    # The top-level /sitemap/ index page.
     output_path: Path
     section_count: int
     url_count: int
+    meta_cache_stats: PageMetaCacheStats = field(default_factory=PageMetaCacheStats)
+    # HTML sitemap pages rendered by this build (index and section pages), and how many of them changed on disk.
+    page_count: int = 1
+    rewritten_page_count: int = 0
 
 
 @dataclass(frozen=True)
@@ -83,80 +114,43 @@ SECTION_DEFINITIONS = (
     _SectionDefinition(key="info", title="Информация"),
     _SectionDefinition(key="legal", title="Юридическая информация"),
 )
+SECTION_TITLES = {definition.key: definition.title for definition in SECTION_DEFINITIONS}
+
+# HTML sitemap sections fed by each sitemap.xml section.
+HTML_SECTION_KEYS_BY_SITEMAP_SECTION = {
+    "pages": ("main", "create", "info", "legal"),
+    "articles": ("articles",),
+    "projects": ("projects",),
+}
 
 
 class SitemapXmlMissingError(FileNotFoundError):
     pass
 
 
-class _PageMetaParser(HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self._inside_title = False
-        self._title_parts: list[str] = []
-        self._inside_h1 = False
-        self._h1_parts: list[str] = []
-        self._h1_found = False
-        self.robots_content = ""
+def build_html_sitemap(*, meta_cache: PageMetaCache | None = None) -> tuple[HtmlSitemapSection, ...]:
+    """
+    Group the URLs of the written sitemap.xml into the HTML sitemap sections.
 
-    @property
-    def title(self) -> str:
-        return "".join(self._title_parts).strip()
-
-    @property
-    def h1(self) -> str:
-        return "".join(self._h1_parts).strip()
-
-    def handle_starttag(self, tag, attrs):
-        tag_name = tag.lower()
-        if tag_name == "title":
-            self._inside_title = True
-            return
-
-        if tag_name == "h1" and not self._h1_found:
-            self._inside_h1 = True
-            return
-
-        if tag_name != "meta":
-            return
-
-        normalized_attrs = {}
-        for key, value in attrs:
-            if key:
-                normalized_attrs[key.lower()] = value or ""
-
-        if normalized_attrs.get("name", "").strip().lower() != "robots":
-            return
-
-        self.robots_content = normalized_attrs.get("content", "").strip()
-
-    def handle_endtag(self, tag):
-        tag_name = tag.lower()
-        if tag_name == "title":
-            self._inside_title = False
-        elif tag_name == "h1":
-            self._inside_h1 = False
-            self._h1_found = True
-
-    def handle_data(self, data):
-        if self._inside_title:
-            self._title_parts.append(data)
-        if self._inside_h1:
-            self._h1_parts.append(data)
-
-
-def build_html_sitemap() -> tuple[HtmlSitemapSection, ...]:
+    Pages go through `meta_cache` (the configured one when not given).
+    `build_public_sitemaps()` does not come here: it renders the HTML
+    sitemap from the pages it scans for sitemap.xml.
+    """
     generated_root = get_generated_pages_root()
+    owns_cache = meta_cache is None
+    if owns_cache:
+        meta_cache = PageMetaCache.open(generated_root)
+
     xml_path = generated_root / SITEMAP_FILENAME
     if not xml_path.exists():
         raise SitemapXmlMissingError(f"Sitemap XML not found at {xml_path}")
-
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+    links = _iter_sitemap_links(xml_path, generated_root, meta_cache)
 
     buckets = {definition.key: [] for definition in SECTION_DEFINITIONS}
-    for link in _iter_sitemap_links(root, generated_root):
+    for link in links:
         buckets[_resolve_section_key(link.path)].append(link)
+    if owns_cache:
+        meta_cache.save()
 
     sections = []
     for definition in SECTION_DEFINITIONS:
@@ -173,79 +167,280 @@ def build_html_sitemap() -> tuple[HtmlSitemapSection, ...]:
     return tuple(sections)
 
 
-def build_static_html_sitemap_page() -> HtmlSitemapBuildResult:
-    if getattr(settings, "FRONTEND_PARTIALS_AUTO_SYNC", True):
-        sync_frontend_partials(
-            backend_base_dir=settings.BASE_DIR,
-            frontend_repo_path=getattr(settings, "FRONTEND_REPO_PATH", ""),
-            frontend_export_dir=getattr(settings, "FRONTEND_PARTIALS_EXPORT_DIR", ""),
-            strict=False,
-        )
+def get_sitemap_html_page_size() -> int:
+    return max(int(getattr(settings, "SITEMAP_HTML_PAGE_SIZE", DEFAULT_SITEMAP_HTML_PAGE_SIZE) or 1), 1)
+
+
+def build_sitemap_section_path(section_key: str, page_number: int = 1) -> str:
+    section_path = f"{SITEMAP_PAGE_PATH}{section_key}/"
+    if page_number <= 1:
+        return section_path
+    return f"{section_path}page/{page_number}/"
+
 
+def iter_html_sitemap_pages(sections: tuple[HtmlSitemapSection, ...], *, page_size: int | None = None):
+    """
+    Yield `(public_path, context)` for every HTML sitemap page.
+
+    The first one is the compact /sitemap/ index that links each section;
+    then every section gets `/sitemap/<section>/` and, past `page_size`
+    links, `/sitemap/<section>/page/<n>/`.
+    """
+    page_size = page_size or get_sitemap_html_page_size()
+    yield SITEMAP_PAGE_PATH, _build_index_context(sections)
+    for section in sections:
+        yield from _iter_section_pages(section, page_size)
+
+
+def _build_index_context(sections) -> dict[str, object]:
+    return {
+        "canonical_url": _build_public_url(SITEMAP_PAGE_PATH),
+        "page_title": SITEMAP_PAGE_TITLE,
+        "heading": SITEMAP_PAGE_TITLE,
+        "breadcrumbs": [{"title": "Главная", "url": "/"}, {"title": SITEMAP_PAGE_TITLE, "url": SITEMAP_PAGE_PATH}],
+        "sections": sections,
+    }
+
+
+def _iter_section_pages(section: HtmlSitemapSection, page_size: int):
+    page_count = max((len(section.links) + page_size - 1) // page_size, 1)
+    for page_number in range(1, page_count + 1):
+        public_path = build_sitemap_section_path(section.key, page_number)
+        heading = section.title if page_number == 1 else f"{section.title}, страница {page_number}"
+        yield public_path, {
+            "canonical_url": _build_public_url(public_path),
+            "page_title": f"{heading} — {SITEMAP_PAGE_TITLE}",
+            "heading": heading,
+            "breadcrumbs": [
+                {"title": "Главная", "url": "/"},
+                {"title": SITEMAP_PAGE_TITLE, "url": SITEMAP_PAGE_PATH},
+                {"title": section.title, "url": section.path},
+            ],
+            "section": section,
+            "links": section.links[(page_number - 1) * page_size : page_number * page_size],
+            "pagination": _build_pagination(section.key, page_number, page_count),
+        }
+
+
+def _build_pagination(section_key: str, page_number: int, page_count: int) -> dict[str, object] | None:
+    if page_count <= 1:
+        return None
+
+    return {
+        "previous_url": build_sitemap_section_path(section_key, page_number - 1) if page_number > 1 else "",
+        "next_url": build_sitemap_section_path(section_key, page_number + 1) if page_number < page_count else "",
+        "pages": [
+            {
+                "number": number,
+                "url": build_sitemap_section_path(section_key, number),
+                "is_current": number == page_number,
+            }
+            for number in range(1, page_count + 1)
+        ],
+    }
+
+
+def build_static_html_sitemap_page(*, meta_cache: PageMetaCache | None = None) -> HtmlSitemapBuildResult:
+    """
+    Write the /sitemap/ index and the paginated per-section sitemap pages from the written sitemap.xml.
+
+    Every page is rendered, but a file is only replaced when its HTML changed,
+    so sections whose links stayed the same keep their bytes and mtime.
+    Pages of sections or page numbers that no longer exist are removed.
+    """
     generated_root = get_generated_pages_root()
-    sections = build_html_sitemap()
-    canonical_url = _build_public_url(SITEMAP_PAGE_PATH)
-    html = render_to_string(
-        "sitemap_page.html",
-        {
-            "sections": sections,
-            "canonical_url": canonical_url,
-        },
-    )
+    owns_cache = meta_cache is None
+    if owns_cache:
+        meta_cache = PageMetaCache.open(generated_root)
+    cache_stats_before = meta_cache.stats
+    writer = HtmlSitemapWriter.open()
+    sections = {section.key: section for section in build_html_sitemap(meta_cache=meta_cache)}
+    if owns_cache:
+        meta_cache.save()
 
-    output_path = generated_root.joinpath(*SITEMAP_PAGE_OUTPUT_PATH)
-    _write_text_atomically(output_path, html)
+    for definition in SECTION_DEFINITIONS:
+        section = sections.get(definition.key)
+        writer.write_section(definition.key, section.links if section else ())
+    return writer.finish(prune=True, meta_cache_stats=meta_cache.stats - cache_stats_before)
 
-    return HtmlSitemapBuildResult(
-        output_path=output_path,
-        section_count=len(sections),
-        url_count=sum(len(section.links) for section in sections),
-    )
 
+class HtmlSitemapWriter:
+    """
+    Write the HTML sitemap one section at a time.
+
+    `add_page()` takes the pages scanned for sitemap.xml as they stream by
+    and `add_link()` the entries of a patched section with their stored
+    titles, `write_sitemap_section()` renders the HTML sections fed by one
+    section of sitemap.xml from them, and `finish()` the /sitemap/ index
+    from the link counts of all sections, so the pages of sections a build
+    did not change are left as they are. A file is only replaced when its
+    HTML changed.
+    """
+
+    def __init__(self):
+        self.generated_root = get_generated_pages_root()
+        self.sitemap_root = self.generated_root.joinpath(*SITEMAP_PAGE_OUTPUT_PATH[:-1])
+        self.page_size = get_sitemap_html_page_size()
+        self.link_counts: dict[str, int] = {}
+        # Links are the only per-page data kept until a section is rendered: its pagination needs them all.
+        self._links: dict[str, list[HtmlSitemapLink]] = {}
+        self._written_paths: list[Path] = []
+        self._removed_paths: list[Path] = []
+        self._fingerprints: dict[str, str] = {}
+        self._rewritten_page_count = 0
+
+    @classmethod
+    def open(cls) -> HtmlSitemapWriter:
+        if getattr(settings, "FRONTEND_PARTIALS_AUTO_SYNC", True):
+            sync_frontend_partials(
+                backend_base_dir=settings.BASE_DIR,
+                frontend_repo_path=getattr(settings, "FRONTEND_REPO_PATH", ""),
+                frontend_export_dir=getattr(settings, "FRONTEND_PARTIALS_EXPORT_DIR", ""),
+                strict=False,
+            )
+        return cls()
+
+    def add_page(self, entry: SitemapEntry, page_meta: PageMeta) -> str | None:
+        """
+        Collect the link of a page read for sitemap.xml; it is known to be indexable.
 
-def _iter_sitemap_links(root: ET.Element, generated_root: Path):
-    for url_node in root.findall("sm:url", SITEMAP_XML_NAMESPACE):
-        loc = (url_node.findtext("sm:loc", default="", namespaces=SITEMAP_XML_NAMESPACE) or "").strip()
-        if not loc:
-            continue
+        Returns the link title, None when the page is not listed.
+        """
+        title = self.resolve_title(entry, page_meta)
+        self.add_link(entry, title)
+        return title
 
-        public_path = _extract_public_path(loc)
-        if not public_path or public_path == SITEMAP_PAGE_PATH:
-            continue
+    def resolve_title(self, entry: SitemapEntry, page_meta: PageMeta) -> str | None:
+        link = _build_link(entry, self.generated_root, None, page_meta)
+        return link.title if link is not None else None
 
-        page_meta = _read_page_meta(generated_root, public_path)
-        if page_meta and _is_noindex(page_meta.robots_content):
-            continue
+    def add_link(self, entry: SitemapEntry, title: str | None):
+        """Collect the link of an entry whose title was resolved by an earlier build."""
+        if title is None:
+            return
+        self._links.setdefault(_resolve_section_key(entry.public_path), []).append(
+            HtmlSitemapLink(
+                path=entry.public_path,
+                url=entry.loc,
+                title=title,
+                lastmod=entry.lastmod or None,
+                priority=entry.priority or None,
+            )
+        )
 
-        title = _resolve_link_title(public_path, page_meta)
-        yield HtmlSitemapLink(
-            path=public_path,
-            url=loc,
-            title=title or _fallback_title_from_path(public_path),
-            lastmod=(url_node.findtext("sm:lastmod", default="", namespaces=SITEMAP_XML_NAMESPACE) or "").strip() or None,
-            priority=(url_node.findtext("sm:priority", default="", namespaces=SITEMAP_XML_NAMESPACE) or "").strip() or None,
+    def write_sitemap_section(self, sitemap_section: str) -> dict[str, int]:
+        """
+        Render the HTML sections fed by `sitemap_section` from the links collected for it.
+
+        Returns the link count of each of those HTML sections.
+        """
+        keys = HTML_SECTION_KEYS_BY_SITEMAP_SECTION[sitemap_section]
+        for key in keys:
+            self.write_section(key, self._links.pop(key, ()))
+        return {key: self.link_counts[key] for key in keys}
+
+    def write_section(self, key: str, links):
+        """Render every page of one HTML section and remove its pages past the new last one."""
+        section = HtmlSitemapSection(key=key, title=SECTION_TITLES[key], links=tuple(links))
+        section_paths = []
+        if section.links:
+            section_paths = [
+                self._write_page(public_path, context)
+                for public_path, context in _iter_section_pages(section, self.page_size)
+            ]
+        section_root = self.sitemap_root / key
+        self._removed_paths.extend(_remove_stale_sitemap_pages(section_root, keep=section_paths))
+        if section_root.is_dir() and not any(section_root.iterdir()):
+            section_root.rmdir()
+        self.link_counts[key] = section.link_count
+
+    def finish(
+        self,
+        link_counts: dict[str, int] | None = None,
+        *,
+        prune: bool = False,
+        meta_cache_stats: PageMetaCacheStats | None = None,
+    ) -> HtmlSitemapBuildResult:
+        """
+        Write the /sitemap/ index and record the fingerprints of the written pages.
+
+        `link_counts` are those of the sections this build did not render.
+        `prune` removes every other page under /sitemap/, for builds that
+        rendered all sections.
+        """
+        link_counts = {**(link_counts or {}), **self.link_counts}
+        sections = tuple(
+            HtmlSitemapSectionSummary(key=definition.key, title=definition.title, link_count=link_counts[definition.key])
+            for definition in SECTION_DEFINITIONS
+            if link_counts.get(definition.key)
         )
+        output_path = self._write_page(SITEMAP_PAGE_PATH, _build_index_context(sections))
+        if prune:
+            self._removed_paths.extend(_remove_stale_sitemap_pages(self.sitemap_root, keep=self._written_paths))
+
+        record_page_fingerprints(self._fingerprints)
+        forget_page_fingerprints(
+            build_generated_page_path(html_path, self.generated_root) for html_path in self._removed_paths
+        )
+        return HtmlSitemapBuildResult(
+            output_path=output_path,
+            section_count=len(sections),
+            url_count=sum(section.link_count for section in sections),
+            meta_cache_stats=meta_cache_stats or PageMetaCacheStats(),
+            page_count=len(self._written_paths),
+            rewritten_page_count=self._rewritten_page_count,
+        )
+
+    def _write_page(self, public_path: str, context: dict[str, object]) -> Path:
+        output_path = _public_path_to_html_path(self.generated_root, public_path)
+        html = render_generation_template("sitemap_page.html", context)
+        self._rewritten_page_count += int(_write_text_if_changed(output_path, html))
+        self._written_paths.append(output_path)
+        self._fingerprints[public_path] = fingerprint_page_html(html)
+        return output_path
+
+
+def _iter_sitemap_links(xml_path: Path, generated_root: Path, meta_cache: PageMetaCache):
+    # Works for a single urlset and for a sitemap index with section files.
+    for entry in iter_sitemap_entries(xml_path):
+        link = _build_link(entry, generated_root, meta_cache)
+        if link is not None:
+            yield link
+
+
+def _build_link(
+    entry: SitemapEntry,
+    generated_root: Path,
+    meta_cache: PageMetaCache | None,
+    page_meta: PageMeta | None = None,
+) -> HtmlSitemapLink | None:
+    public_path = entry.public_path
+    if not public_path or public_path.startswith(SITEMAP_PAGE_PATH):
+        return None
+
+    if page_meta is None:
+        page_meta = _read_page_meta(generated_root, public_path, meta_cache)
+    if page_meta and _is_noindex(page_meta.robots_content):
+        return None
+
+    title = _resolve_link_title(public_path, page_meta)
+    return HtmlSitemapLink(
+        path=public_path,
+        url=entry.loc,
+        title=title or _fallback_title_from_path(public_path),
+        lastmod=entry.lastmod or None,
+        priority=entry.priority or None,
+    )
 
 
-def _read_page_meta(generated_root: Path, public_path: str) -> _PageMetaParser | None:
+def _read_page_meta(generated_root: Path, public_path: str, meta_cache: PageMetaCache) -> PageMeta | None:
     html_path = _public_path_to_html_path(generated_root, public_path)
     if not html_path.exists():
         logger.warning("HTML sitemap source is missing for path %s: %s", public_path, html_path)
+        meta_cache.discard(html_path)
         return None
 
-    parser = _PageMetaParser()
-    parser.feed(html_path.read_text(encoding="utf-8", errors="ignore"))
-    return parser
-
-
-def _extract_public_path(loc: str) -> str:
-    parsed = urlsplit(loc)
-    path = (parsed.path or "/").strip() or "/"
-    if not path.startswith("/"):
-        path = f"/{path}"
-    if path != "/" and not path.endswith("/"):
-        path = f"{path}/"
-    return path
+    return meta_cache.read(html_path)
 
 
 def _public_path_to_html_path(generated_root: Path, public_path: str) -> Path:
@@ -262,7 +457,7 @@ def _normalize_title(title: str) -> str:
     return normalized
 
 
-def _resolve_link_title(public_path: str, page_meta: _PageMetaParser | None) -> str:
+def _resolve_link_title(public_path: str, page_meta: PageMeta | None) -> str:
     if public_path == "/":
         return "ГЛАВНАЯ СТРАНИЦА"
 
@@ -324,6 +519,34 @@ def _build_public_url(public_path: str) -> str:
     return f"{base}{public_path}"
 
 
+def _write_text_if_changed(target_path: Path, content: str) -> bool:
+    try:
+        if target_path.read_bytes() == content.encode("utf-8"):
+            return False
+    except OSError:
+        pass
+
+    _write_text_atomically(target_path, content)
+    return True
+
+
+def _remove_stale_sitemap_pages(sitemap_root: Path, *, keep) -> list[Path]:
+    keep = set(keep)
+    removed_paths = []
+    if not sitemap_root.is_dir():
+        return removed_paths
+    for html_path in sitemap_root.rglob("index.html"):
+        if html_path not in keep:
+            html_path.unlink()
+            removed_paths.append(html_path)
+
+    # Drop directories emptied above, deepest first.
+    for directory in sorted((path for path in sitemap_root.rglob("*") if path.is_dir()), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+    return removed_paths
+
+
 def _write_text_atomically(target_path: Path, content: str):
     target_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+
+def dump_json_fragment(value) -> str:
+    """Serialize like `JsonResponse` does, so stored fragments splice into its output unchanged."""
+    return json.dumps(value, cls=DjangoJSONEncoder)
+
+
+def extend_json_object(object_json: str, key: str, value_json: str) -> str:
+    """Append `"key": value` to a serialized non-empty JSON object without parsing it."""
+    return f"{object_json[:-1]}, {json.dumps(key)}: {value_json}}}"
+
+
+def build_json_list_response(payload: dict, item_fragments: list[str], *, list_key: str = "data") -> HttpResponse:
+    """
+    Return `payload` with `list_key` set to the pre-serialized items, as one JSON response.
+
+    The items are joined as text: no dict is built or serialized per row.
+    """
+    items_json = "[" + ", ".join(item_fragments) + "]"
+    if payload:
+        body = extend_json_object(dump_json_fragment(payload), list_key, items_json)
+    else:
+        body = "{" + json.dumps(list_key) + ": " + items_json + "}"
+    return HttpResponse(body, content_type="application/json")
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    object_list: list
+    has_next: bool
+    next_cursor: str | None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(values) -> str:
+    serialized = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(serialized, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, field_count: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor.") from exc
+
+    if (
+        not isinstance(values, list)
+        or len(values) != field_count
+        or not all(isinstance(value, (str, int)) and not isinstance(value, bool) for value in values)
+    ):
+        raise InvalidCursorError("Malformed cursor.")
+    return values
+
+
+def paginate_by_keyset(queryset: QuerySet, ordering: tuple[str, ...], *, cursor: str | None, limit: int) -> KeysetPage:
+    """
+    Return `limit` rows of `queryset` that follow `cursor` in `ordering`.
+
+    Unlike `Paginator` there is no COUNT query and no OFFSET scan: the cursor
+    holds the ordering values of the last row already sent, and `limit + 1`
+    rows are fetched to know whether another page exists. `ordering` must end
+    with a unique field so that rows with equal sort keys are not skipped.
+    An empty cursor starts from the first row.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, len(ordering))
+        try:
+            queryset = queryset.filter(_build_after_filter(ordering, values))
+        # Well-formed JSON of the wrong type per field: `"abc"` for an id, `1` for a datetime.
+        except (ValidationError, ValueError, TypeError) as exc:
+            raise InvalidCursorError("Malformed cursor.") from exc
+
+    rows = list(queryset[: limit + 1])
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_next:
+        last_row = rows[-1]
+        next_cursor = encode_cursor(getattr(last_row, field.lstrip("-")) for field in ordering)
+    return KeysetPage(object_list=rows, has_next=has_next, next_cursor=next_cursor)
+
+
+def _build_after_filter(ordering: tuple[str, ...], values: list) -> Q:
+    # (a, b, c) after (x, y, z): a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z),
+    # with "<" instead of ">" for descending fields.
+    condition = Q()
+    equal_prefix = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+        equal_prefix &= Q(**{name: value})
+    return condition
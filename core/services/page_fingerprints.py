@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime
+from pathlib import Path
+
+from django.utils import timezone
+
+from core.models import GeneratedPage
+
+# Values that follow `updated_at` rather than the page content: a block
+# reorder bumps them without changing what the page shows.
+_VOLATILE_CONTENT_RE = re.compile(r'"dateModified":\s*"[^"]*"')
+
+
+def fingerprint_page_html(html: str) -> str:
+    return hashlib.sha256(_VOLATILE_CONTENT_RE.sub("", html).encode("utf-8")).hexdigest()
+
+
+def build_generated_page_path(html_path: str | Path, generated_root: str | Path) -> str | None:
+    """Public path of a generated `.../index.html`, or None for other files."""
+    relative_path = Path(html_path).relative_to(generated_root)
+    if relative_path.name != "index.html":
+        return None
+    if relative_path.parts == ("index.html",):
+        return "/"
+    return "/" + "/".join(relative_path.parts[:-1]) + "/"
+
+
+def record_page_fingerprints(fingerprints: dict[str, str]) -> int:
+    """
+    Store content hashes of freshly generated pages, keyed by public path.
+
+    `content_changed_at` only moves when the hash differs from the stored one,
+    so re-rendering a page into the same content keeps its sitemap lastmod.
+    Returns the number of pages whose content actually changed.
+    """
+    if not fingerprints:
+        return 0
+
+    now = timezone.now()
+    existing = {page.path: page for page in GeneratedPage.objects.filter(path__in=list(fingerprints))}
+    created = []
+    changed = []
+    for path, content_hash in fingerprints.items():
+        page = existing.get(path)
+        if page is None:
+            created.append(GeneratedPage(path=path, content_hash=content_hash, content_changed_at=now))
+        elif page.content_hash != content_hash:
+            page.content_hash = content_hash
+            page.content_changed_at = now
+            changed.append(page)
+
+    if created:
+        GeneratedPage.objects.bulk_create(created, ignore_conflicts=True)
+    if changed:
+        GeneratedPage.objects.bulk_update(changed, ["content_hash", "content_changed_at"])
+    return len(created) + len(changed)
+
+
+def forget_page_fingerprints(paths) -> None:
+    """Drop fingerprints of deleted pages; a page that comes back counts as changed."""
+    paths = [path for path in paths if path]
+    if paths:
+        GeneratedPage.objects.filter(path__in=paths).delete()
+
+
+def get_content_changed_at_map(public_paths=None) -> dict[str, datetime]:
+    pages = GeneratedPage.objects.all()
+    if public_paths is not None:
+        public_paths = list(public_paths)
+        if not public_paths:
+            return {}
+        pages = pages.filter(path__in=public_paths)
+    return dict(pages.values_list("path", "content_changed_at"))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+
+# Generated pages keep robots, <title> and the first <h1> well inside this prefix.
+PAGE_META_PREFIX_BYTES = 16 * 1024
+
+_HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+_TITLE_RE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+_H1_RE = re.compile(r"<h1\b[^>]*>(.*?)</h1\s*>", re.IGNORECASE | re.DOTALL)
+_META_RE = re.compile(r"<meta\b([^>]*)>", re.IGNORECASE)
+_ATTRIBUTE_RE = re.compile(r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+_MARKUP_RE = re.compile(r"<!--.*?-->|<[^>]*>", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class PageMeta:
+    title: str = ""
+    h1: str = ""
+    robots_content: str = ""
+    has_noindex: bool = False
+    # True when the bounded prefix was not enough and the whole file was parsed.
+    full_parse: bool = False
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _PageMetaParser(HTMLParser):
+    def __init__(self, *, need_h1: bool, stop_early: bool = True):
+        super().__init__()
+        self.need_h1 = need_h1
+        self.stop_early = stop_early
+        self.complete = False
+        self.has_noindex = False
+        self.robots_content = ""
+        self._inside_title = False
+        self._title_parts: list[str] = []
+        self._inside_h1 = False
+        self._h1_parts: list[str] = []
+        self._h1_found = False
+
+    @property
+    def title(self) -> str:
+        return "".join(self._title_parts).strip()
+
+    @property
+    def h1(self) -> str:
+        return "".join(self._h1_parts).strip()
+
+    def handle_starttag(self, tag, attrs):
+        tag_name = tag.lower()
+        if tag_name == "title":
+            self._inside_title = True
+            return
+
+        if tag_name == "body" and not self.need_h1:
+            self._stop()
+            return
+
+        if tag_name == "h1" and not self._h1_found:
+            self._inside_h1 = True
+            return
+
+        if tag_name != "meta":
+            return
+
+        normalized_attrs = {}
+        for key, value in attrs:
+            if key:
+                normalized_attrs[key.lower()] = value or ""
+
+        if normalized_attrs.get("name", "").strip().lower() != "robots":
+            return
+
+        self.robots_content = normalized_attrs.get("content", "").strip()
+        if "noindex" in self.robots_content.lower():
+            self.has_noindex = True
+
+    def handle_endtag(self, tag):
+        tag_name = tag.lower()
+        if tag_name == "title":
+            self._inside_title = False
+        elif tag_name == "head" and not self.need_h1:
+            self._stop()
+        elif tag_name == "h1" and self._inside_h1:
+            self._inside_h1 = False
+            self._h1_found = True
+            self._stop()
+
+    def handle_data(self, data):
+        if self._inside_title:
+            self._title_parts.append(data)
+        if self._inside_h1:
+            self._h1_parts.append(data)
+
+    def _stop(self):
+        self.complete = True
+        if self.stop_early:
+            raise _StopParsing
+
+    def feed_until_complete(self, html: str):
+        try:
+            self.feed(html)
+            self.close()
+        except _StopParsing:
+            pass
+
+
+def read_page_meta(html_path: Path, *, need_h1: bool = True, prefix_bytes: int = PAGE_META_PREFIX_BYTES) -> PageMeta:
+    """
+    Read robots, <title> and (optionally) the first <h1> of a generated page.
+
+    Only a bounded prefix is read and scanned up to `</head>` and the first
+    `</h1>`, without running the HTML parser over the page. The whole file is
+    parsed only when the prefix ends before that point, e.g. a page without an
+    <h1> or with an oversized <head>.
+    """
+    with open(html_path, "rb") as source:
+        prefix = source.read(prefix_bytes)
+        truncated = bool(source.read(1))
+
+    page_meta = _scan_page_meta(prefix.decode("utf-8", errors="ignore"), need_h1=need_h1)
+    if page_meta is not None:
+        return page_meta
+    if not truncated:
+        # The whole page fit into the prefix: nothing else to look at.
+        return _parse_page_meta(prefix.decode("utf-8", errors="ignore"), need_h1=need_h1, full_parse=False)
+
+    return _parse_page_meta(html_path.read_text(encoding="utf-8", errors="ignore"), need_h1=need_h1, full_parse=True)
+
+
+def _scan_page_meta(html: str, *, need_h1: bool) -> PageMeta | None:
+    head_end = _HEAD_END_RE.search(html)
+    if head_end is None:
+        return None
+    head = html[: head_end.start()]
+
+    h1 = ""
+    if need_h1:
+        h1_match = _H1_RE.search(html, head_end.end())
+        if h1_match is None:
+            return None
+        h1 = unescape(_MARKUP_RE.sub("", h1_match.group(1))).strip()
+
+    title_match = _TITLE_RE.search(head)
+    robots_content = ""
+    has_noindex = False
+    for meta_match in _META_RE.finditer(head):
+        attributes = _parse_attributes(meta_match.group(1))
+        if attributes.get("name", "").strip().lower() != "robots":
+            continue
+        robots_content = attributes.get("content", "").strip()
+        has_noindex = has_noindex or "noindex" in robots_content.lower()
+
+    return PageMeta(
+        title=unescape(title_match.group(1)).strip() if title_match else "",
+        h1=h1,
+        robots_content=robots_content,
+        has_noindex=has_noindex,
+    )
+
+
+def _parse_attributes(raw_attributes: str) -> dict[str, str]:
+    attributes = {}
+    for name, double_quoted, single_quoted, unquoted in _ATTRIBUTE_RE.findall(raw_attributes):
+        attributes[name.lower()] = unescape(double_quoted or single_quoted or unquoted)
+    return attributes
+
+
+def _parse_page_meta(html: str, *, need_h1: bool, full_parse: bool) -> PageMeta:
+    parser = _PageMetaParser(need_h1=need_h1)
+    parser.feed_until_complete(html)
+    return PageMeta(
+        title=parser.title,
+        h1=parser.h1,
+        robots_content=parser.robots_content,
+        has_noindex=parser.has_noindex,
+        full_parse=full_parse,
+    )
+
+
+def read_full_page_meta(html_path: Path, *, need_h1: bool = True) -> PageMeta:
+    """Parse the whole document; the reference the prefix reader is benchmarked against."""
+    parser = _PageMetaParser(need_h1=need_h1, stop_early=False)
+    parser.feed_until_complete(html_path.read_text(encoding="utf-8", errors="ignore"))
+    return PageMeta(
+        title=parser.title,
+        h1=parser.h1,
+        robots_content=parser.robots_content,
+        has_noindex=parser.has_noindex,
+        full_parse=True,
+    )
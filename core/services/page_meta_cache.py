@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from django.conf import settings
+
+from core.services.page_meta import PageMeta, read_page_meta
+
+logger = logging.getLogger(__name__)
+
+PAGE_META_CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class PageMetaCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __sub__(self, other: PageMetaCacheStats) -> PageMetaCacheStats:
+        return PageMetaCacheStats(
+            hits=self.hits - other.hits,
+            misses=self.misses - other.misses,
+            evictions=self.evictions - other.evictions,
+        )
+
+
+def get_page_meta_cache_path() -> Path | None:
+    raw_path = (getattr(settings, "SITEMAP_META_CACHE_PATH", "") or "").strip()
+    if not raw_path:
+        return None
+
+    cache_path = Path(raw_path)
+    if not cache_path.is_absolute():
+        cache_path = Path(settings.BASE_DIR) / cache_path
+    return cache_path
+
+
+class PageMetaCache:
+    """
+    Page metadata of generated pages, keyed by path and stat signature.
+
+    A page is re-read only when its (size, mtime_ns, inode) changed since the
+    last build, or when the <h1> is asked for and the entry was read without
+    it. A page found to have no <h1> is cached as such, so it is not parsed in
+    full again. Without a cache path nothing is persisted and every lookup is
+    a miss. Lookups and stores are safe to call from the scan thread pool.
+    """
+
+    def __init__(self, cache_path: Path | None, generated_root: Path):
+        self.cache_path = cache_path
+        self.generated_root = generated_root
+        self._root_prefix = os.path.join(str(generated_root), "")
+        self._entries: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if cache_path is not None:
+            self._load()
+
+    @classmethod
+    def open(cls, generated_root: Path) -> PageMetaCache:
+        return cls(get_page_meta_cache_path(), generated_root)
+
+    @property
+    def stats(self) -> PageMetaCacheStats:
+        with self._lock:
+            return PageMetaCacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions)
+
+    def read(self, html_path: Path, *, need_h1: bool = True) -> PageMeta:
+        """Return the page metadata, re-reading the page only when its signature changed."""
+        page_meta, signature = self.lookup(html_path, need_h1=need_h1)
+        if page_meta is None:
+            page_meta = read_page_meta(html_path, need_h1=need_h1)
+            self.store(html_path, signature, page_meta, has_h1=need_h1)
+        return page_meta
+
+    def lookup(
+        self,
+        html_path: Path,
+        *,
+        need_h1: bool = True,
+    ) -> tuple[PageMeta | None, tuple[int, int, int] | None]:
+        """
+        Return the cached metadata (or None) and the current stat signature.
+
+        Pass the signature back to `store()`: it was taken before the page is
+        read, so a page rewritten meanwhile is simply re-read next time.
+        """
+        try:
+            stat_result = html_path.stat()
+        except OSError:
+            signature = None
+        else:
+            signature = (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+
+        cached = self._entries.get(self._key(html_path)) if signature is not None else None
+        with self._lock:
+            if (
+                cached is not None
+                and len(cached) == 8
+                and tuple(cached[:3]) == signature
+                and (cached[7] or not need_h1)
+            ):
+                self._hits += 1
+                title, h1, robots_content, has_noindex, _has_h1 = cached[3:]
+                return PageMeta(title=title, h1=h1, robots_content=robots_content, has_noindex=has_noindex), signature
+            self._misses += 1
+        return None, signature
+
+    def store(
+        self,
+        html_path: Path,
+        signature: tuple[int, int, int] | None,
+        page_meta: PageMeta,
+        *,
+        has_h1: bool = True,
+    ):
+        """Cache `page_meta`; `has_h1=False` marks metadata read without looking for the <h1>."""
+        if self.cache_path is None or signature is None:
+            return
+        entry = [
+            *signature,
+            page_meta.title,
+            page_meta.h1,
+            page_meta.robots_content,
+            page_meta.has_noindex,
+            has_h1,
+        ]
+        with self._lock:
+            self._entries[self._key(html_path)] = entry
+            self._dirty = True
+
+    def discard(self, html_path: Path):
+        with self._lock:
+            if self._entries.pop(self._key(html_path), None) is not None:
+                self._evictions += 1
+                self._dirty = True
+
+    def retain(self, html_paths):
+        """Evict every entry except `html_paths`, i.e. pages that no longer exist after a full scan."""
+        keep = {self._key(html_path) for html_path in html_paths}
+        with self._lock:
+            stale_keys = [key for key in self._entries if key not in keep]
+            for key in stale_keys:
+                del self._entries[key]
+            if stale_keys:
+                self._evictions += len(stale_keys)
+                self._dirty = True
+
+    def save(self):
+        if self.cache_path is None or not self._dirty:
+            return
+
+        payload = {
+            "version": PAGE_META_CACHE_VERSION,
+            "root": str(self.generated_root),
+            "entries": self._entries,
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile("w", encoding="utf-8", dir=self.cache_path.parent, delete=False) as temp_file:
+                json.dump(payload, temp_file, ensure_ascii=False, separators=(",", ":"))
+                temp_path = Path(temp_file.name)
+            temp_path.replace(self.cache_path)
+        except OSError:
+            # The cache only saves work; a build must not fail because of it.
+            logger.warning("Could not write page metadata cache to %s", self.cache_path, exc_info=True)
+            return
+        self._dirty = False
+
+    def _key(self, html_path: Path) -> str:
+        # Paths come from the generated root, so stripping the prefix is enough (and much cheaper than relpath).
+        path = str(html_path)
+        if path.startswith(self._root_prefix):
+            return path[len(self._root_prefix) :]
+        return path
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as source:
+                payload = json.load(source)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable page metadata cache at %s", self.cache_path)
+            return
+
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != PAGE_META_CACHE_VERSION
+            or payload.get("root") != str(self.generated_root)
+            or not isinstance(payload.get("entries"), dict)
+        ):
+            # Another format or another generated tree: start over.
+            return
+        self._entries = payload["entries"]
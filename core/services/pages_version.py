@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+from core.services.build_item_html import get_generated_pages_root, write_text_atomically
+
+# Template files are stat-ed at most this often per process, not on every request.
+TEMPLATES_RESCAN_SECONDS = 2.0
+DEPLOY_VERSION_MARKER = ".pages-version"
+
+
+@dataclass(frozen=True)
+class PagesVersion:
+    token: str
+    changed_at: datetime | None
+
+
+class _PagesVersionCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version: PagesVersion | None = None
+        self.scanned_at = 0.0
+
+
+_cache = _PagesVersionCache()
+
+
+def _get_template_dirs() -> list[Path]:
+    # App templates (the admin's among them) only change with a deploy, which bumps STATIC_PAGES_VERSION.
+    dirs = [Path(directory) for engine in settings.TEMPLATES for directory in engine.get("DIRS", ())]
+    return list(dict.fromkeys(dirs))
+
+
+def _scan_templates() -> tuple[str, float | None]:
+    digest = hashlib.sha1()
+    newest_mtime = None
+    for template_dir in _get_template_dirs():
+        for root, dir_names, file_names in os.walk(template_dir):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                file_path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                digest.update(f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8"))
+                newest_mtime = stat.st_mtime if newest_mtime is None else max(newest_mtime, stat.st_mtime)
+    return digest.hexdigest()[:12], newest_mtime
+
+
+def _get_deploy_version_seen_at(deploy_token: str) -> float | None:
+    """
+    When `STATIC_PAGES_VERSION` first took its current value, shared by all workers.
+
+    The time is kept next to the generated pages, so pages written before the
+    deploy are older than it and a worker started later does not move it.
+    """
+    if not deploy_token:
+        return None
+
+    marker_path = get_generated_pages_root() / DEPLOY_VERSION_MARKER
+    try:
+        marker = json.loads(marker_path.read_text(encoding="utf-8"))
+        if marker["version"] == deploy_token:
+            return float(marker["seen_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    seen_at = time.time()
+    try:
+        write_text_atomically(marker_path, json.dumps({"version": deploy_token, "seen_at": seen_at}))
+    except OSError:
+        pass
+    return seen_at
+
+
+def get_pages_version() -> PagesVersion:
+    """
+    Version of what shapes a response besides its content rows.
+
+    Covers the project template files (including frontend partials synced
+    into `templates/partials`) and `STATIC_PAGES_VERSION`, which deploys
+    bump for everything else, e.g. app templates, frontend assets or
+    serializer code.
+    `changed_at` is the newest template mtime or the time the deploy version
+    was first seen, whichever is later.
+    """
+    now = time.monotonic()
+    with _cache.lock:
+        if _cache.version is not None and now - _cache.scanned_at < TEMPLATES_RESCAN_SECONDS:
+            return _cache.version
+
+    templates_token, templates_mtime = _scan_templates()
+    deploy_token = getattr(settings, "STATIC_PAGES_VERSION", "")
+    changed_at = max(
+        (value for value in (templates_mtime, _get_deploy_version_seen_at(deploy_token)) if value is not None),
+        default=None,
+    )
+    version = PagesVersion(
+        token=f"{deploy_token}:{templates_token}",
+        changed_at=datetime.fromtimestamp(changed_at, tz=timezone.utc) if changed_at is not None else None,
+    )
+    with _cache.lock:
+        _cache.version = version
+        _cache.scanned_at = now
+    return version
+
+
+def reset_pages_version():
+    """Forget the scanned version, e.g. right after templates were written."""
+    with _cache.lock:
+        _cache.version = None
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from blog.models import Articles
+from blog.services.article_cards import refresh_article_cards
+from blog.services.article_rendering import build_public_article_path
+from core.services.build_item_html import build_items_detail_static_html, delete_item_detail_static_html
+from core.services.response_cache import bump_content_versions
+from core.services.sitemap_debounce import request_sitemap_rebuild
+from projects.models import ProjectCategories, Projects
+from projects.services.project_listing import (
+    build_public_project_category_path,
+    build_public_projects_path,
+    rebuild_projects_listing_static_html,
+    refresh_project_cards,
+)
+from projects.services.project_rendering import build_public_project_path
+
+_local = threading.local()
+
+
+@dataclass
+class RegenerationBatch:
+    """
+    Static pages made dirty by one transaction.
+
+    Signal handlers only record targets here; the pages and listings are
+    regenerated once when the transaction commits, no matter how many rows were
+    saved, and the sitemap rebuild is handed to the debouncer. API response
+    cache versions are bumped last, even when a rebuild fails.
+    """
+
+    using: str = DEFAULT_DB_ALIAS
+    article_ids: set[int] = field(default_factory=set)
+    project_ids: set[int] = field(default_factory=set)
+    removed_article_pages: dict[str, Articles] = field(default_factory=dict)
+    removed_project_pages: dict[str, Projects] = field(default_factory=dict)
+    touched_article_ids: set[int] = field(default_factory=set)
+    touched_project_ids: set[int] = field(default_factory=set)
+    saved_article_ids: set[int] = field(default_factory=set)
+    saved_project_ids: set[int] = field(default_factory=set)
+    project_category_slugs: set[str] = field(default_factory=set)
+    project_category_ids: set[int] = field(default_factory=set)
+    rebuild_all_project_listings: bool = False
+    prune_stale_project_listings: bool = False
+    sitemaps: bool = False
+    full_sitemap_rebuild: bool = False
+    api_content_types: set[str] = field(default_factory=set)
+    flushed: bool = False
+
+    def add_article(self, article_id: int | None, *, saved: bool = False):
+        if article_id:
+            self.article_ids.add(article_id)
+            if saved:
+                self.saved_article_ids.add(article_id)
+        self.sitemaps = True
+
+    def touch_article(self, article_id: int):
+        """Bump `updated_at` of an article whose blocks changed and rebuild it."""
+        self.touched_article_ids.add(article_id)
+        self.add_article(article_id)
+
+    def remove_article_page(self, article: Articles, slug: str | None = None):
+        self.removed_article_pages[slug or article.slug] = article
+        self.sitemaps = True
+
+    def add_project(self, project_id: int | None, *, saved: bool = False, category_ids=()):
+        if project_id:
+            self.project_ids.add(project_id)
+            if saved:
+                self.saved_project_ids.add(project_id)
+        self.add_project_category_ids(*category_ids)
+
+    def touch_project(self, project_id: int):
+        """Bump `updated_at` of a project whose blocks changed and rebuild it."""
+        self.touched_project_ids.add(project_id)
+        self.add_project(project_id)
+
+    def remove_project_page(self, project: Projects, slug: str | None = None, *, category_ids=()):
+        self.removed_project_pages[slug or project.slug] = project
+        if Projects.category.is_cached(project):
+            self.add_project_categories(project.category.slug)
+            category_ids = [category_id for category_id in category_ids if category_id != project.category_id]
+        self.add_project_category_ids(*category_ids)
+
+    def add_project_categories(self, *category_slugs: str | None):
+        self.project_category_slugs.update(slug for slug in category_slugs if slug)
+        self.sitemaps = True
+
+    def add_project_category_ids(self, *category_ids: int | None):
+        self.project_category_ids.update(category_id for category_id in category_ids if category_id)
+        self.sitemaps = True
+
+    def add_all_project_listings(self, *, prune_stale: bool = False):
+        self.rebuild_all_project_listings = True
+        self.prune_stale_project_listings = self.prune_stale_project_listings or prune_stale
+        self.sitemaps = True
+
+    def add_api_content(self, *content_types: str):
+        """Orphan cached API responses of `content_types` once the batch is flushed."""
+        self.api_content_types.update(content_types)
+
+    def add_sitemaps(self):
+        """Rebuild the sitemaps from scratch, e.g. when the touched pages are unknown."""
+        self.sitemaps = True
+        self.full_sitemap_rebuild = True
+
+    @property
+    def has_project_changes(self) -> bool:
+        return bool(
+            self.project_ids
+            or self.removed_project_pages
+            or self.project_category_slugs
+            or self.project_category_ids
+            or self.rebuild_all_project_listings
+        )
+
+    def flush(self):
+        # Every mark registers this bound method; only the first call does the work.
+        if self.flushed:
+            return
+        self.flushed = True
+        if getattr(_local, "batches", {}).get(self.using) is self:
+            del _local.batches[self.using]
+
+        try:
+            self._regenerate()
+        finally:
+            # After the cards are refreshed, and also when a page build raised: a skipped bump would
+            # keep serving the old responses until they expire.
+            bump_content_versions(*self.api_content_types)
+
+    def _regenerate(self):
+        self._bump_updated_at()
+        self._refresh_cards()
+        touched_paths = set()
+
+        for slug, article in self.removed_article_pages.items():
+            delete_item_detail_static_html(article, "articles", slug_override=slug)
+            touched_paths.add(build_public_article_path(slug))
+        for slug, project in self.removed_project_pages.items():
+            delete_item_detail_static_html(project, "projects", slug_override=slug)
+            touched_paths.add(build_public_project_path(slug))
+
+        published_articles = []
+        for article in Articles.objects.filter(pk__in=self.article_ids).order_by("pk"):
+            touched_paths.add(build_public_article_path(article.slug))
+            if article.is_published:
+                published_articles.append(article)
+            else:
+                delete_item_detail_static_html(article, "articles")
+        if published_articles:
+            build_items_detail_static_html(published_articles, "article_detail.html", "articles")
+
+        category_slugs = set(self.project_category_slugs)
+        category_ids = set(self.project_category_ids)
+        published_projects = []
+        for project in Projects.objects.select_related("category").filter(pk__in=self.project_ids).order_by("pk"):
+            touched_paths.add(build_public_project_path(project.slug))
+            if project.is_published:
+                published_projects.append(project)
+            else:
+                delete_item_detail_static_html(project, "projects")
+            category_slugs.add(project.category.slug)
+            category_ids.discard(project.category_id)
+        if published_projects:
+            build_items_detail_static_html(published_projects, "project_detail.html", "projects")
+        if category_ids and not self.rebuild_all_project_listings:
+            # Categories a project moved away from or was deleted from, resolved in one query.
+            category_slugs.update(ProjectCategories.objects.filter(pk__in=category_ids).values_list("slug", flat=True))
+
+        if self.rebuild_all_project_listings:
+            rebuild_projects_listing_static_html(prune_stale=self.prune_stale_project_listings)
+        elif self.has_project_changes:
+            rebuild_projects_listing_static_html(category_slugs=category_slugs)
+            touched_paths.add(build_public_projects_path())
+            touched_paths.update(build_public_project_category_path(slug) for slug in category_slugs)
+
+        if self.sitemaps:
+            # Pruned category pages are not known here, so a full listing rebuild also rebuilds the sitemaps.
+            if self.full_sitemap_rebuild or self.rebuild_all_project_listings:
+                request_sitemap_rebuild()
+            else:
+                request_sitemap_rebuild(touched_paths)
+
+    def _refresh_cards(self):
+        # Before the API response versions are bumped at the end of the flush.
+        if self.article_ids:
+            refresh_article_cards(self.article_ids)
+        if self.rebuild_all_project_listings:
+            # A category changed: its title is part of every card in it.
+            refresh_project_cards()
+        elif self.project_ids:
+            refresh_project_cards(self.project_ids)
+
+    def _bump_updated_at(self):
+        # Parents saved in this transaction already got a fresh `updated_at` from auto_now.
+        now = timezone.now()
+        article_ids = self.touched_article_ids - self.saved_article_ids
+        if article_ids:
+            Articles.objects.filter(pk__in=article_ids).update(updated_at=now)
+        project_ids = self.touched_project_ids - self.saved_project_ids
+        if project_ids:
+            Projects.objects.filter(pk__in=project_ids).update(updated_at=now)
+
+
+def _is_pending_on_commit(batch: RegenerationBatch) -> bool:
+    connection = connections[batch.using]
+    return any(callback == batch.flush for _sids, callback, _robust in connection.run_on_commit)
+
+
+def _get_active_batch(using: str) -> RegenerationBatch:
+    batches = getattr(_local, "batches", None)
+    if batches is None:
+        batches = _local.batches = {}
+
+    batch = batches.get(using)
+    if batch is not None and not batch.flushed and not _is_pending_on_commit(batch):
+        # The transaction that collected these targets was rolled back.
+        batch = None
+
+    if batch is None or batch.flushed:
+        batch = batches[using] = RegenerationBatch(using=using)
+    return batch
+
+
+@contextmanager
+def regeneration_batch(using: str | None = None):
+    """
+    Collect targets into the batch of the current transaction.
+
+    The flush is registered with `transaction.on_commit` after the block, so in
+    autocommit mode it runs right away with everything recorded inside it.
+    """
+    batch = _get_active_batch(using or DEFAULT_DB_ALIAS)
+    yield batch
+    transaction.on_commit(batch.flush, using=batch.using)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+MAX_PRECONNECT_ORIGINS = 2
+
+
+def get_url_origin(url: str | None) -> str:
+    if not url:
+        return ""
+
+    parsed = urlsplit(url.strip())
+    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+        return ""
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def get_media_preview_url(item) -> str:
+    """URL of the image a rendered media item shows first: the poster for videos."""
+    if not item:
+        return ""
+    if item.get("kind") == "video":
+        return item.get("poster") or ""
+    return item.get("url") or ""
+
+
+def _get_site_origin() -> str:
+    return get_url_origin(getattr(settings, "SITE_PUBLIC_BASE_URL", ""))
+
+
+def _get_configured_media_origins() -> list[str]:
+    # Uploaded media is served from the bucket host, see VKCloudStorage.upload_media.
+    bucket_name = (getattr(settings, "VK_CLOUD_BUCKET_NAME", "") or "").strip()
+    s3_domain = (getattr(settings, "VK_CLOUD_S3_DOMAIN", "") or "").strip().strip("/")
+    if not bucket_name or not s3_domain:
+        return []
+
+    origin = get_url_origin(f"https://{bucket_name}.{s3_domain}")
+    return [origin] if origin else []
+
+
+def build_preconnect_origins(media_urls=(), *, limit: int = MAX_PRECONNECT_ORIGINS) -> list[str]:
+    """
+    Collect cross-origin hosts that serve the page media, hero host first.
+
+    Origins found on the page win over configured storage origins, the site
+    origin itself is skipped, and the list is capped because every extra
+    preconnect competes with the hero request.
+    """
+    site_origin = _get_site_origin()
+    candidates = [get_url_origin(url) for url in media_urls]
+    candidates.extend(_get_configured_media_origins())
+
+    origins = []
+    for origin in candidates:
+        if not origin or origin == site_origin or origin in origins:
+            continue
+        origins.append(origin)
+        if len(origins) >= limit:
+            break
+
+    return origins
+
+
+def build_hero_image_preload(
+    url: str | None,
+    *,
+    srcset: str = "",
+    sizes: str = "",
+    media: str = "",
+) -> dict[str, str] | None:
+    href = (url or "").strip()
+    if not href:
+        return None
+
+    return {
+        "href": href,
+        "srcset": srcset.strip(),
+        "sizes": sizes.strip() if srcset else "",
+        "media": media.strip(),
+    }
+
+
+def build_page_resource_hints(
+    *,
+    hero_image: str | None = None,
+    hero_srcset: str = "",
+    hero_sizes: str = "",
+    hero_media: str = "",
+    media_urls=(),
+) -> dict[str, object]:
+    """Build the `resource_hints` context consumed by `includes/resource_hints.html`."""
+    hero_preload = build_hero_image_preload(
+        hero_image,
+        srcset=hero_srcset,
+        sizes=hero_sizes,
+        media=hero_media,
+    )
+    return {
+        "preconnects": build_preconnect_origins([hero_image, *media_urls]),
+        "hero_preload": hero_preload,
+    }
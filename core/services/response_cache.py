@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial, wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from core.services.pages_version import get_pages_version
+
+RESPONSE_CACHE_ALIAS = "api_responses"
+ARTICLES_CONTENT = "articles"
+PROJECTS_CONTENT = "projects"
+PRESS_CONTENT = "press"
+
+_VERSION_KEY = "api-response:version:{content_type}"
+_HITS_KEY = "api-response:stats:hits"
+_MISSES_KEY = "api-response:stats:misses"
+# Hits and misses are added to the shared totals in batches, not with a cache write per request.
+STATS_FLUSH_EVERY = 50
+
+
+@dataclass(frozen=True)
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _PendingStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+_pending_stats = _PendingStats()
+
+
+def is_response_cache_enabled() -> bool:
+    return bool(getattr(settings, "API_RESPONSE_CACHE_ENABLED", False))
+
+
+def get_response_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def get_content_versions(*content_types: str) -> list[int]:
+    cache = get_response_cache()
+    keys = [_VERSION_KEY.format(content_type=content_type) for content_type in content_types]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Evicted or never bumped: start from the clock so an old counter value never comes back.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_content_versions(*content_types: str):
+    """Orphan every cached response built from `content_types`; nothing is scanned or deleted."""
+    if not is_response_cache_enabled() or not content_types:
+        return
+    cache = get_response_cache()
+    cache.set_many(
+        {_VERSION_KEY.format(content_type=content_type): time.time_ns() for content_type in content_types},
+        timeout=None,
+    )
+
+
+def bump_content_versions_on_commit(*content_types: str, using: str | None = None):
+    """
+    Bump after commit, for content without static pages (press).
+
+    A bump before commit would let a concurrent request cache the old rows
+    under the new version. Content rebuilt by a `RegenerationBatch` is bumped
+    by its flush instead, after the cards it refreshes.
+    """
+    # Robust: a failed cache write must not drop the other on-commit callbacks.
+    transaction.on_commit(partial(bump_content_versions, *content_types), using=using, robust=True)
+
+
+def cached_response(*content_types: str):
+    """
+    Serve successful GET responses from the API response cache.
+
+    Keys combine the view, the path with its sorted query string, the pages
+    version (templates, `STATIC_PAGES_VERSION`) and the current version of
+    each content type the response is built from. Regeneration batches bump
+    those versions on commit, so stale entries are never read again and
+    simply age out of the cache.
+    """
+
+    def decorator(view_func):
+        view_name = f"{view_func.__module__}.{view_func.__qualname__}"
+
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if not is_response_cache_enabled() or request.method not in ("GET", "HEAD"):
+                return view_func(request, *args, **kwargs)
+
+            cache = get_response_cache()
+            cache_key = _build_cache_key(view_name, request, get_content_versions(*content_types))
+            cached = cache.get(cache_key)
+            if cached is not None:
+                _record_lookup(hit=True)
+                content_type, content = cached
+                response = HttpResponse(content, content_type=content_type)
+                response.response_cache_key = cache_key
+                response["X-Response-Cache"] = "hit"
+                return response
+
+            _record_lookup(hit=False)
+            response = view_func(request, *args, **kwargs)
+            # An X-Accel-Redirect body is empty: nginx fills it in, so there is nothing to keep.
+            if response.status_code == 200 and not response.streaming and not response.has_header("X-Accel-Redirect"):
+                cache.set(cache_key, (response["Content-Type"], response.content))
+                response.response_cache_key = cache_key
+            response["X-Response-Cache"] = "miss"
+            return response
+
+        return inner
+
+    return decorator
+
+
+def get_cached_variant(response, encoding: str) -> bytes | None:
+    """A stored encoding (e.g. the gzip body) of a response served by `cached_response`."""
+    cache_key = getattr(response, "response_cache_key", None)
+    if cache_key is None:
+        return None
+    return get_response_cache().get(f"{cache_key}:{encoding}")
+
+
+def set_cached_variant(response, encoding: str, content: bytes):
+    # Keyed off the entry's versioned key, so a content bump orphans the variants with it.
+    cache_key = getattr(response, "response_cache_key", None)
+    if cache_key is not None:
+        get_response_cache().set(f"{cache_key}:{encoding}", content)
+
+
+def get_response_cache_stats() -> ResponseCacheStats:
+    """Hit and miss totals of every process sharing the cache (counts not yet flushed are included)."""
+    flush_response_cache_stats()
+    totals = get_response_cache().get_many([_HITS_KEY, _MISSES_KEY])
+    return ResponseCacheStats(hits=totals.get(_HITS_KEY, 0), misses=totals.get(_MISSES_KEY, 0))
+
+
+def reset_response_cache_stats():
+    with _pending_stats.lock:
+        _pending_stats.hits = _pending_stats.misses = 0
+    get_response_cache().delete_many([_HITS_KEY, _MISSES_KEY])
+
+
+def flush_response_cache_stats():
+    with _pending_stats.lock:
+        hits, misses = _pending_stats.hits, _pending_stats.misses
+        _pending_stats.hits = _pending_stats.misses = 0
+    if not hits and not misses:
+        return
+
+    # Read-modify-write: concurrent flushes from other processes may lose a batch, which only
+    # blurs the ratio a little.
+    cache = get_response_cache()
+    totals = cache.get_many([_HITS_KEY, _MISSES_KEY])
+    cache.set_many(
+        {
+            _HITS_KEY: totals.get(_HITS_KEY, 0) + hits,
+            _MISSES_KEY: totals.get(_MISSES_KEY, 0) + misses,
+        },
+        timeout=None,
+    )
+
+
+def _record_lookup(*, hit: bool):
+    with _pending_stats.lock:
+        if hit:
+            _pending_stats.hits += 1
+        else:
+            _pending_stats.misses += 1
+        should_flush = _pending_stats.hits + _pending_stats.misses >= STATS_FLUSH_EVERY
+    if should_flush:
+        flush_response_cache_stats()
+
+
+def _build_cache_key(view_name: str, request, versions: list[int]) -> str:
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    request_hash = hashlib.sha1(f"{request.path}?{query}".encode("utf-8")).hexdigest()
+    return "api-response:{view}:{pages_version}:{versions}:{request_hash}".format(
+        view=view_name,
+        pages_version=get_pages_version().token,
+        versions="-".join(str(version) for version in versions),
+        request_hash=request_hash,
+    )
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import heapq
+import json
 import os
-from dataclasses import dataclass
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from itertools import islice
 from datetime import datetime, timezone as dt_timezone
-from html.parser import HTMLParser
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from time import perf_counter
+from urllib.parse import urlsplit
+import xml.etree.ElementTree as ET
 from xml.sax.saxutils import escape
 
 from django.conf import settings
@@ -13,7 +24,10 @@ from django.utils import timezone
 
 from blog.models import Articles
 from blog.services.article_rendering import build_public_article_path
-from core.services.build_item_html import get_generated_pages_root
+from core.services.build_item_html import get_generated_pages_root, write_text_atomically
+from core.services.page_meta import PageMeta
+from core.services.page_fingerprints import get_content_changed_at_map
+from core.services.page_meta_cache import PageMetaCache, PageMetaCacheStats
 from projects.models import Projects
 from projects.services.project_rendering import build_public_project_path
 
@@ -21,9 +35,36 @@ SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
 SITEMAP_FILENAME = "sitemap.xml"
 CMS_DETAIL_FOLDERS = {"articles", "projects"}
 
+# Protocol limits for one sitemap file, see https://www.sitemaps.org/protocol.html.
+SITEMAP_MAX_URLS_PER_FILE = 50_000
+SITEMAP_MAX_BYTES_PER_FILE = 50 * 1024 * 1024
+SITEMAP_SECTIONS = ("pages", "articles", "projects")
+SITEMAP_SECTION_FILE_RE = re.compile(r"^sitemap-(?:pages|articles|projects)-\d+\.xml(?:\.gz)?$")
+# Candidate pages read, looked up and written per batch, so a section is never held in memory as a whole.
+SITEMAP_SCAN_CHUNK_SIZE = 2_000
+CMS_DETAIL_SOURCES = {
+    "articles": (Articles, build_public_article_path),
+    "projects": (Projects, build_public_project_path),
+}
+
+# What the last build wrote per section, kept in the generated root like `.pages-version`.
+SITEMAP_STATE_FILENAME = ".sitemap-state.json"
+SITEMAP_STATE_VERSION = 2
+# The entries of each section as JSON lines `[public_path, lastmod, priority, html sitemap title]`, in sitemap order.
+SITEMAP_ENTRIES_FILENAME = ".sitemap-entries-{section}.jsonl"
+SITEMAP_CHANGEFREQ = "weekly"
+
+_URLSET_HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+_URLSET_FOOTER = "</urlset>\n"
+_SITEMAP_INDEX_HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+_SITEMAP_INDEX_FOOTER = "</sitemapindex>\n"
+
 
 @dataclass(frozen=True)
 class SitemapEntry:
+    # Slots keep per-URL memory small when a site has tens of thousands of pages.
+    __slots__ = ("public_path", "loc", "lastmod", "changefreq", "priority")
+
     public_path: str
     loc: str
     lastmod: str
@@ -36,6 +77,29 @@ class SitemapBuildResult:
     output_path: Path
     url_count: int
     skipped_noindex_count: int
+    # Number of public paths re-examined by an incremental update; None for a full rebuild.
+    touched_path_count: int | None = None
+    # Section files behind a sitemap index; empty when sitemap.xml is a single urlset.
+    section_files: tuple[Path, ...] = ()
+    rewritten_file_count: int = 0
+    # Wall time of the build, most of it reading page metadata, and the threads used for the reads.
+    scan_seconds: float = 0.0
+    scan_workers: int = 1
+    # Pages served from / re-read past the page metadata cache, and entries dropped for missing pages.
+    meta_cache_stats: PageMetaCacheStats = field(default_factory=PageMetaCacheStats)
+    # Sections of sitemap.xml that were scanned, and those whose stored entries were patched for the
+    # touched paths; the others were kept as the last build wrote them.
+    rebuilt_sections: tuple[str, ...] = ()
+    patched_sections: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class _SitemapWriteStats:
+    section_files: tuple[Path, ...]
+    rewritten_file_count: int
+    # sitemap.xml as written, and the (file name, lastmod, url count) of each section's files behind an index.
+    digest: str
+    files_by_section: dict[str, list[tuple[str, str, int]]]
 
 
 @dataclass(frozen=True)
@@ -44,93 +108,709 @@ class PublicSitemapsBuildResult:
     html_result: HtmlSitemapBuildResult
 
 
-class _RobotsMetaParser(HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self.has_noindex = False
+@dataclass
+class _SectionState:
+    url_count: int = 0
+    # Candidate pages left out for their robots noindex.
+    noindex_paths: list[str] = field(default_factory=list)
+    # (file name, lastmod, url count) of the section files behind a sitemap index.
+    files: list[tuple[str, str, int]] = field(default_factory=list)
+    # Links per HTML sitemap section, and the page size they were rendered with; None when not rendered.
+    html_link_counts: dict[str, int] = field(default_factory=dict)
+    html_page_size: int | None = None
 
-    def handle_starttag(self, tag, attrs):
-        if self.has_noindex or tag.lower() != "meta":
-            return
 
-        normalized_attrs = {}
-        for key, value in attrs:
-            if key:
-                normalized_attrs[key.lower()] = value or ""
+@dataclass
+class _SitemapState:
+    """
+    What the last build wrote, kept next to the generated pages.
+
+    With the entries stored per section, an incremental build re-reads only
+    the touched pages and patches their entries in: the other pages are not
+    read, and behind an index only the section files holding a changed
+    entry are rewritten.
+    """
+
+    base_url: str
+    use_index: bool
+    compress: bool
+    digest: str
+    sections: dict[str, _SectionState]
 
-        if normalized_attrs.get("name", "").strip().lower() != "robots":
-            return
 
-        if "noindex" in normalized_attrs.get("content", "").lower():
-            self.has_noindex = True
+def get_sitemap_scan_workers() -> int:
+    return max(int(getattr(settings, "SITEMAP_SCAN_WORKERS", 1) or 1), 1)
 
 
 def build_sitemap() -> SitemapBuildResult:
+    xml_result, _html_result = _build_sitemaps(None)
+    return xml_result
+
+
+def update_sitemap(touched_paths) -> SitemapBuildResult:
+    """
+    Patch the entries of `touched_paths` into sitemap.xml.
+
+    Only the touched pages are read again; their entries are inserted,
+    replaced or dropped among the entries the last build stored, and behind
+    an index only the section files holding a changed entry are rewritten.
+    Falls back to a full rebuild when there is no usable state of the last
+    build, e.g. no sitemap.xml yet, another SITE_PUBLIC_BASE_URL or another
+    layout.
+    """
+    xml_result, _html_result = _build_sitemaps(touched_paths)
+    return xml_result
+
+
+def build_public_sitemaps(touched_paths=None) -> PublicSitemapsBuildResult:
+    """
+    Rebuild sitemap.xml and the HTML sitemap, fully or for `touched_paths` like `update_sitemap()`.
+
+    Both are rendered from one read of each page: the HTML sitemap neither
+    parses sitemap.xml back nor re-reads pages, and its sections are only
+    rendered again when an entry of theirs changed.
+    """
+    from core.services.html_sitemap import HtmlSitemapWriter
+
+    xml_result, html_result = _build_sitemaps(touched_paths, html_writer=HtmlSitemapWriter.open())
+    return PublicSitemapsBuildResult(
+        xml_result=xml_result,
+        html_result=html_result,
+    )
+
+
+def _build_sitemaps(touched_paths, *, html_writer=None):
+    started_at = perf_counter()
     generated_root = get_generated_pages_root()
     generated_root.mkdir(parents=True, exist_ok=True)
+    output_path = generated_root / SITEMAP_FILENAME
+    meta_cache = PageMetaCache.open(generated_root)
+    cache_stats_before = meta_cache.stats
+    # Only the HTML sitemap uses the <h1>.
+    need_h1 = html_writer is not None
+    html_page_size = html_writer.page_size if html_writer is not None else None
+    compress = bool(getattr(settings, "SITEMAP_GZIP", False))
+    workers = get_sitemap_scan_workers()
 
-    cms_lastmods = _build_cms_lastmod_map()
-    entries = []
-    skipped_noindex_count = 0
+    state = None
+    touched_by_section: dict[str, set[str]] = {}
+    if touched_paths is not None:
+        touched_paths = {_normalize_public_path(path) for path in touched_paths}
+        for public_path in touched_paths:
+            touched_by_section.setdefault(_resolve_sitemap_section(public_path), set()).add(public_path)
+        state = _read_sitemap_state(generated_root)
+    # Written again once everything else is: a build that stops halfway leaves no state to patch.
+    (generated_root / SITEMAP_STATE_FILENAME).unlink(missing_ok=True)
 
-    for html_path in _iter_public_html_files(generated_root):
-        relative_path = html_path.relative_to(generated_root)
+    scan_sections = SITEMAP_SECTIONS
+    if state is not None:
+        # Stored HTML titles are only good for the page size they were rendered with.
+        scan_sections = tuple(
+            section
+            for section in SITEMAP_SECTIONS
+            if need_h1 and state.sections[section].html_page_size != html_page_size
+        )
+        for public_path in touched_paths:
+            html_path = generated_root / _build_relative_path(public_path)
+            if not html_path.is_file():
+                meta_cache.discard(html_path)
 
-        if _is_noindex_page(html_path):
-            skipped_noindex_count += 1
-            continue
+    # One pool serves the metadata reads of every chunk of every section.
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sitemap-scan") if workers > 1 else nullcontext()
+    with pool as executor:
+        new_scan = partial(
+            _SectionScan,
+            generated_root=generated_root,
+            meta_cache=meta_cache,
+            executor=executor,
+            need_h1=need_h1,
+        )
+        scans = {section: new_scan(section) for section in scan_sections}
+        patches = {}
+        if state is not None:
+            # The layout is decided before anything is written, from the candidate pages:
+            # noindex pages are only known once read.
+            url_bound = sum(
+                scans[section].candidate_count
+                if section in scans
+                else state.sections[section].url_count + len(touched_by_section.get(section, ()))
+                for section in SITEMAP_SECTIONS
+            )
+            use_index = _use_sitemap_index(url_bound)
+            try:
+                if not _is_usable_state(state, output_path, use_index=use_index, compress=compress):
+                    raise ValueError("The sitemap state does not match the files on disk.")
+                for section in SITEMAP_SECTIONS:
+                    if section not in scans and section in touched_by_section:
+                        patches[section] = _SectionPatch.load(
+                            generated_root, section, state.sections[section], use_index=use_index
+                        )
+            except ValueError:
+                # Another layout, host or file than the last build left: rebuild every section.
+                state = None
+                patches = {}
+        if state is None:
+            for section in SITEMAP_SECTIONS:
+                if section not in scans:
+                    scans[section] = new_scan(section)
+            use_index = _use_sitemap_index(sum(scan.candidate_count for scan in scans.values()))
 
-        public_path = _build_public_path(relative_path)
-        if _is_cms_detail_page(relative_path):
-            lastmod = cms_lastmods.get(public_path)
-            if not lastmod:
-                # Skip stale generated files for unpublished or deleted CMS items.
+        for section, patch in patches.items():
+            patch.apply(
+                touched_by_section[section],
+                generated_root=generated_root,
+                meta_cache=meta_cache,
+                executor=executor,
+                html_writer=html_writer,
+            )
+
+        entries_files = {
+            section: _StreamingSitemapFile(generated_root / SITEMAP_ENTRIES_FILENAME.format(section=section))
+            for section in (*scans, *(section for section, patch in patches.items() if patch.changed))
+        }
+
+        def iter_section_entries(scan, entries_file):
+            for entry, page_meta in scan:
+                title = html_writer.add_page(entry, page_meta) if html_writer is not None else None
+                entries_file.write(_dump_entry_row(entry, title))
+                yield entry
+
+        try:
+            write_stats = _write_sitemap(
+                output_path,
+                {
+                    section: (
+                        iter_section_entries(scans[section], entries_files[section])
+                        if section in scans
+                        else patches.get(section)
+                    )
+                    for section in SITEMAP_SECTIONS
+                },
+                state,
+                use_index=use_index,
+                compress=compress,
+            )
+            for section, patch in patches.items():
+                if patch.changed:
+                    for row in patch.iter_rows():
+                        entries_files[section].write(_dump_row(row))
+            for entries_file in entries_files.values():
+                entries_file.commit()
+        except BaseException:
+            for entries_file in entries_files.values():
+                entries_file.discard()
+            raise
+
+    if state is None and meta_cache.cache_path is not None:
+        meta_cache.retain(html_path for scan in scans.values() for html_path in scan.html_paths)
+    meta_cache.save()
+
+    sections_state = {}
+    rendered_sections = set()
+    for section in SITEMAP_SECTIONS:
+        scan = scans.get(section)
+        patch = patches.get(section)
+        if scan is not None:
+            sections_state[section] = _SectionState(
+                url_count=scan.url_count,
+                noindex_paths=scan.noindex_paths,
+                files=write_stats.files_by_section.get(section, []),
+                html_link_counts=html_writer.write_sitemap_section(section) if html_writer is not None else {},
+                html_page_size=html_page_size,
+            )
+            rendered_sections.add(section)
+        elif patch is not None:
+            section_state = state.sections[section]
+            html_link_counts = section_state.html_link_counts
+            section_page_size = section_state.html_page_size
+            if patch.changed and html_writer is not None:
+                for entry, title in patch.iter_links():
+                    html_writer.add_link(entry, title)
+                html_link_counts = html_writer.write_sitemap_section(section)
+                rendered_sections.add(section)
+            elif patch.changed:
+                # The touched pages were read without their <h1>: the next HTML build rescans the section.
+                section_page_size = None
+            sections_state[section] = _SectionState(
+                url_count=patch.url_count,
+                noindex_paths=patch.noindex_paths,
+                files=write_stats.files_by_section.get(section, []),
+                html_link_counts=html_link_counts,
+                html_page_size=section_page_size,
+            )
+        else:
+            sections_state[section] = state.sections[section]
+
+    html_result = None
+    if html_writer is not None:
+        html_result = html_writer.finish(
+            {
+                key: count
+                for section in SITEMAP_SECTIONS
+                if section not in rendered_sections
+                for key, count in sections_state[section].html_link_counts.items()
+            },
+            prune=state is None,
+        )
+
+    _write_sitemap_state(
+        generated_root,
+        _SitemapState(
+            base_url=_build_public_url(""),
+            use_index=use_index,
+            compress=compress,
+            digest=write_stats.digest,
+            sections=sections_state,
+        ),
+    )
+
+    read_counts = [scan.candidate_count for scan in scans.values()] + [patch.read_count for patch in patches.values()]
+    xml_result = SitemapBuildResult(
+        output_path=output_path,
+        url_count=sum(section_state.url_count for section_state in sections_state.values()),
+        skipped_noindex_count=sum(len(section_state.noindex_paths) for section_state in sections_state.values()),
+        touched_path_count=len(touched_paths) if state is not None else None,
+        section_files=write_stats.section_files,
+        rewritten_file_count=write_stats.rewritten_file_count,
+        scan_seconds=perf_counter() - started_at,
+        scan_workers=min(workers, max(read_counts, default=1)) or 1,
+        meta_cache_stats=meta_cache.stats - cache_stats_before,
+        rebuilt_sections=tuple(section for section in SITEMAP_SECTIONS if section in scans),
+        patched_sections=tuple(section for section in SITEMAP_SECTIONS if section in patches),
+    )
+    return xml_result, html_result
+
+
+def _use_sitemap_index(url_bound: int) -> bool:
+    return bool(getattr(settings, "SITEMAP_INDEX_ENABLED", False)) or url_bound > SITEMAP_MAX_URLS_PER_FILE
+
+
+class _SectionScan:
+    """
+    The indexable pages of one sitemap.xml section, read while the section is written.
+
+    Iterating yields `(entry, page_meta)` in sitemap order. Candidates are
+    streamed from the database (or the sorted list of static pages) and
+    handled `SITEMAP_SCAN_CHUNK_SIZE` at a time: their content hashes are
+    looked up and their metadata read per chunk. The counts are final once
+    the section has been consumed.
+    """
+
+    def __init__(
+        self,
+        section: str,
+        generated_root: Path,
+        meta_cache: PageMetaCache,
+        executor: ThreadPoolExecutor | None,
+        *,
+        need_h1: bool,
+    ):
+        self.section = section
+        self.generated_root = generated_root
+        self.meta_cache = meta_cache
+        self.executor = executor
+        self.need_h1 = need_h1
+        self.url_count = 0
+        self.noindex_paths: list[str] = []
+        # Only a persisted meta cache needs them, to evict the pages a full build no longer saw.
+        self.html_paths: list[Path] | None = [] if meta_cache.cache_path is not None else None
+        if section == "pages":
+            self._static_pages = _collect_static_pages(generated_root)
+            self.candidate_count = len(self._static_pages)
+        else:
+            self._static_pages = None
+            self.candidate_count = _get_published_items(section).count()
+
+    def __iter__(self):
+        candidates = self._iter_candidates()
+        while chunk := list(islice(candidates, SITEMAP_SCAN_CHUNK_SIZE)):
+            content_changed_at = get_content_changed_at_map(public_path for public_path, _path, _changed_at in chunk)
+            html_paths = [html_path for _public_path, html_path, _changed_at in chunk]
+            pages_meta = _read_pages_meta(html_paths, self.meta_cache, need_h1=self.need_h1, executor=self.executor)
+            if self.html_paths is not None:
+                self.html_paths.extend(html_paths)
+
+            for (public_path, html_path, changed_at), page_meta in zip(chunk, pages_meta):
+                if page_meta.has_noindex:
+                    self.noindex_paths.append(public_path)
+                    continue
+
+                changed_at = content_changed_at.get(public_path) or changed_at or _path_mtime(html_path)
+                self.url_count += 1
+                yield _build_entry(self.section, public_path, changed_at), page_meta
+
+    def _iter_candidates(self):
+        """
+        `(public_path, html_path, changed_at)` of every candidate page, in sitemap order.
+
+        Article and project pages come from the published rows, so generated
+        files of unpublished or deleted items are skipped; `changed_at` is
+        their `updated_at`. Other pages come from disk, with the file mtime as
+        fallback.
+        """
+        if self._static_pages is not None:
+            for public_path, html_path in self._static_pages:
+                yield public_path, html_path, None
+            return
+
+        _model, build_public_item_path = CMS_DETAIL_SOURCES[self.section]
+        rows = (
+            _get_published_items(self.section)
+            .order_by("slug")
+            .values_list("slug", "updated_at", "created_at")
+            .iterator(chunk_size=SITEMAP_SCAN_CHUNK_SIZE)
+        )
+        for slug, updated_at, created_at in rows:
+            html_path = self.generated_root / self.section / slug / "index.html"
+            if html_path.is_file():
+                yield build_public_item_path(slug), html_path, updated_at or created_at
+
+
+class _SectionPatch:
+    """
+    The entries one sitemap.xml section stored at the last build, patched for the touched paths.
+
+    Rows are `(public_path, lastmod, priority, title)` in sitemap order and
+    split into the section files they were written to (a single chunk for a
+    single-file sitemap.xml). `apply()` reads only the touched pages and
+    inserts, replaces or drops their rows; the chunks it changed are the
+    only section files written again.
+    """
+
+    def __init__(self, section: str, chunks: list[list[tuple]], section_state: _SectionState):
+        self.section = section
+        self.chunks = chunks
+        self.files = list(section_state.files)
+        self.noindex_paths = list(section_state.noindex_paths)
+        self.changed_chunks: set[int] = set()
+        self.read_count = 0
+
+    @classmethod
+    def load(cls, generated_root: Path, section: str, section_state: _SectionState, *, use_index: bool) -> _SectionPatch:
+        """Raises ValueError when the stored rows do not add up to what the state says was written."""
+        rows = list(_iter_stored_rows(generated_root, section))
+        if len(rows) != section_state.url_count:
+            raise ValueError(f"Stored sitemap entries of {section} do not match the state.")
+
+        chunks = [rows]
+        if use_index:
+            if sum(count for _name, _lastmod, count in section_state.files) != len(rows):
+                raise ValueError(f"Stored sitemap entries of {section} do not match its files.")
+            chunks = []
+            start = 0
+            for _name, _lastmod, count in section_state.files:
+                chunks.append(rows[start : start + count])
+                start += count
+        return cls(section, chunks or [[]], section_state)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changed_chunks)
+
+    @property
+    def url_count(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def apply(
+        self,
+        public_paths: set[str],
+        *,
+        generated_root: Path,
+        meta_cache: PageMetaCache,
+        executor: ThreadPoolExecutor | None,
+        html_writer=None,
+    ):
+        candidates = _collect_touched_candidates(self.section, public_paths, generated_root)
+        candidate_paths = sorted(candidates)
+        content_changed_at = get_content_changed_at_map(candidate_paths)
+        pages_meta = _read_pages_meta(
+            [candidates[public_path][0] for public_path in candidate_paths],
+            meta_cache,
+            need_h1=html_writer is not None,
+            executor=executor,
+        )
+        self.read_count = len(candidate_paths)
+
+        new_rows = {}
+        noindex_paths = set(self.noindex_paths) - public_paths
+        for public_path, page_meta in zip(candidate_paths, pages_meta):
+            if page_meta.has_noindex:
+                noindex_paths.add(public_path)
                 continue
 
-            entries.append(
-                SitemapEntry(
-                    public_path=public_path,
-                    loc=_build_public_url(public_path),
-                    lastmod=lastmod,
-                    changefreq="weekly",
-                    priority="0.7",
+            html_path, changed_at = candidates[public_path]
+            changed_at = content_changed_at.get(public_path) or changed_at or _path_mtime(html_path)
+            entry = _build_entry(self.section, public_path, changed_at)
+            title = html_writer.resolve_title(entry, page_meta) if html_writer is not None else None
+            new_rows[public_path] = _build_entry_row(entry, title)
+        self.noindex_paths = sorted(noindex_paths)
+
+        # Each touched path goes to the chunk that holds it, or a new one to the chunk its sort key falls in.
+        chunk_by_path = {}
+        for index, chunk in enumerate(self.chunks):
+            for row in chunk:
+                if row[0] in public_paths:
+                    chunk_by_path[row[0]] = index
+        last_keys = [_sitemap_sort_key(self.section, chunk[-1][0]) if chunk else None for chunk in self.chunks]
+        inserts_by_chunk: dict[int, list[tuple]] = {}
+        for public_path, row in new_rows.items():
+            if public_path not in chunk_by_path:
+                index = _find_chunk_index(last_keys, _sitemap_sort_key(self.section, public_path))
+                inserts_by_chunk.setdefault(index, []).append(row)
+
+        for index in set(chunk_by_path.values()) | set(inserts_by_chunk):
+            chunk = self.chunks[index]
+            kept = [new_rows.get(row[0]) if row[0] in public_paths else row for row in chunk]
+            inserts = sorted(inserts_by_chunk.get(index, ()), key=lambda row: _sitemap_sort_key(self.section, row[0]))
+            patched = list(
+                heapq.merge(
+                    (row for row in kept if row is not None),
+                    inserts,
+                    key=lambda row: _sitemap_sort_key(self.section, row[0]),
                 )
             )
-            continue
+            if patched != chunk:
+                self.chunks[index] = patched
+                self.changed_chunks.add(index)
+
+    def iter_rows(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def iter_entries(self):
+        for row in self.iter_rows():
+            yield _entry_from_row(row)
+
+    def iter_links(self):
+        """`(entry, title)` of the rows listed in the HTML sitemap."""
+        for row in self.iter_rows():
+            if row[3] is not None:
+                yield _entry_from_row(row), row[3]
 
-        entries.append(
-            SitemapEntry(
-                public_path=public_path,
-                loc=_build_public_url(public_path),
-                lastmod=_format_lastmod(_path_mtime(html_path)),
-                changefreq="weekly",
-                priority=_build_priority(public_path),
+    def write_files(self, root: Path, *, compress: bool):
+        """Rewrite the section files of the changed chunks; returns their `(path, lastmod, count)` and rewrite count."""
+        files = [(root / name, lastmod, count) for name, lastmod, count in self.files]
+        rewritten_count = 0
+        for index in sorted(self.changed_chunks):
+            chunk = self.chunks[index]
+            if index < len(files) and 0 < len(chunk) <= SITEMAP_MAX_URLS_PER_FILE:
+                written, rewritten = _write_section_files(
+                    root, self.section, map(_entry_from_row, chunk), compress=compress, first_number=index + 1
+                )
+                rewritten_count += rewritten
+                if len(written) == 1:
+                    files[index] = written[0]
+                    continue
+
+            # Emptied, or past the limits of one file: lay the section out again from this chunk on.
+            written, rewritten = _write_section_files(
+                root,
+                self.section,
+                (_entry_from_row(row) for chunk in self.chunks[index:] for row in chunk),
+                compress=compress,
+                first_number=index + 1,
             )
-        )
+            files[index:] = written
+            rewritten_count += rewritten
+            break
+        return files, rewritten_count
 
-    entries.sort(key=lambda entry: (entry.public_path != "/", entry.public_path))
 
-    output_path = generated_root / SITEMAP_FILENAME
-    _write_text_atomically(output_path, _render_sitemap(entries))
+def _collect_touched_candidates(section: str, public_paths: set[str], generated_root: Path):
+    """`{public_path: (html_path, changed_at)}` of the touched paths that `_SectionScan` would take as candidates."""
+    candidates = {}
+    if section == "pages":
+        for public_path in public_paths:
+            relative_path = _build_relative_path(public_path)
+            html_path = generated_root / relative_path
+            if relative_path.parts[0] != "404" and not _is_cms_detail_page(relative_path) and html_path.is_file():
+                candidates[public_path] = (html_path, None)
+        return candidates
 
-    return SitemapBuildResult(
-        output_path=output_path,
-        url_count=len(entries),
-        skipped_noindex_count=skipped_noindex_count,
+    _model, build_public_item_path = CMS_DETAIL_SOURCES[section]
+    slugs = [public_path.strip("/").split("/")[-1] for public_path in public_paths]
+    rows = _get_published_items(section).filter(slug__in=slugs).values_list("slug", "updated_at", "created_at")
+    for slug, updated_at, created_at in rows:
+        public_path = build_public_item_path(slug)
+        html_path = generated_root / section / slug / "index.html"
+        if public_path in public_paths and html_path.is_file():
+            candidates[public_path] = (html_path, updated_at or created_at)
+    return candidates
+
+
+def _find_chunk_index(last_keys: list, sort_key) -> int:
+    for index, last_key in enumerate(last_keys):
+        if last_key is not None and sort_key <= last_key:
+            return index
+    return len(last_keys) - 1
+
+
+def _sitemap_sort_key(section: str, public_path: str):
+    # Static pages are listed home page first, articles and projects by slug as the database orders them.
+    if section == "pages":
+        return public_path != "/", public_path
+    return False, public_path.strip("/").split("/")[-1]
+
+
+def _build_entry(section: str, public_path: str, changed_at: datetime) -> SitemapEntry:
+    return SitemapEntry(
+        public_path=public_path,
+        loc=_build_public_url(public_path),
+        lastmod=_format_lastmod(changed_at),
+        changefreq=SITEMAP_CHANGEFREQ,
+        priority=_build_priority(public_path) if section == "pages" else "0.7",
     )
 
 
-def build_public_sitemaps() -> PublicSitemapsBuildResult:
-    from core.services.html_sitemap import build_static_html_sitemap_page
+def _build_entry_row(entry: SitemapEntry, title: str | None) -> tuple:
+    return entry.public_path, entry.lastmod, entry.priority, title
 
-    xml_result = build_sitemap()
-    html_result = build_static_html_sitemap_page()
-    return PublicSitemapsBuildResult(
-        xml_result=xml_result,
-        html_result=html_result,
+
+def _entry_from_row(row: tuple) -> SitemapEntry:
+    public_path, lastmod, priority, _title = row
+    return SitemapEntry(
+        public_path=public_path,
+        loc=_build_public_url(public_path),
+        lastmod=lastmod,
+        changefreq=SITEMAP_CHANGEFREQ,
+        priority=priority,
+    )
+
+
+def _dump_entry_row(entry: SitemapEntry, title: str | None) -> str:
+    return _dump_row(_build_entry_row(entry, title))
+
+
+def _dump_row(row: tuple) -> str:
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _iter_stored_rows(generated_root: Path, section: str):
+    try:
+        with (generated_root / SITEMAP_ENTRIES_FILENAME.format(section=section)).open(encoding="utf-8") as source:
+            for line in source:
+                public_path, lastmod, priority, title = json.loads(line)
+                yield public_path, lastmod, priority, title
+    except (OSError, TypeError) as error:
+        raise ValueError(f"Stored sitemap entries of {section} cannot be read.") from error
+
+
+def _collect_static_pages(generated_root: Path) -> list[tuple[str, Path]]:
+    pages = []
+    for html_path in _iter_public_html_files(generated_root):
+        relative_path = html_path.relative_to(generated_root)
+        if not _is_cms_detail_page(relative_path):
+            pages.append((_build_public_path(relative_path), html_path))
+    pages.sort(key=lambda page: _sitemap_sort_key("pages", page[0]))
+    return pages
+
+
+def _get_published_items(section: str):
+    model, _build_public_item_path = CMS_DETAIL_SOURCES[section]
+    return model.objects.filter(is_published=True)
+
+
+def _read_sitemap_state(generated_root: Path) -> _SitemapState | None:
+    try:
+        payload = json.loads((generated_root / SITEMAP_STATE_FILENAME).read_text(encoding="utf-8"))
+        if payload["version"] != SITEMAP_STATE_VERSION:
+            return None
+        sections = {}
+        for section in SITEMAP_SECTIONS:
+            section_state = payload["sections"][section]
+            sections[section] = _SectionState(
+                url_count=int(section_state["url_count"]),
+                noindex_paths=[str(public_path) for public_path in section_state["noindex_paths"]],
+                files=[(name, lastmod, int(count)) for name, lastmod, count in section_state["files"]],
+                html_link_counts={key: int(count) for key, count in section_state["html_link_counts"].items()},
+                html_page_size=section_state["html_page_size"],
+            )
+        return _SitemapState(
+            base_url=payload["base_url"],
+            use_index=bool(payload["use_index"]),
+            compress=bool(payload["compress"]),
+            digest=payload["digest"],
+            sections=sections,
+        )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_sitemap_state(generated_root: Path, state: _SitemapState):
+    payload = {"version": SITEMAP_STATE_VERSION, **asdict(state)}
+    write_text_atomically(generated_root / SITEMAP_STATE_FILENAME, json.dumps(payload, separators=(",", ":")))
+
+
+def _is_usable_state(state: _SitemapState, output_path: Path, *, use_index: bool, compress: bool) -> bool:
+    if state.base_url != _build_public_url("") or state.use_index != use_index or state.compress != compress:
+        return False
+    if _hash_sitemap_file(output_path) != state.digest:
+        # Replaced or edited since: its entries cannot be trusted to match the state.
+        return False
+    root = output_path.parent
+    return all(
+        (root / SITEMAP_ENTRIES_FILENAME.format(section=section)).is_file() for section in SITEMAP_SECTIONS
+    ) and all(
+        (root / name).is_file()
+        for section_state in state.sections.values()
+        for name, _lastmod, _count in section_state.files
     )
 
 
+def iter_sitemap_entries(sitemap_path: Path):
+    """
+    Stream the entries of a sitemap file.
+
+    A sitemap index is followed into its section files, which are looked up
+    next to it by file name; `.gz` files are decompressed on the fly.
+    """
+    namespace = f"{{{SITEMAP_NAMESPACE}}}"
+    with _open_sitemap_file(sitemap_path) as source:
+        for _event, element in ET.iterparse(source):
+            if element.tag == f"{namespace}url":
+                loc = (element.findtext(f"{namespace}loc") or "").strip()
+                if loc:
+                    yield SitemapEntry(
+                        public_path=_extract_public_path(loc),
+                        loc=loc,
+                        lastmod=(element.findtext(f"{namespace}lastmod") or "").strip(),
+                        changefreq=(element.findtext(f"{namespace}changefreq") or "").strip(),
+                        priority=(element.findtext(f"{namespace}priority") or "").strip(),
+                    )
+                element.clear()
+            elif element.tag == f"{namespace}sitemap":
+                loc = (element.findtext(f"{namespace}loc") or "").strip()
+                element.clear()
+                if loc:
+                    yield from iter_sitemap_entries(sitemap_path.parent / Path(urlsplit(loc).path).name)
+
+
+def _open_sitemap_file(sitemap_path: Path):
+    if sitemap_path.suffix == ".gz":
+        return gzip.open(sitemap_path, "rb")
+    return sitemap_path.open("rb")
+
+
+def _extract_public_path(loc: str) -> str:
+    path = (urlsplit(loc).path or "/").strip() or "/"
+    if not path.startswith("/"):
+        path = f"/{path}"
+    if path != "/" and not path.endswith("/"):
+        path = f"{path}/"
+    return path
+
+
+def _normalize_public_path(public_path: str) -> str:
+    stripped = public_path.strip("/")
+    return f"/{stripped}/" if stripped else "/"
+
+
+def _build_relative_path(public_path: str) -> Path:
+    if public_path == "/":
+        return Path("index.html")
+    return Path(*public_path.strip("/").split("/"), "index.html")
+
+
 def _iter_public_html_files(generated_root: Path):
     for html_path in generated_root.rglob("index.html"):
         if not html_path.is_file():
@@ -143,10 +823,23 @@ def _iter_public_html_files(generated_root: Path):
         yield html_path
 
 
-def _is_noindex_page(html_path: Path) -> bool:
-    parser = _RobotsMetaParser()
-    parser.feed(html_path.read_text(encoding="utf-8", errors="ignore"))
-    return parser.has_noindex
+def _read_pages_meta(
+    html_paths: list[Path],
+    meta_cache: PageMetaCache,
+    *,
+    need_h1: bool = True,
+    executor: ThreadPoolExecutor | None = None,
+) -> list[PageMeta]:
+    """
+    Read page metadata for `html_paths`, in the same order, on `executor`.
+
+    The work is file reads plus a short regex scan, so threads overlap the I/O
+    waits of a cold page cache or network storage.
+    """
+    read = partial(meta_cache.read, need_h1=need_h1)
+    if executor is None or len(html_paths) <= 1:
+        return [read(html_path) for html_path in html_paths]
+    return list(executor.map(read, html_paths))
 
 
 def _is_cms_detail_page(relative_path: Path) -> bool:
@@ -176,18 +869,6 @@ def _build_priority(public_path: str) -> str:
     return "0.8"
 
 
-def _build_cms_lastmod_map() -> dict[str, str]:
-    lastmods = {}
-
-    for article in Articles.objects.filter(is_published=True).only("slug", "created_at", "updated_at"):
-        lastmods[build_public_article_path(article.slug)] = _format_lastmod(article.updated_at or article.created_at)
-
-    for project in Projects.objects.filter(is_published=True).only("slug", "created_at", "updated_at"):
-        lastmods[build_public_project_path(project.slug)] = _format_lastmod(project.updated_at or project.created_at)
-
-    return lastmods
-
-
 def _path_mtime(html_path: Path) -> datetime:
     return datetime.fromtimestamp(html_path.stat().st_mtime, tz=dt_timezone.utc)
 
@@ -198,34 +879,228 @@ def _format_lastmod(value: datetime) -> str:
     return timezone.localtime(value).isoformat(timespec="seconds")
 
 
-def _render_sitemap(entries: list[SitemapEntry]) -> str:
-    lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        f'<urlset xmlns="{SITEMAP_NAMESPACE}">',
-    ]
-
-    for entry in entries:
-        lines.extend(
-            [
-                "  <url>",
-                f"    <loc>{escape(entry.loc)}</loc>",
-                f"    <lastmod>{escape(entry.lastmod)}</lastmod>",
-                f"    <changefreq>{escape(entry.changefreq)}</changefreq>",
-                f"    <priority>{escape(entry.priority)}</priority>",
-                "  </url>",
-            ]
+def _write_sitemap(
+    output_path: Path,
+    entries_by_section,
+    state: _SitemapState | None,
+    *,
+    use_index: bool,
+    compress: bool,
+) -> _SitemapWriteStats:
+    """
+    Write sitemap.xml from the entries of each section, consuming them as they are produced.
+
+    A section is given as an iterable of entries, a `_SectionPatch` or None
+    when nothing in it was touched. Behind an index, a patch rewrites only
+    its changed files and an untouched section keeps its files; in a single
+    urlset both are written from their rows.
+    """
+    root = output_path.parent
+    if not use_index:
+        sitemap_file = _StreamingSitemapFile(output_path)
+        try:
+            sitemap_file.write(_URLSET_HEADER)
+            for section in SITEMAP_SECTIONS:
+                entries = entries_by_section[section]
+                if entries is None:
+                    entries = map(_entry_from_row, _iter_stored_rows(root, section))
+                elif isinstance(entries, _SectionPatch):
+                    entries = entries.iter_entries()
+                for entry in entries:
+                    sitemap_file.write(_render_url(entry))
+            sitemap_file.write(_URLSET_FOOTER)
+        except BaseException:
+            sitemap_file.discard()
+            raise
+        rewritten = sitemap_file.commit()
+        _remove_stale_section_files(root, keep=())
+        return _SitemapWriteStats(
+            section_files=(),
+            rewritten_file_count=int(rewritten),
+            digest=sitemap_file.hexdigest,
+            files_by_section={},
         )
 
-    lines.append("</urlset>")
-    return "\n".join(lines) + "\n"
+    files_by_section = {}
+    rewritten_count = 0
+    for section in SITEMAP_SECTIONS:
+        entries = entries_by_section[section]
+        if entries is None:
+            files_by_section[section] = state.sections[section].files
+            continue
+        if isinstance(entries, _SectionPatch):
+            files, rewritten = entries.write_files(root, compress=compress)
+        else:
+            files, rewritten = _write_section_files(root, section, entries, compress=compress)
+        files_by_section[section] = [(file_path.name, lastmod, count) for file_path, lastmod, count in files]
+        rewritten_count += rewritten
+
+    index_file = _StreamingSitemapFile(output_path)
+    try:
+        index_file.write(_SITEMAP_INDEX_HEADER)
+        for section in SITEMAP_SECTIONS:
+            for name, lastmod, _count in files_by_section[section]:
+                index_file.write(_render_sitemap_index_item(name, lastmod))
+        index_file.write(_SITEMAP_INDEX_FOOTER)
+    except BaseException:
+        index_file.discard()
+        raise
+    rewritten_count += int(index_file.commit())
+
+    kept_paths = tuple(
+        root / name for section in SITEMAP_SECTIONS for name, _lastmod, _count in files_by_section[section]
+    )
+    _remove_stale_section_files(root, keep=kept_paths)
+    return _SitemapWriteStats(
+        section_files=kept_paths,
+        rewritten_file_count=rewritten_count,
+        digest=index_file.hexdigest,
+        files_by_section=files_by_section,
+    )
+
+
+def _resolve_sitemap_section(public_path: str) -> str:
+    parts = public_path.strip("/").split("/")
+    if len(parts) == 2 and parts[0] in CMS_DETAIL_FOLDERS:
+        return parts[0]
+    return "pages"
+
+
+def _write_section_files(root: Path, section: str, entries, *, compress: bool, first_number: int = 1):
+    """
+    Stream one section into `sitemap-<section>-<n>.xml[.gz]` files within the protocol limits.
+
+    Numbering starts at `first_number`; returns the `(path, lastmod, url count)` of each file
+    and how many of them changed on disk.
+    """
+    files = []
+    rewritten_count = 0
+    sitemap_file = None
+    url_count = 0
+    lastmod = ""
+    footer_size = len(_URLSET_FOOTER.encode("utf-8"))
+
+    try:
+        for entry in entries:
+            chunk = _render_url(entry)
+            chunk_size = len(chunk.encode("utf-8"))
+            if sitemap_file is not None and (
+                url_count >= SITEMAP_MAX_URLS_PER_FILE
+                or sitemap_file.byte_count + chunk_size + footer_size > SITEMAP_MAX_BYTES_PER_FILE
+            ):
+                sitemap_file.write(_URLSET_FOOTER)
+                rewritten_count += int(sitemap_file.commit())
+                files.append((sitemap_file.target_path, lastmod, url_count))
+                sitemap_file = None
 
+            if sitemap_file is None:
+                filename = f"sitemap-{section}-{first_number + len(files)}.xml" + (".gz" if compress else "")
+                sitemap_file = _StreamingSitemapFile(root / filename, compress=compress)
+                sitemap_file.write(_URLSET_HEADER)
+                url_count = 0
+                lastmod = ""
 
-def _write_text_atomically(target_path: Path, content: str):
-    target_path.parent.mkdir(parents=True, exist_ok=True)
+            sitemap_file.write(chunk)
+            url_count += 1
+            lastmod = max(lastmod, entry.lastmod)
+
+        if sitemap_file is not None:
+            sitemap_file.write(_URLSET_FOOTER)
+            rewritten_count += int(sitemap_file.commit())
+            files.append((sitemap_file.target_path, lastmod, url_count))
+    except BaseException:
+        if sitemap_file is not None:
+            sitemap_file.discard()
+        raise
+
+    return files, rewritten_count
+
+
+def _remove_stale_section_files(root: Path, *, keep):
+    keep = set(keep)
+    if not root.is_dir():
+        return
+    for file_path in root.iterdir():
+        if SITEMAP_SECTION_FILE_RE.match(file_path.name) and file_path not in keep:
+            file_path.unlink()
+
+
+class _StreamingSitemapFile:
+    """
+    Write a sitemap file chunk by chunk through a temporary file.
+
+    `commit()` moves it into place only when the content differs from the
+    current file, so unchanged sections keep their bytes and mtime.
+    """
+
+    def __init__(self, target_path: Path, *, compress: bool = False):
+        self.target_path = target_path
+        self.compress = compress
+        self.byte_count = 0
+        self._digest = hashlib.sha256()
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        self._temp_file = NamedTemporaryFile("wb", dir=target_path.parent, delete=False)
+        # mtime=0 keeps the gzip header stable across rebuilds.
+        self._stream = gzip.GzipFile(filename="", fileobj=self._temp_file, mode="wb", mtime=0) if compress else self._temp_file
+
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        self._stream.write(data)
+        self._digest.update(data)
+        self.byte_count += len(data)
+
+    @property
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+    def commit(self) -> bool:
+        temp_path = self._close()
+        if _hash_sitemap_file(self.target_path) == self._digest.hexdigest():
+            temp_path.unlink()
+            return False
+
+        temp_path.replace(self.target_path)
+        os.chmod(self.target_path, 0o644)
+        return True
+
+    def discard(self):
+        self._close().unlink(missing_ok=True)
+
+    def _close(self) -> Path:
+        if self._stream is not self._temp_file:
+            self._stream.close()
+        self._temp_file.close()
+        return Path(self._temp_file.name)
+
+
+def _hash_sitemap_file(file_path: Path) -> str | None:
+    if not file_path.is_file():
+        return None
+
+    digest = hashlib.sha256()
+    try:
+        with _open_sitemap_file(file_path) as source:
+            for block in iter(lambda: source.read(1024 * 1024), b""):
+                digest.update(block)
+    except (OSError, EOFError):
+        return None
+    return digest.hexdigest()
+
+
+def _render_url(entry: SitemapEntry) -> str:
+    return (
+        "  <url>\n"
+        f"    <loc>{escape(entry.loc)}</loc>\n"
+        f"    <lastmod>{escape(entry.lastmod)}</lastmod>\n"
+        f"    <changefreq>{escape(entry.changefreq)}</changefreq>\n"
+        f"    <priority>{escape(entry.priority)}</priority>\n"
+        "  </url>\n"
+    )
 
-    with NamedTemporaryFile("w", encoding="utf-8", dir=target_path.parent, delete=False) as temp_file:
-        temp_file.write(content)
-        temp_path = Path(temp_file.name)
 
-    temp_path.replace(target_path)
-    os.chmod(target_path, 0o644)
+def _render_sitemap_index_item(file_name: str, lastmod: str) -> str:
+    lines = ["  <sitemap>\n", f"    <loc>{escape(_build_public_url('/' + file_name))}</loc>\n"]
+    if lastmod:
+        lines.append(f"    <lastmod>{escape(lastmod)}</lastmod>\n")
+    lines.append("  </sitemap>\n")
+    return "".join(lines)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+
+from core.services import sitemap as sitemap_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SitemapFlushResult:
+    built: bool
+    request_count: int
+    collapsed_count: int
+    build_result: sitemap_service.PublicSitemapsBuildResult | None = None
+
+
+def get_sitemap_rebuild_quiet_window() -> float:
+    try:
+        quiet_window = float(getattr(settings, "SITEMAP_REBUILD_DEBOUNCE_SECONDS", 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(quiet_window, 0.0)
+
+
+class SitemapRebuildDebouncer:
+    """
+    Defer `build_public_sitemaps()` until no new change arrived for the quiet window.
+
+    Every request restarts the timer, so a burst of saves ends in one rebuild.
+    With a zero window the rebuild runs synchronously, like before debouncing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._pending_requests = 0
+        self._pending_paths: set[str] = set()
+        self._pending_full_rebuild = False
+        self.total_requests = 0
+        self.total_builds = 0
+        self.total_collapsed = 0
+
+    @property
+    def pending_requests(self) -> int:
+        return self._pending_requests
+
+    def request_rebuild(self, touched_paths=None) -> SitemapFlushResult | None:
+        """
+        Ask for a sitemap rebuild.
+
+        `touched_paths` limits sitemap.xml to an incremental update of those
+        public paths; None asks for a full rebuild, which wins over paths
+        collected from other requests.
+        """
+        quiet_window = get_sitemap_rebuild_quiet_window()
+        with self._lock:
+            self._pending_requests += 1
+            self.total_requests += 1
+            if touched_paths is None:
+                self._pending_full_rebuild = True
+            else:
+                self._pending_paths.update(touched_paths)
+            self._cancel_timer()
+            if quiet_window > 0:
+                self._timer = threading.Timer(quiet_window, self._run_timer)
+                self._timer.daemon = True
+                self._timer.start()
+                return None
+
+        return self.flush()
+
+    def flush(self) -> SitemapFlushResult:
+        """Run the pending rebuild now, if there is one."""
+        with self._build_lock:
+            with self._lock:
+                self._cancel_timer()
+                request_count = self._pending_requests
+                touched_paths = None if self._pending_full_rebuild else self._pending_paths
+                self._reset_pending()
+
+            if not request_count:
+                return SitemapFlushResult(built=False, request_count=0, collapsed_count=0)
+
+            if touched_paths is None:
+                build_result = sitemap_service.build_public_sitemaps()
+            else:
+                build_result = sitemap_service.build_public_sitemaps(touched_paths)
+            collapsed_count = request_count - 1
+            self.total_builds += 1
+            self.total_collapsed += collapsed_count
+
+        if collapsed_count:
+            logger.info("Sitemaps rebuilt once for %s changes (%s collapsed)", request_count, collapsed_count)
+        return SitemapFlushResult(
+            built=True,
+            request_count=request_count,
+            collapsed_count=collapsed_count,
+            build_result=build_result,
+        )
+
+    def cancel(self) -> int:
+        """Drop the pending rebuild without running it; returns the dropped request count."""
+        with self._lock:
+            self._cancel_timer()
+            request_count = self._pending_requests
+            self._reset_pending()
+        return request_count
+
+    def _reset_pending(self):
+        self._pending_requests = 0
+        self._pending_paths = set()
+        self._pending_full_rebuild = False
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _run_timer(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Deferred sitemap rebuild failed")
+        finally:
+            # The timer thread opened its own connection for the lastmod query.
+            connections.close_all()
+
+
+sitemap_rebuild_debouncer = SitemapRebuildDebouncer()
+
+
+def request_sitemap_rebuild(touched_paths=None) -> SitemapFlushResult | None:
+    return sitemap_rebuild_debouncer.request_rebuild(touched_paths)
+
+
+def flush_sitemap_rebuild() -> SitemapFlushResult:
+    return sitemap_rebuild_debouncer.flush()
+
+
+def _flush_at_exit():
+    if not sitemap_rebuild_debouncer.pending_requests:
+        return
+    try:
+        sitemap_rebuild_debouncer.flush()
+    except Exception:
+        logger.exception("Pending sitemap rebuild failed at exit")
+
+
+atexit.register(_flush_at_exit)
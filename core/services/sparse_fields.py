@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    keys: tuple[str, ...]
+    is_default: bool
+
+    def __contains__(self, key):
+        return key in self.keys
+
+
+def _parse_names(raw_value: str, allowed: tuple[str, ...], param: str) -> list[str]:
+    names = [name.strip() for name in raw_value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown {param}: {', '.join(unknown)}.")
+    return names
+
+
+def select_fields(
+    request,
+    *,
+    available: tuple[str, ...],
+    default: tuple[str, ...],
+    includable: tuple[str, ...] = (),
+) -> FieldSelection:
+    """
+    Resolve the `fields=` and `include=` query params of an API request.
+
+    `fields` replaces the `default` keys, `include` adds expansions from
+    `includable` on top of them. Keys come back in `available` order, so a
+    sparse payload keeps the key order of the full one.
+    """
+    fields = request.GET.get("fields")
+    includes = request.GET.get("include")
+
+    selected = set(default if fields is None else _parse_names(fields, available, "fields"))
+    if includes is not None:
+        selected.update(_parse_names(includes, includable, "include"))
+
+    keys = tuple(key for key in available if key in selected)
+    return FieldSelection(keys=keys, is_default=keys == tuple(key for key in available if key in default))
+
+
+def build_only_columns(keys, columns_by_key: dict[str, tuple[str, ...]], *, always: tuple[str, ...] = ()) -> list[str]:
+    """Model columns behind `keys`, for `.only()`; keys missing from `columns_by_key` are plain columns."""
+    columns = dict.fromkeys(always)
+    for key in keys:
+        columns.update(dict.fromkeys(columns_by_key.get(key, (key,))))
+    return list(columns)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+from core.services.build_item_html import get_generated_pages_root
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+
+
+class _PendingWrites:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paths: set[str] = set()
+
+
+_pending_writes = _PendingWrites()
+
+
+def is_static_first_enabled() -> bool:
+    return bool(getattr(settings, "STATIC_FIRST_VIEWS_ENABLED", False))
+
+
+def get_generated_page_file(public_path: str) -> Path:
+    """`/projects/<slug>/` -> `<GENERATED_HTML_PAGES_PATH>/projects/<slug>/index.html`."""
+    return get_generated_pages_root().joinpath(*[part for part in public_path.split("/") if part], "index.html")
+
+
+def is_generated_page_fresh(file_path: Path, changed_at) -> bool:
+    """
+    The file exists and was written after `changed_at`.
+
+    Pass the `Last-Modified` of the request's validators: for a detail page it
+    covers the item, the items listed as related on it and the pages version
+    (templates, deploy version).
+    """
+    try:
+        written_at = file_path.stat().st_mtime
+    except OSError:
+        return False
+    return changed_at is not None and written_at >= changed_at.timestamp()
+
+
+def build_generated_page_response(file_path: Path) -> HttpResponse:
+    prefix = getattr(settings, "STATIC_PAGES_ACCEL_REDIRECT_PREFIX", "")
+    if prefix:
+        # nginx sends the file from an `internal` location; headers set here (ETag, Cache-Control) are kept.
+        relative_path = file_path.relative_to(get_generated_pages_root()).as_posix()
+        response = HttpResponse(content_type=HTML_CONTENT_TYPE)
+        response["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(relative_path)}"
+        return response
+
+    response = FileResponse(file_path.open("rb"), content_type=HTML_CONTENT_TYPE)
+    # The page is shown, not downloaded.
+    response.headers.pop("Content-Disposition", None)
+    return response
+
+
+def queue_generated_page_write(response: HttpResponse, public_path: str, write_page) -> bool:
+    """
+    Write one generated page with `write_page()` once `response` is closed.
+
+    Only the requested page is rendered and written: no regeneration batch,
+    no sitemap rebuild, no API cache version bump. The write is attached to
+    this response, so it runs after its body went out, in the thread that
+    served it; a path already queued in this process is skipped.
+    """
+    with _pending_writes.lock:
+        if public_path in _pending_writes.paths:
+            return False
+        _pending_writes.paths.add(public_path)
+
+    def write():
+        try:
+            write_page()
+        except Exception:
+            # The response is already out; the next request for the page queues it again.
+            logger.exception("Writing %s after a static-first miss failed.", public_path)
+        finally:
+            with _pending_writes.lock:
+                _pending_writes.paths.discard(public_path)
+
+    response._resource_closers.append(write)
+    return True
+
+
+def serve_generated_page(request, public_path: str, *, render_page, write_page) -> HttpResponse:
+    """
+    Answer a page view from its generated file, or with `render_page()`.
+
+    Freshness compares the file mtime with `Last-Modified` of the content, as
+    computed by `conditional_content` for this request. A missing or stale file
+    is not written before answering: the rendered response is sent and the
+    page alone is rewritten with `write_page()` once it is closed.
+    """
+    if not is_static_first_enabled() or request.method not in ("GET", "HEAD"):
+        return render_page()
+
+    file_path = get_generated_page_file(public_path)
+    validators = getattr(request, "content_validators", None)
+    if is_generated_page_fresh(file_path, validators.last_modified if validators else None):
+        return build_generated_page_response(file_path)
+
+    response = render_page()
+    if response.status_code == 200:
+        queue_generated_page_write(response, public_path, write_page)
+    return response
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.timezone import template_localtime
+
+DJANGO_ENGINE = "django"
+JINJA2_ENGINE = "jinja2"
+GENERATION_TEMPLATE_ENGINES = (DJANGO_ENGINE, JINJA2_ENGINE)
+JINJA2_TEMPLATES_SUBDIR = "jinja2"
+
+
+class UnknownTemplateEngineError(ValueError):
+    pass
+
+
+class ImproperlyConfiguredTemplateEngine(RuntimeError):
+    pass
+
+
+def get_generation_template_engine() -> str:
+    engine = (getattr(settings, "STATIC_GENERATION_TEMPLATE_ENGINE", DJANGO_ENGINE) or DJANGO_ENGINE).strip().lower()
+    if engine not in GENERATION_TEMPLATE_ENGINES:
+        raise UnknownTemplateEngineError(
+            f"Unsupported STATIC_GENERATION_TEMPLATE_ENGINE {engine!r}; expected one of {GENERATION_TEMPLATE_ENGINES}"
+        )
+    return engine
+
+
+def get_template_dirs() -> list[Path]:
+    template_dirs = []
+    for backend in settings.TEMPLATES:
+        if backend.get("BACKEND") == "django.template.backends.django.DjangoTemplates":
+            template_dirs.extend(Path(directory) for directory in backend.get("DIRS", []))
+    return template_dirs
+
+
+def get_jinja2_template_dirs() -> list[Path]:
+    template_dirs = get_template_dirs()
+    # Ported templates shadow the Django ones; partials without template syntax are shared as-is.
+    return [directory / JINJA2_TEMPLATES_SUBDIR for directory in template_dirs] + template_dirs
+
+
+def _finalize_like_django(value):
+    # Match Django's render_value_in_context so both engines produce identical markup.
+    value = template_localtime(value, use_tz=settings.USE_TZ)
+    value = localize(value, use_l10n=True)
+    return conditional_escape(value)
+
+
+@lru_cache(maxsize=1)
+def get_jinja2_environment():
+    try:
+        from jinja2 import ChainableUndefined, Environment, FileSystemLoader, select_autoescape
+    except ImportError as exc:
+        raise ImproperlyConfiguredTemplateEngine(
+            "STATIC_GENERATION_TEMPLATE_ENGINE=jinja2 requires the Jinja2 package to be installed."
+        ) from exc
+
+    return Environment(
+        loader=FileSystemLoader([str(directory) for directory in get_jinja2_template_dirs()]),
+        autoescape=select_autoescape(["html"]),
+        undefined=ChainableUndefined,
+        finalize=_finalize_like_django,
+        keep_trailing_newline=True,
+    )
+
+
+def render_generation_template(template_name: str, context: dict, *, engine: str | None = None) -> str:
+    """
+    Render a template used by static page generation.
+
+    The Django engine stays the default; Jinja2 is opt-in through
+    `STATIC_GENERATION_TEMPLATE_ENGINE` and uses the ports in `templates/jinja2/`.
+    """
+    active_engine = engine or get_generation_template_engine()
+    if active_engine == DJANGO_ENGINE:
+        return render_to_string(template_name, context)
+    if active_engine == JINJA2_ENGINE:
+        return get_jinja2_environment().get_template(template_name).render(context)
+
+    raise UnknownTemplateEngineError(f"Unsupported template engine {active_engine!r}")
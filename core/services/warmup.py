@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.urls import get_resolver, resolve
+
+from core.services.template_rendering import (
+    JINJA2_ENGINE,
+    JINJA2_TEMPLATES_SUBDIR,
+    get_generation_template_engine,
+    get_jinja2_environment,
+    get_template_dirs,
+)
+
+logger = logging.getLogger(__name__)
+
+WARMUP_URL_PATHS = ("/api/projects/", "/projects/")
+
+
+@dataclass(frozen=True)
+class WarmupResult:
+    duration_ms: float
+    template_count: int
+    failed_steps: tuple[str, ...] = field(default_factory=tuple)
+
+
+def iter_public_template_names():
+    for template_dir in get_template_dirs():
+        if not template_dir.is_dir():
+            continue
+
+        for template_path in sorted(template_dir.rglob("*.html")):
+            relative_path = template_path.relative_to(template_dir)
+            if relative_path.parts[0] == JINJA2_TEMPLATES_SUBDIR:
+                continue
+            yield relative_path.as_posix()
+
+
+def _warm_up_templates() -> int:
+    template_names = list(iter_public_template_names())
+    for template_name in template_names:
+        # Fills the cached loader when DEBUG is off, so the first request skips compilation.
+        get_template(template_name)
+
+    if get_generation_template_engine() == JINJA2_ENGINE:
+        environment = get_jinja2_environment()
+        for template_name in template_names:
+            environment.get_template(template_name)
+
+    return len(template_names)
+
+
+def _warm_up_url_resolver():
+    resolver = get_resolver()
+    # Building reverse_dict populates the resolver caches for both reverse() and resolve().
+    resolver.reverse_dict
+    for url_path in WARMUP_URL_PATHS:
+        resolve(url_path)
+
+
+def _warm_up_sanitizer():
+    from blog.services.rich_text import sanitize_article_body_html
+
+    sanitize_article_body_html("<p>warm-up</p>")
+
+
+def _warm_up_storage_client():
+    if not getattr(settings, "VK_CLOUD_S3_ENDPOINT", None):
+        return
+
+    from core.services.vk_cloud_storage import VKCloudStorage
+
+    # Loads and caches the botocore S3 service model on the default session.
+    VKCloudStorage()
+
+
+def _warm_up_pages_version():
+    from core.services.pages_version import get_pages_version
+
+    # The first conditional GET would otherwise walk the template dirs.
+    get_pages_version()
+
+
+def warm_up_worker() -> WarmupResult:
+    started_at = perf_counter()
+    template_count = 0
+    failed_steps = []
+
+    for step_name, step in (
+        ("templates", _warm_up_templates),
+        ("url_resolver", _warm_up_url_resolver),
+        ("sanitizer", _warm_up_sanitizer),
+        ("storage_client", _warm_up_storage_client),
+        ("pages_version", _warm_up_pages_version),
+    ):
+        try:
+            step_result = step()
+        except Exception:
+            logger.exception("Worker warm-up step %s failed", step_name)
+            failed_steps.append(step_name)
+            continue
+
+        if step_name == "templates":
+            template_count = step_result
+
+    result = WarmupResult(
+        duration_ms=(perf_counter() - started_at) * 1000,
+        template_count=template_count,
+        failed_steps=tuple(failed_steps),
+    )
+    logger.info(
+        "Worker warm-up finished in %.1f ms: %s templates, failed steps: %s",
+        result.duration_ms,
+        result.template_count,
+        ", ".join(result.failed_steps) or "none",
+    )
+    return result
+
+
+def warm_up_worker_if_enabled() -> WarmupResult | None:
+    if not getattr(settings, "WORKER_WARMUP", False):
+        return None
+    return warm_up_worker()
@@ -1,24 +1,67 @@
+import gzip
 import json
 import os
+import shutil
 import tempfile
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone as dt_timezone
 from io import StringIO
 from pathlib import Path
+import threading
+import time
+from unittest import skipUnless
+from unittest.mock import patch
 
+from django.conf import settings
 from django.core.management import call_command
+from django.db import transaction
 from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
 from django.utils import timezone
 
-from blog.models import Articles
+from blog.models import Articles, ArticlesContentBlock
+from blog.services.article_rendering import build_article_render_context
+from core.checks import check_api_response_cache_backend
+from core.models import GeneratedPage
+from core.services.page_fingerprints import get_content_changed_at_map
+from core.services.build_item_html import build_items_detail_static_html
+from core.services.compression import compress_body, get_compression_stats, reset_compression_stats
+from core.services.conditional_get import build_content_validators
 from core.services.frontend_partials_sync import sync_frontend_partials
 from core.services.html_sitemap import (
+    HtmlSitemapLink,
+    HtmlSitemapSection,
     SitemapXmlMissingError,
     build_html_sitemap,
     build_static_html_sitemap_page,
+    iter_html_sitemap_pages,
 )
-from core.services.sitemap import build_public_sitemaps, build_sitemap
-from projects.models import ProjectCategories, Projects
+from core.services.page_meta import read_full_page_meta, read_page_meta
+from core.services.pages_version import get_pages_version, reset_pages_version
+from core.services.regeneration import regeneration_batch
+from core.services.response_cache import get_response_cache, get_response_cache_stats, reset_response_cache_stats
+from core.services.sitemap import build_public_sitemaps, build_sitemap, update_sitemap
+from core.services.sitemap_debounce import SitemapRebuildDebouncer
+from core.services.template_rendering import DJANGO_ENGINE, JINJA2_ENGINE, render_generation_template
+from core.services.warmup import iter_public_template_names, warm_up_worker, warm_up_worker_if_enabled
+from press.models import PressItem
+from projects.models import ProjectCategories, Projects, ProjectsContentBlock
+from projects.services.project_listing import build_projects_listing_context
+from projects.services.project_rendering import build_project_render_context
+
+try:
+    import jinja2  # noqa: F401
+except ImportError:
+    HAS_JINJA2 = False
+else:
+    HAS_JINJA2 = True
+
+try:
+    import brotli
+except ImportError:
+    HAS_BROTLI = False
+else:
+    HAS_BROTLI = True
 
 
 class SitemapServiceTests(TestCase):
@@ -137,6 +180,7 @@ class SitemapServiceTests(TestCase):
                 self.assertIn("URLs: 1", output)
                 self.assertIn("sections: 1", output)
                 self.assertIn("skipped noindex: 0", output)
+                self.assertIn("scan: ", output)
                 self.assertTrue((root / "sitemap.xml").exists())
                 self.assertTrue((root / "sitemap" / "index.html").exists())
 
@@ -163,7 +207,387 @@ class SitemapServiceTests(TestCase):
                 self.assertEqual(result.html_result.output_path, root / "sitemap" / "index.html")
                 self.assertTrue(result.xml_result.output_path.exists())
                 self.assertTrue(result.html_result.output_path.exists())
-                self.assertIn("/about/", result.html_result.output_path.read_text(encoding="utf-8"))
+                self.assertIn("/about/", (root / "sitemap" / "main" / "index.html").read_text(encoding="utf-8"))
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+    )
+    def test_build_public_sitemaps_renders_both_sitemaps_from_one_scan(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                self._write_html(root / "index.html", "<html><head><title>Home</title></head><body></body></html>")
+                self._write_html(
+                    root / "about" / "index.html",
+                    "<html><head><title>О нас | Cultnova</title></head><body><h1>О компании</h1></body></html>",
+                )
+                self._write_html(
+                    root / "hidden" / "index.html",
+                    '<html><head><meta name="robots" content="noindex"></head><body><h1>Hidden</h1></body></html>',
+                )
+
+                build_sitemap()
+                two_pass_xml = (root / "sitemap.xml").read_text(encoding="utf-8")
+                build_static_html_sitemap_page()
+                two_pass_html = (root / "sitemap" / "main" / "index.html").read_text(encoding="utf-8")
+                shutil.rmtree(root / "sitemap")
+
+                with (
+                    patch("core.services.page_meta_cache.read_page_meta", wraps=read_page_meta) as read_mock,
+                    patch("core.services.html_sitemap.iter_sitemap_entries") as xml_read_mock,
+                ):
+                    result = build_public_sitemaps()
+
+                self.assertEqual(read_mock.call_count, 3)
+                xml_read_mock.assert_not_called()
+                single_pass_html = (root / "sitemap" / "main" / "index.html").read_text(encoding="utf-8")
+                self.assertEqual(result.xml_result.output_path.read_text(encoding="utf-8"), two_pass_xml)
+                self.assertEqual(single_pass_html, two_pass_html)
+                self.assertIn("О компании", single_pass_html)
+                self.assertNotIn("/hidden/", single_pass_html)
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_build_sitemap_scans_pages_on_threads_in_stable_order(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                for index in range(12):
+                    robots = "noindex" if index % 4 == 0 else "index,follow"
+                    self._write_html(
+                        root / f"page-{index}" / "index.html",
+                        f'<html><head><meta name="robots" content="{robots}"></head><body>Page</body></html>',
+                    )
+
+                with override_settings(SITEMAP_SCAN_WORKERS=1):
+                    sequential = build_sitemap()
+                    sequential_sitemap = sequential.output_path.read_text(encoding="utf-8")
+                with override_settings(SITEMAP_SCAN_WORKERS=4):
+                    parallel = build_sitemap()
+
+                self.assertEqual(sequential.scan_workers, 1)
+                self.assertEqual(parallel.scan_workers, 4)
+                self.assertGreater(parallel.scan_seconds, 0)
+                self.assertEqual(parallel.url_count, 9)
+                self.assertEqual(parallel.skipped_noindex_count, 3)
+                self.assertEqual(parallel.output_path.read_text(encoding="utf-8"), sequential_sitemap)
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+    )
+    def test_sections_are_streamed_in_chunks_with_the_same_output(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                for index in range(5):
+                    robots = "noindex" if index == 3 else "index,follow"
+                    self._write_html(
+                        root / f"page-{index}" / "index.html",
+                        f'<html><head><meta name="robots" content="{robots}"></head><body><h1>Page {index}</h1></body></html>',
+                    )
+                with self.captureOnCommitCallbacks(execute=False):
+                    for index in range(3):
+                        Articles.objects.create(
+                            title=f"Article {index}",
+                            slug=f"article-{index}",
+                            body_html="<p>Body</p>",
+                            seo_title="SEO",
+                            seo_description="SEO",
+                            is_published=True,
+                        )
+                        self._write_html(root / "articles" / f"article-{index}" / "index.html", f"<h1>Article {index}</h1>")
+
+                build_public_sitemaps()
+                whole_xml = (root / "sitemap.xml").read_text(encoding="utf-8")
+                whole_html = (root / "sitemap" / "main" / "index.html").read_text(encoding="utf-8")
+                shutil.rmtree(root / "sitemap")
+
+                lookups = []
+
+                def record_lookup(public_paths):
+                    public_paths = list(public_paths)
+                    lookups.append(len(public_paths))
+                    return get_content_changed_at_map(public_paths)
+
+                with (
+                    patch("core.services.sitemap.SITEMAP_SCAN_CHUNK_SIZE", 2),
+                    patch("core.services.sitemap.get_content_changed_at_map", side_effect=record_lookup),
+                ):
+                    result = build_public_sitemaps()
+
+                # Five pages and three articles, two candidates at a time.
+                self.assertEqual(lookups, [2, 2, 1, 2, 1])
+                self.assertEqual(result.xml_result.skipped_noindex_count, 1)
+                self.assertEqual(result.xml_result.url_count, 7)
+                self.assertIn("<loc>https://example.com/articles/article-2/</loc>", whole_xml)
+                self.assertEqual((root / "sitemap.xml").read_text(encoding="utf-8"), whole_xml)
+                self.assertEqual((root / "sitemap" / "main" / "index.html").read_text(encoding="utf-8"), whole_html)
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+    )
+    def test_page_meta_cache_rereads_only_changed_pages_and_evicts_deleted_ones(self):
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = Path(cache_dir) / "page_meta.json"
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir, SITEMAP_META_CACHE_PATH=str(cache_path)):
+                root = Path(temp_dir)
+                for relative_dir in ("about", "faq", "contact"):
+                    self._write_html(
+                        root / relative_dir / "index.html",
+                        f"<html><head><title>{relative_dir}</title></head><body><h1>{relative_dir}</h1></body></html>",
+                    )
+
+                cold = build_public_sitemaps().xml_result
+                self.assertEqual((cold.meta_cache_stats.hits, cold.meta_cache_stats.misses), (0, 3))
+                self.assertTrue(cache_path.exists())
+                shutil.rmtree(root / "sitemap")
+
+                self._write_html(
+                    root / "about" / "index.html",
+                    '<html><head><meta name="robots" content="noindex"></head><body><h1>About</h1></body></html>',
+                )
+                (root / "faq" / "index.html").unlink()
+
+                with patch("core.services.page_meta_cache.read_page_meta", wraps=read_page_meta) as read_mock:
+                    result = build_public_sitemaps()
+
+                read_mock.assert_called_once_with(root / "about" / "index.html", need_h1=True)
+                xml_stats = result.xml_result.meta_cache_stats
+                self.assertEqual((xml_stats.hits, xml_stats.misses, xml_stats.evictions), (1, 1, 1))
+                self.assertEqual(result.xml_result.url_count, 1)
+                self.assertEqual(result.xml_result.skipped_noindex_count, 1)
+                self.assertEqual(result.html_result.meta_cache_stats.misses, 0)
+                self.assertIn("contact", (root / "sitemap" / "info" / "index.html").read_text(encoding="utf-8"))
+
+                cached_paths = set(json.loads(cache_path.read_text(encoding="utf-8"))["entries"])
+                self.assertEqual(cached_paths, {"about/index.html", "contact/index.html"})
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+    )
+    def test_page_without_h1_is_parsed_in_full_at_most_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = Path(cache_dir) / "page_meta.json"
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir, SITEMAP_META_CACHE_PATH=str(cache_path)):
+                root = Path(temp_dir)
+                self._write_html(
+                    root / "about" / "index.html",
+                    "<html><head><title>О нас | Cultnova</title></head><body>"
+                    + "<p>filler</p>" * 2000
+                    + "</body></html>",
+                )
+
+                reads = []
+
+                def record_read(html_path, *, need_h1):
+                    page_meta = read_page_meta(html_path, need_h1=need_h1)
+                    if html_path.parent.name == "about":
+                        reads.append((need_h1, page_meta.full_parse))
+                    return page_meta
+
+                with patch("core.services.page_meta_cache.read_page_meta", side_effect=record_read):
+                    build_sitemap()
+                    build_public_sitemaps()
+                    build_public_sitemaps()
+                    build_sitemap()
+
+                # sitemap.xml alone stops at </head>; the "no h1" answer of the one full parse is cached.
+                self.assertEqual(reads, [(False, False), (True, True)])
+                self.assertIn("О нас", (root / "sitemap" / "info" / "index.html").read_text(encoding="utf-8"))
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+        SITEMAP_META_CACHE_PATH="",
+    )
+    def test_incremental_public_sitemaps_rebuild_only_touched_sections(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                for relative_dir in ("", "about", "faq"):
+                    self._write_html(root / relative_dir / "index.html", f"<html><h1>{relative_dir or 'Home'}</h1></html>")
+                with self.captureOnCommitCallbacks(execute=False):
+                    Articles.objects.create(
+                        title="First Article",
+                        slug="first-article",
+                        body_html="<p>Body</p>",
+                        seo_title="SEO",
+                        seo_description="SEO",
+                        is_published=True,
+                    )
+                self._write_html(root / "articles" / "first-article" / "index.html", "<h1>First Article</h1>")
+                build_public_sitemaps()
+                main_path = root / "sitemap" / "main" / "index.html"
+                main_mtime = main_path.stat().st_mtime_ns
+                full_xml = (root / "sitemap.xml").read_text(encoding="utf-8")
+
+                self._write_html(root / "articles" / "first-article" / "index.html", "<h1>Renamed Article</h1>")
+                with patch("core.services.page_meta_cache.read_page_meta", wraps=read_page_meta) as read_mock:
+                    result = build_public_sitemaps(["/articles/first-article/"])
+
+                # Without a persistent metadata cache only the article pages were read again.
+                self.assertEqual(
+                    [call.args[0] for call in read_mock.call_args_list],
+                    [root / "articles" / "first-article" / "index.html"],
+                )
+                self.assertEqual(result.xml_result.rebuilt_sections, ())
+                self.assertEqual(result.xml_result.patched_sections, ("articles",))
+                self.assertEqual(result.xml_result.url_count, 4)
+                self.assertEqual((root / "sitemap.xml").read_text(encoding="utf-8"), full_xml)
+                self.assertEqual(main_path.stat().st_mtime_ns, main_mtime)
+                self.assertIn("Renamed Article", (root / "sitemap" / "articles" / "index.html").read_text(encoding="utf-8"))
+                index_html = (root / "sitemap" / "index.html").read_text(encoding="utf-8")
+                self.assertIn("Ссылок: 2", index_html)
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_update_sitemap_patches_touched_paths_like_a_full_rebuild(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                indexable = '<html><head><meta name="robots" content="index,follow"></head><body>Page</body></html>'
+                for relative_dir in ("", "about", "faq", "contact"):
+                    self._write_html(root / relative_dir / "index.html", indexable)
+                build_sitemap()
+
+                self._write_html(root / "news" / "index.html", indexable)
+                (root / "faq" / "index.html").unlink()
+                self._write_html(
+                    root / "contact" / "index.html",
+                    '<html><head><meta name="robots" content="noindex"></head><body>Contact</body></html>',
+                )
+
+                result = update_sitemap(["/news/", "/faq", "/contact/"])
+
+                self.assertEqual(result.patched_sections, ("pages",))
+                self.assertEqual(result.url_count, 3)
+                self.assertEqual(result.skipped_noindex_count, 1)
+                self.assertEqual(result.touched_path_count, 3)
+
+                patched_sitemap = result.output_path.read_text(encoding="utf-8")
+                self.assertEqual(patched_sitemap, (build_sitemap().output_path).read_text(encoding="utf-8"))
+                self.assertIn("<loc>https://example.com/news/</loc>", patched_sitemap)
+                self.assertIn("<loc>https://example.com/about/</loc>", patched_sitemap)
+                self.assertNotIn("https://example.com/faq/", patched_sitemap)
+                self.assertNotIn("https://example.com/contact/", patched_sitemap)
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        SITEMAP_INDEX_ENABLED=True,
+        SITEMAP_META_CACHE_PATH="",
+    )
+    def test_update_sitemap_reads_only_the_touched_page_and_rewrites_its_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                for relative_dir in ("", "about", "blog", "contact", "faq", "news"):
+                    self._write_html(root / relative_dir / "index.html", f"<html><title>{relative_dir}</title></html>")
+                with patch("core.services.sitemap.SITEMAP_MAX_URLS_PER_FILE", 2):
+                    build_sitemap()
+                mtimes = {path.name: path.stat().st_mtime_ns for path in root.glob("sitemap-pages-*.xml")}
+                self.assertEqual(sorted(mtimes), ["sitemap-pages-1.xml", "sitemap-pages-2.xml", "sitemap-pages-3.xml"])
+
+                contact_path = root / "contact" / "index.html"
+                self._write_html(contact_path, "<html><title>Contacts</title></html>")
+                os.utime(contact_path, (1_699_963_200, 1_699_963_200))
+                with (
+                    patch("core.services.sitemap.SITEMAP_MAX_URLS_PER_FILE", 2),
+                    patch("core.services.page_meta_cache.read_page_meta", wraps=read_page_meta) as read_mock,
+                ):
+                    result = update_sitemap(["/contact/"])
+
+                self.assertEqual([call.args[0] for call in read_mock.call_args_list], [contact_path])
+                self.assertEqual(result.patched_sections, ("pages",))
+                # /blog/ and /contact/ share the second file, the only one written: its lastmod, from /blog/, is unchanged.
+                self.assertEqual(result.rewritten_file_count, 1)
+                for name in ("sitemap-pages-1.xml", "sitemap-pages-3.xml"):
+                    self.assertEqual((root / name).stat().st_mtime_ns, mtimes[name])
+                self.assertIn("2023-11-14", (root / "sitemap-pages-2.xml").read_text(encoding="utf-8"))
+
+                patched_files = {path.name: path.read_bytes() for path in root.glob("sitemap*.xml")}
+                with patch("core.services.sitemap.SITEMAP_MAX_URLS_PER_FILE", 2):
+                    build_sitemap()
+                self.assertEqual({path.name: path.read_bytes() for path in root.glob("sitemap*.xml")}, patched_files)
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_update_sitemap_falls_back_to_full_rebuild_without_existing_sitemap(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                self._write_html(root / "index.html", "<html><body>Home</body></html>")
+                self._write_html(root / "about" / "index.html", "<html><body>About</body></html>")
+
+                result = update_sitemap(["/about/"])
+
+                self.assertIsNone(result.touched_path_count)
+                self.assertEqual(result.url_count, 2)
+
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+        SITEMAP_INDEX_ENABLED=True,
+        SITEMAP_GZIP=True,
+    )
+    def test_sitemap_index_splits_sections_and_rewrites_only_changed_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                for relative_dir in ("", "about", "faq", "contact"):
+                    self._write_html(root / relative_dir / "index.html", f"<html><title>{relative_dir}</title></html>")
+
+                with self.captureOnCommitCallbacks(execute=False):
+                    Articles.objects.create(
+                        title="Indexed Article",
+                        slug="indexed-article",
+                        body_html="<p>Body</p>",
+                        seo_title="SEO",
+                        seo_description="SEO",
+                        is_published=True,
+                    )
+                self._write_html(root / "articles" / "indexed-article" / "index.html", "<h1>Indexed Article</h1>")
+
+                with patch("core.services.sitemap.SITEMAP_MAX_URLS_PER_FILE", 3):
+                    result = build_public_sitemaps()
+                xml_result = result.xml_result
+
+                self.assertEqual(
+                    [path.name for path in xml_result.section_files],
+                    ["sitemap-pages-1.xml.gz", "sitemap-pages-2.xml.gz", "sitemap-articles-1.xml.gz"],
+                )
+                self.assertEqual(xml_result.rewritten_file_count, 4)
+                index = (root / "sitemap.xml").read_text(encoding="utf-8")
+                self.assertIn("<sitemapindex", index)
+                self.assertIn("<loc>https://example.com/sitemap-articles-1.xml.gz</loc>", index)
+                with gzip.open(root / "sitemap-pages-2.xml.gz", "rt", encoding="utf-8") as section_file:
+                    self.assertIn("<loc>https://example.com/faq/</loc>", section_file.read())
+                self.assertEqual(result.html_result.url_count, 5)
+                self.assertIn("Indexed Article", (root / "sitemap" / "articles" / "index.html").read_text(encoding="utf-8"))
+
+                pages_mtime = (root / "sitemap-pages-1.xml.gz").stat().st_mtime_ns
+                (root / "faq" / "index.html").unlink()
+                with patch("core.services.sitemap.SITEMAP_MAX_URLS_PER_FILE", 3):
+                    patched = update_sitemap(["/faq/"])
+
+                self.assertEqual(patched.patched_sections, ("pages",))
+                self.assertEqual(
+                    [path.name for path in patched.section_files],
+                    ["sitemap-pages-1.xml.gz", "sitemap-articles-1.xml.gz"],
+                )
+                self.assertEqual(patched.url_count, 4)
+                # The emptied second pages file is gone and the first kept its content; only the index changed.
+                self.assertEqual(patched.rewritten_file_count, 1)
+                self.assertEqual((root / "sitemap-pages-1.xml.gz").stat().st_mtime_ns, pages_mtime)
+                self.assertFalse((root / "sitemap-pages-2.xml.gz").exists())
+                self.assertNotIn("sitemap-pages-2", (root / "sitemap.xml").read_text(encoding="utf-8"))
+
+                with override_settings(SITEMAP_INDEX_ENABLED=False):
+                    single = build_sitemap()
+
+                self.assertEqual(single.section_files, ())
+                self.assertFalse(list(root.glob("sitemap-*.xml*")))
+                self.assertIn("<urlset", (root / "sitemap.xml").read_text(encoding="utf-8"))
 
     def _write_html(self, target_path: Path, content: str):
         target_path.parent.mkdir(parents=True, exist_ok=True)
@@ -234,24 +658,87 @@ class PublicSitemapSignalTests(TestCase):
 
                 self.assertSitemapContains(root, "/projects/signal-project/")
 
+    @override_settings(
+        SITE_PUBLIC_BASE_URL="https://example.com",
+        FRONTEND_PARTIALS_AUTO_SYNC=False,
+    )
+    def test_sitemap_lastmod_follows_content_fingerprint_not_updated_at(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                root = Path(temp_dir)
+                with self.captureOnCommitCallbacks(execute=True):
+                    article = Articles.objects.create(
+                        title="Fingerprint Article",
+                        slug="fingerprint-article",
+                        body_html="<p>Body</p>",
+                        excerpt="Excerpt",
+                        seo_title="SEO title",
+                        seo_description="SEO description",
+                        is_published=True,
+                    )
+
+                changed_at = timezone.make_aware(datetime(2026, 1, 10, 12, 0, 0))
+                GeneratedPage.objects.filter(path="/articles/fingerprint-article/").update(
+                    content_changed_at=changed_at
+                )
+                expected_lastmod = timezone.localtime(changed_at).isoformat(timespec="seconds")
+
+                # Saving without visible changes bumps updated_at but renders the same content.
+                with self.captureOnCommitCallbacks(execute=True):
+                    article.save()
+                self.assertEqual(self._read_lastmod(root, "/articles/fingerprint-article/"), expected_lastmod)
+
+                article.body_html = "<p>New body</p>"
+                with self.captureOnCommitCallbacks(execute=True):
+                    article.save()
+                self.assertNotEqual(self._read_lastmod(root, "/articles/fingerprint-article/"), expected_lastmod)
+
+                article.is_published = False
+                with self.captureOnCommitCallbacks(execute=True):
+                    article.save()
+                self.assertFalse(GeneratedPage.objects.filter(path="/articles/fingerprint-article/").exists())
+
+    def test_regeneration_batch_from_rolled_back_savepoint_is_discarded(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                with regeneration_batch() as batch:
+                    batch.add_article(123)
+                raise RuntimeError("rollback")
+
+        with regeneration_batch() as batch:
+            batch.add_sitemaps()
+
+        self.assertEqual(batch.article_ids, set())
+
     def assertSitemapContains(self, root: Path, public_path: str):
         xml = (root / "sitemap.xml").read_text(encoding="utf-8")
-        html = (root / "sitemap" / "index.html").read_text(encoding="utf-8")
         self.assertIn(public_path, xml)
-        self.assertIn(public_path, html)
+        self.assertIn(public_path, self._read_html_sitemap(root))
 
     def assertSitemapNotContains(self, root: Path, public_path: str):
         xml = (root / "sitemap.xml").read_text(encoding="utf-8")
-        html = (root / "sitemap" / "index.html").read_text(encoding="utf-8")
         self.assertNotIn(public_path, xml)
-        self.assertNotIn(public_path, html)
+        self.assertNotIn(public_path, self._read_html_sitemap(root))
+
+    def _read_lastmod(self, root: Path, public_path: str) -> str:
+        namespace = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        tree = ET.parse(root / "sitemap.xml")
+        for url in tree.getroot().findall("sm:url", namespace):
+            if url.findtext("sm:loc", namespaces=namespace).endswith(public_path):
+                return url.findtext("sm:lastmod", namespaces=namespace)
+        self.fail(f"{public_path} is missing from sitemap.xml")
+
+    def _read_html_sitemap(self, root: Path) -> str:
+        return "".join(
+            html_path.read_text(encoding="utf-8") for html_path in sorted((root / "sitemap").rglob("index.html"))
+        )
 
     def _write_html(self, target_path: Path, content: str):
         target_path.parent.mkdir(parents=True, exist_ok=True)
         target_path.write_text(content, encoding="utf-8")
 
 
-class HtmlSitemapServiceTests(SimpleTestCase):
+class HtmlSitemapServiceTests(TestCase):
     @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
     def test_build_html_sitemap_groups_detail_pages_and_skips_noindex(self):
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -416,14 +903,66 @@ class HtmlSitemapServiceTests(SimpleTestCase):
                 self.assertEqual(result.output_path, root / "sitemap" / "index.html")
                 self.assertEqual(result.section_count, 2)
                 self.assertEqual(result.url_count, 2)
+                self.assertEqual(result.page_count, 3)
 
                 html = result.output_path.read_text(encoding="utf-8")
                 self.assertIn('data-page="sitemap"', html)
-                self.assertIn("ГЛАВНАЯ СТРАНИЦА", html)
+                self.assertIn('href="/sitemap/main/"', html)
+                self.assertIn('href="/sitemap/articles/"', html)
                 self.assertIn("Статьи", html)
-                self.assertIn("/articles/live-article/", html)
+                self.assertNotIn("/articles/live-article/", html)
                 self.assertIn("https://example.com/sitemap/", html)
 
+                main_html = (root / "sitemap" / "main" / "index.html").read_text(encoding="utf-8")
+                self.assertIn("ГЛАВНАЯ СТРАНИЦА", main_html)
+                articles_html = (root / "sitemap" / "articles" / "index.html").read_text(encoding="utf-8")
+                self.assertIn("/articles/live-article/", articles_html)
+                self.assertIn("https://example.com/sitemap/articles/", articles_html)
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com", FRONTEND_PARTIALS_AUTO_SYNC=False)
+    def test_html_sitemap_paginates_sections_and_rewrites_only_changed_pages(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir, SITEMAP_HTML_PAGE_SIZE=2):
+                root = Path(temp_dir)
+                article_slugs = [f"article-{index}" for index in range(5)]
+                self._write_titled_page(root / "index.html", "Главная", robots="index,follow")
+                for slug in article_slugs:
+                    self._write_titled_page(root / "articles" / slug / "index.html", slug, robots="index,follow")
+                self._write_sitemap_xml(
+                    root / "sitemap.xml",
+                    ["https://example.com/", *(f"https://example.com/articles/{slug}/" for slug in article_slugs)],
+                )
+
+                result = build_static_html_sitemap_page()
+
+                self.assertEqual(result.page_count, 5)
+                self.assertEqual(result.rewritten_page_count, 5)
+                first_page = (root / "sitemap" / "articles" / "index.html").read_text(encoding="utf-8")
+                self.assertIn("/articles/article-1/", first_page)
+                self.assertNotIn("/articles/article-2/", first_page)
+                self.assertIn('<link rel="next" href="/sitemap/articles/page/2/" />', first_page)
+                last_page = (root / "sitemap" / "articles" / "page" / "3" / "index.html").read_text(encoding="utf-8")
+                self.assertIn("/articles/article-4/", last_page)
+                self.assertIn('rel="prev"', last_page)
+                self.assertIn("https://example.com/sitemap/articles/page/3/", last_page)
+
+                main_mtime = (root / "sitemap" / "main" / "index.html").stat().st_mtime_ns
+                self._write_sitemap_xml(
+                    root / "sitemap.xml",
+                    ["https://example.com/", *(f"https://example.com/articles/{slug}/" for slug in article_slugs[:3])],
+                )
+
+                result = build_static_html_sitemap_page()
+
+                # The index (link count) and both remaining articles pages (pagination) changed.
+                self.assertEqual(result.page_count, 4)
+                self.assertEqual(result.rewritten_page_count, 3)
+                self.assertEqual((root / "sitemap" / "main" / "index.html").stat().st_mtime_ns, main_mtime)
+                self.assertFalse((root / "sitemap" / "articles" / "page" / "3").exists())
+
+                second_run = build_static_html_sitemap_page()
+                self.assertEqual(second_run.rewritten_page_count, 0)
+
     def _write_sitemap_xml(self, target_path: Path, locations: list[str]):
         target_path.parent.mkdir(parents=True, exist_ok=True)
         lines = [
@@ -455,6 +994,460 @@ class HtmlSitemapServiceTests(SimpleTestCase):
         target_path.write_text(content, encoding="utf-8")
 
 
+@skipUnless(HAS_JINJA2, "Jinja2 is not installed")
+@override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+class JinjaTemplateParityTests(TestCase):
+    def setUp(self):
+        self.category = ProjectCategories.objects.create(title="Музеи & выставки", slug="museums")
+        with self.captureOnCommitCallbacks(execute=False):
+            self.article = Articles.objects.create(
+                title='Article "quoted" <b>',
+                slug="parity-article",
+                body_html="<p>Body</p>",
+                excerpt="Excerpt",
+                seo_title="SEO's title",
+                seo_description="",
+                is_published=True,
+            )
+            ArticlesContentBlock.objects.create(
+                article=self.article,
+                type=ArticlesContentBlock.VIDEO,
+                order=1,
+                media="https://media.example.net/video.mp4",
+                first_video_frame="https://media.example.net/poster.jpg",
+                caption="Video caption",
+            )
+            ArticlesContentBlock.objects.create(
+                article=self.article,
+                type=ArticlesContentBlock.IMAGE,
+                order=2,
+                media="https://media.example.net/image.jpg",
+                media_alt="",
+            )
+            self.project = Projects.objects.create(
+                title="Project & Co",
+                slug="parity-project",
+                category=self.category,
+                customer_name="Client",
+                year=2025,
+                type="Installation",
+                body_html="<p>Body</p>",
+                preview_image="https://media.example.net/preview.jpg",
+                seo_title="SEO title",
+                seo_description="SEO description",
+                is_published=True,
+            )
+            ProjectsContentBlock.objects.create(
+                project=self.project,
+                type=ProjectsContentBlock.IMAGE,
+                order=1,
+                media="https://media.example.net/gallery.jpg",
+                media_alt="Gallery alt",
+                caption="Gallery caption",
+            )
+            ProjectsContentBlock.objects.create(
+                project=self.project,
+                type=ProjectsContentBlock.VIDEO,
+                order=2,
+                media="https://media.example.net/video.mp4",
+            )
+
+    def test_article_detail_matches_django_output(self):
+        self._assert_engines_match("article_detail.html", build_article_render_context(self.article))
+
+    def test_project_detail_matches_django_output(self):
+        self._assert_engines_match("project_detail.html", build_project_render_context(self.project))
+
+    def test_projects_listing_matches_django_output(self):
+        self._assert_engines_match("projects_listing.html", build_projects_listing_context())
+        self._assert_engines_match(
+            "projects_listing.html",
+            build_projects_listing_context(active_category=self.category),
+        )
+
+    def test_sitemap_page_matches_django_output(self):
+        sections = (
+            HtmlSitemapSection(
+                key="main",
+                title="Основные страницы",
+                links=(HtmlSitemapLink(path="/", url="https://example.com/", title="ГЛАВНАЯ СТРАНИЦА"),),
+            ),
+            HtmlSitemapSection(
+                key="articles",
+                title="Статьи",
+                links=(
+                    HtmlSitemapLink(
+                        path="/articles/a/",
+                        url="https://example.com/articles/a/",
+                        title="Tom & Jerry",
+                        lastmod="2026-01-01T00:00:00+00:00",
+                        priority="0.7",
+                    ),
+                    HtmlSitemapLink(path="/articles/b/", url="https://example.com/articles/b/", title="B"),
+                ),
+            ),
+        )
+        for _public_path, context in iter_html_sitemap_pages(sections, page_size=1):
+            self._assert_engines_match("sitemap_page.html", context)
+
+    def _assert_engines_match(self, template_name: str, context: dict):
+        django_html = render_generation_template(template_name, context, engine=DJANGO_ENGINE)
+        jinja2_html = render_generation_template(template_name, context, engine=JINJA2_ENGINE)
+        self.assertEqual(django_html, jinja2_html)
+
+
+@override_settings(API_RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        reset_response_cache_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item = PressItem.objects.create(
+                title="Alpha",
+                description="Alpha description",
+                url="https://example.com/alpha",
+                is_published=True,
+            )
+
+    def test_repeat_requests_are_served_from_cache_until_a_save_bumps_the_version(self):
+        url = reverse("press:feed")
+        first = self.client.get(url, {"limit": 5, "page": 1})
+        self.assertEqual(first["X-Response-Cache"], "miss")
+
+        # Only the conditional GET validators still hit the database; query order does not matter.
+        with self.assertNumQueries(1):
+            second = self.client.get(url, {"page": 1, "limit": 5})
+        self.assertEqual(second["X-Response-Cache"], "hit")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+
+        self.item.title = "Alpha, updated"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+
+        third = self.client.get(url, {"limit": 5, "page": 1})
+        self.assertEqual(third["X-Response-Cache"], "miss")
+        self.assertEqual(third.json()["data"][0]["title"], "Alpha, updated")
+
+        stats = get_response_cache_stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 2))
+        self.assertAlmostEqual(stats.hit_ratio, 1 / 3)
+
+    def test_version_bump_waits_for_commit(self):
+        url = reverse("press:feed")
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=False):
+            PressItem.objects.filter(pk=self.item.pk).update(title="Not committed")
+            self.item.save()
+            self.assertEqual(self.client.get(url)["X-Response-Cache"], "hit")
+
+    def test_failed_page_rebuild_still_bumps_the_api_version(self):
+        article = Articles.objects.create(title="Cached", slug="cached", body_html="<p>Body</p>", is_published=True)
+        url = reverse("blog:articles_list")
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)["X-Response-Cache"], "hit")
+
+        article.title = "Cached, updated"
+        with patch("core.services.regeneration.build_items_detail_static_html", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError), self.captureOnCommitCallbacks(execute=True):
+                article.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response["X-Response-Cache"], "miss")
+        self.assertEqual(response.json()["data"][0]["title"], "Cached, updated")
+
+    def test_check_requires_a_cache_shared_by_workers(self):
+        self.assertEqual([error.id for error in check_api_response_cache_backend(None)], ["core.E001"])
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(
+            CACHES={
+                **settings.CACHES,
+                "api_responses": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": temp_dir},
+            }
+        ):
+            self.assertEqual(check_api_response_cache_backend(None), [])
+
+    def test_error_responses_are_not_cached(self):
+        url = reverse("press:feed")
+        self.assertEqual(self.client.get(url, {"cursor": "broken"}).status_code, 400)
+        response = self.client.get(url, {"cursor": "broken"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["X-Response-Cache"], "miss")
+
+    def test_stats_command_reports_hit_ratio(self):
+        url = reverse("press:feed")
+        self.client.get(url)
+        self.client.get(url)
+
+        stdout = StringIO()
+        call_command("response_cache_stats", "--reset", stdout=stdout)
+
+        self.assertIn("1 hits, 1 misses; hit ratio: 50.0%", stdout.getvalue())
+        self.assertEqual(get_response_cache_stats().hits, 0)
+
+
+@override_settings(
+    RESPONSE_COMPRESSION_ENABLED=True,
+    RESPONSE_COMPRESSION_MIN_SIZE=200,
+    API_RESPONSE_CACHE_ENABLED=True,
+)
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        reset_compression_stats()
+        for index in range(10):
+            PressItem.objects.create(
+                title=f"Press item {index}",
+                description="Cultnova in the press. " * 5,
+                url=f"https://example.com/press-{index}",
+                is_published=True,
+            )
+
+    def test_gzip_is_negotiated_and_varies_alongside_origin(self):
+        url = reverse("press:feed")
+        plain = self.client.get(url, HTTP_ORIGIN="https://cultnova.ru")
+        response = self.client.get(
+            url,
+            HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=0.8",
+            HTTP_ORIGIN="https://cultnova.ru",
+        )
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual({value.strip() for value in response["Vary"].split(",")}, {"Accept-Encoding", "Origin"})
+        self.assertIn('compress;dur=', response["Server-Timing"])
+        self.assertTrue(response["ETag"].startswith('W/"'))
+
+    @skipUnless(HAS_BROTLI, "Brotli is not installed")
+    def test_brotli_is_preferred_when_accepted(self):
+        url = reverse("press:feed")
+        plain = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+    def test_small_and_out_of_scope_responses_are_left_alone(self):
+        PressItem.objects.all().delete()
+        small = self.client.get(reverse("press:feed"), HTTP_ACCEPT_ENCODING="gzip")
+        with override_settings(RESPONSE_COMPRESSION_PATHS=["/projects/"]):
+            out_of_scope = self.client.get(reverse("press:feed"), HTTP_ACCEPT_ENCODING="gzip")
+
+        for response in (small, out_of_scope):
+            self.assertNotIn("Content-Encoding", response)
+            self.assertNotIn("Accept-Encoding", response.get("Vary", ""))
+
+    def test_cache_hits_reuse_the_stored_compressed_variant(self):
+        url = reverse("press:feed")
+        with patch("core.middleware.compression.compress_body", wraps=compress_body) as compress_mock:
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual((first["X-Response-Cache"], second["X-Response-Cache"]), ("miss", "hit"))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(compress_mock.call_count, 1)
+        self.assertIn(" cached", second["Server-Timing"])
+
+        stdout = StringIO()
+        call_command("compression_stats", "--reset", stdout=stdout)
+        self.assertIn("2 responses (1 from cached variants)", stdout.getvalue())
+        self.assertEqual(get_compression_stats().responses, 0)
+
+
+class ItemDetailStaticBuildTests(TestCase):
+    def test_worker_threads_close_their_database_connections(self):
+        articles = [
+            Articles.objects.create(title=f"Pooled {index}", slug=f"pooled-{index}", body_html="<p>Body</p>")
+            for index in range(3)
+        ]
+        main_thread = threading.current_thread()
+        closed_in = []
+
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(GENERATED_HTML_PAGES_PATH=temp_dir), patch(
+            "core.services.build_item_html.connections"
+        ) as connections_mock:
+            connections_mock.close_all.side_effect = lambda: closed_in.append(threading.current_thread())
+            written = build_items_detail_static_html(articles, "article_detail.html", "articles", max_workers=2)
+
+        self.assertEqual(len(written), 3)
+        self.assertEqual(len(closed_in), 3)
+        self.assertNotIn(main_thread, closed_in)
+
+
+class ContentValidatorsTests(SimpleTestCase):
+    def tearDown(self):
+        reset_pages_version()
+
+    def test_etag_and_last_modified_follow_templates_and_static_pages_version(self):
+        aggregate = {"changed_at": datetime(2030, 1, 1, tzinfo=dt_timezone.utc), "count": 1}
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as pages_dir, override_settings(
+            TEMPLATES=[{"BACKEND": "django.template.backends.django.DjangoTemplates", "DIRS": [temp_dir]}],
+            GENERATED_HTML_PAGES_PATH=pages_dir,
+        ):
+            template_path = Path(temp_dir) / "page.html"
+            template_path.write_text("<p>v1</p>", encoding="utf-8")
+            os.utime(template_path, (0, 0))
+            reset_pages_version()
+            initial = build_content_validators("pages", aggregate)
+
+            template_path.write_text("<p>v2</p>", encoding="utf-8")
+            deployed_at = datetime(2030, 2, 1, tzinfo=dt_timezone.utc).timestamp()
+            os.utime(template_path, (deployed_at, deployed_at))
+            reset_pages_version()
+            redeployed = build_content_validators("pages", aggregate)
+
+            os.utime(template_path, (0, 0))
+            with override_settings(STATIC_PAGES_VERSION="2030-02-02"):
+                reset_pages_version()
+                bumped = build_content_validators("pages", aggregate)
+                deploy_seen_at = get_pages_version().changed_at
+                reset_pages_version()
+                self.assertEqual(get_pages_version().changed_at, deploy_seen_at)
+
+        self.assertEqual(initial.last_modified, aggregate["changed_at"])
+        self.assertNotEqual(redeployed.etag, initial.etag)
+        self.assertEqual(redeployed.last_modified.timestamp(), deployed_at)
+        self.assertNotEqual(bumped.etag, redeployed.etag)
+        # The deploy version counts from when it was first seen, kept in a marker next to the pages.
+        self.assertAlmostEqual(deploy_seen_at.timestamp(), time.time(), delta=60)
+
+    def test_pages_version_scans_only_the_project_template_dirs(self):
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(
+            TEMPLATES=[
+                {"BACKEND": "django.template.backends.django.DjangoTemplates", "DIRS": [temp_dir], "APP_DIRS": True}
+            ],
+        ), patch("core.services.pages_version.os.walk", wraps=os.walk) as walk_mock:
+            reset_pages_version()
+            get_pages_version()
+
+        self.assertEqual([call.args[0] for call in walk_mock.call_args_list], [Path(temp_dir)])
+
+
+class PageMetaTests(SimpleTestCase):
+    def test_head_scan_matches_full_parse(self):
+        html = (
+            "<!DOCTYPE html><HTML><HEAD><Meta charset='utf-8'>"
+            "<meta content='noindex, follow' name='ROBOTS'>"
+            "<title>Проекты &amp; музеи | Cultnova</title></HEAD>"
+            '<body><nav><a href="/">Home</a></nav><h1 class="page-title">Музей <span>&laquo;Мир&raquo;</span></h1>'
+            "<p>Body</p></body></HTML>"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            html_path = Path(temp_dir) / "index.html"
+            html_path.write_text(html, encoding="utf-8")
+
+            page_meta = read_page_meta(html_path)
+            reference = read_full_page_meta(html_path)
+
+        self.assertFalse(page_meta.full_parse)
+        self.assertEqual(page_meta.title, "Проекты & музеи | Cultnova")
+        self.assertEqual(page_meta.h1, "Музей «Мир»")
+        self.assertTrue(page_meta.has_noindex)
+        self.assertEqual(
+            (page_meta.title, page_meta.h1, page_meta.robots_content, page_meta.has_noindex),
+            (reference.title, reference.h1, reference.robots_content, reference.has_noindex),
+        )
+
+    def test_falls_back_to_full_parse_when_h1_is_past_the_prefix(self):
+        html = (
+            '<html><head><meta name="robots" content="index,follow"><title>Long</title></head><body>'
+            + "<p>filler</p>" * 200
+            + "<h1>Late heading</h1></body></html>"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            html_path = Path(temp_dir) / "index.html"
+            html_path.write_text(html, encoding="utf-8")
+
+            page_meta = read_page_meta(html_path, prefix_bytes=512)
+            robots_only = read_page_meta(html_path, need_h1=False, prefix_bytes=512)
+
+        self.assertTrue(page_meta.full_parse)
+        self.assertEqual(page_meta.h1, "Late heading")
+        self.assertFalse(robots_only.full_parse)
+        self.assertEqual(robots_only.robots_content, "index,follow")
+
+    def test_short_page_without_h1_is_not_parsed_twice(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            html_path = Path(temp_dir) / "index.html"
+            html_path.write_text("<html><head><title>About</title></head><body></body></html>", encoding="utf-8")
+
+            page_meta = read_page_meta(html_path)
+
+        self.assertFalse(page_meta.full_parse)
+        self.assertEqual((page_meta.title, page_meta.h1), ("About", ""))
+
+
+class SitemapRebuildDebounceTests(SimpleTestCase):
+    @override_settings(SITEMAP_REBUILD_DEBOUNCE_SECONDS=0)
+    def test_zero_quiet_window_rebuilds_immediately(self):
+        debouncer = SitemapRebuildDebouncer()
+        with patch("core.services.sitemap.build_public_sitemaps") as build_mock:
+            result = debouncer.request_rebuild()
+
+        build_mock.assert_called_once_with()
+        self.assertTrue(result.built)
+        self.assertEqual(result.collapsed_count, 0)
+
+    @override_settings(SITEMAP_REBUILD_DEBOUNCE_SECONDS=60)
+    def test_requests_inside_quiet_window_collapse_into_one_flush(self):
+        debouncer = SitemapRebuildDebouncer()
+        self.addCleanup(debouncer.cancel)
+        with patch("core.services.sitemap.build_public_sitemaps") as build_mock:
+            for _ in range(3):
+                self.assertIsNone(debouncer.request_rebuild())
+            build_mock.assert_not_called()
+            self.assertEqual(debouncer.pending_requests, 3)
+
+            result = debouncer.flush()
+            empty_result = debouncer.flush()
+
+        build_mock.assert_called_once_with()
+        self.assertEqual((result.built, result.request_count, result.collapsed_count), (True, 3, 2))
+        self.assertFalse(empty_result.built)
+        self.assertEqual(debouncer.total_collapsed, 2)
+
+    @override_settings(SITEMAP_REBUILD_DEBOUNCE_SECONDS=0.05)
+    def test_rebuild_runs_after_quiet_window(self):
+        debouncer = SitemapRebuildDebouncer()
+        self.addCleanup(debouncer.cancel)
+        built = threading.Event()
+        with patch("core.services.sitemap.build_public_sitemaps", side_effect=lambda: built.set()) as build_mock:
+            debouncer.request_rebuild()
+            debouncer.request_rebuild()
+            self.assertTrue(built.wait(timeout=5))
+            # Counters are updated under the build lock right after the build returns.
+            with debouncer._build_lock:
+                pass
+
+        build_mock.assert_called_once_with()
+        self.assertEqual(debouncer.total_builds, 1)
+        self.assertEqual(debouncer.total_collapsed, 1)
+
+
+class WorkerWarmupTests(SimpleTestCase):
+    def test_public_templates_exclude_jinja2_ports(self):
+        template_names = set(iter_public_template_names())
+
+        self.assertIn("article_detail.html", template_names)
+        self.assertIn("includes/media_video_player.html", template_names)
+        self.assertIn("partials/header.html", template_names)
+        self.assertFalse(any(name.startswith("jinja2/") for name in template_names))
+
+    def test_warm_up_worker_compiles_templates_without_failed_steps(self):
+        result = warm_up_worker()
+
+        self.assertEqual(result.template_count, len(list(iter_public_template_names())))
+        self.assertEqual(result.failed_steps, ())
+        self.assertGreaterEqual(result.duration_ms, 0)
+
+    @override_settings(WORKER_WARMUP=False)
+    def test_warm_up_is_opt_in(self):
+        self.assertIsNone(warm_up_worker_if_enabled())
+
+
 class FrontendPartialSyncTests(SimpleTestCase):
     def test_sync_frontend_partials_prefers_newer_repo_sources(self):
         with tempfile.TemporaryDirectory() as backend_dir, tempfile.TemporaryDirectory() as frontend_dir:
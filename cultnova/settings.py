@@ -49,6 +49,25 @@ ADMIN_URL = os.getenv('ADMIN_URL', 'backend-admin/').strip('/').strip() + '/'
 FRONTEND_REPO_PATH = os.getenv('FRONTEND_REPO_PATH', '').strip()
 FRONTEND_PARTIALS_EXPORT_DIR = os.getenv('FRONTEND_PARTIALS_EXPORT_DIR', '').strip()
 FRONTEND_PARTIALS_AUTO_SYNC = env_bool('FRONTEND_PARTIALS_AUTO_SYNC', True)
+WORKER_WARMUP = env_bool('WORKER_WARMUP', False)
+SITEMAP_INDEX_ENABLED = env_bool('SITEMAP_INDEX_ENABLED', False)
+SITEMAP_GZIP = env_bool('SITEMAP_GZIP', False)
+SITEMAP_REBUILD_DEBOUNCE_SECONDS = float(os.getenv('SITEMAP_REBUILD_DEBOUNCE_SECONDS', '0') or 0)
+SITEMAP_SCAN_WORKERS = int(os.getenv('SITEMAP_SCAN_WORKERS', '8') or 1)
+SITEMAP_META_CACHE_PATH = os.getenv('SITEMAP_META_CACHE_PATH', '').strip()
+SITEMAP_HTML_PAGE_SIZE = int(os.getenv('SITEMAP_HTML_PAGE_SIZE', '500') or 500)
+STATIC_GENERATION_WORKERS = int(os.getenv('STATIC_GENERATION_WORKERS', '4') or 1)
+STATIC_GENERATION_TEMPLATE_ENGINE = os.getenv('STATIC_GENERATION_TEMPLATE_ENGINE', 'django').strip().lower()
+API_RESPONSE_CACHE_ENABLED = env_bool('API_RESPONSE_CACHE_ENABLED', False)
+API_RESPONSE_CACHE_PATH = os.getenv('API_RESPONSE_CACHE_PATH', '').strip()
+API_RESPONSE_CACHE_TIMEOUT = int(os.getenv('API_RESPONSE_CACHE_TIMEOUT', '3600') or 3600)
+STATIC_FIRST_VIEWS_ENABLED = env_bool('STATIC_FIRST_VIEWS_ENABLED', False)
+STATIC_PAGES_ACCEL_REDIRECT_PREFIX = os.getenv('STATIC_PAGES_ACCEL_REDIRECT_PREFIX', '').strip()
+STATIC_PAGES_VERSION = os.getenv('STATIC_PAGES_VERSION', '').strip()
+RESPONSE_COMPRESSION_ENABLED = env_bool('RESPONSE_COMPRESSION_ENABLED', False)
+RESPONSE_COMPRESSION_PATHS = env_list('RESPONSE_COMPRESSION_PATHS', ['/api/', '/projects/'])
+RESPONSE_COMPRESSION_CONTENT_TYPES = env_list('RESPONSE_COMPRESSION_CONTENT_TYPES', ['application/json', 'text/html'])
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', '1024') or 0)
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env_bool('DEBUG', True)
@@ -74,6 +93,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'core.middleware.cors.CorsMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -114,6 +134,32 @@ DATABASES = {
 }
 
 
+# Cache
+# Public API responses go to their own cache, shared by all worker processes on disk when
+# API_RESPONSE_CACHE_PATH is set. The in-memory fallback only serves tests: enabling the
+# response cache without a path fails the core.E001 system check.
+
+_api_response_cache_path = Path(API_RESPONSE_CACHE_PATH) if API_RESPONSE_CACHE_PATH else None
+if _api_response_cache_path is not None and not _api_response_cache_path.is_absolute():
+    _api_response_cache_path = BASE_DIR / _api_response_cache_path
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api_responses': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache'
+            if _api_response_cache_path
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': str(_api_response_cache_path) if _api_response_cache_path else 'api-responses',
+        'TIMEOUT': API_RESPONSE_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cultnova.settings')
 
 application = get_wsgi_application()
+
+from core.services.warmup import warm_up_worker_if_enabled  # noqa: E402
+
+warm_up_worker_if_enabled()
@@ -6,3 +6,5 @@ class PressConfig(AppConfig):
     name = "press"
     verbose_name = "СМИ о нас"
 
+    def ready(self):
+        import press.signals  # noqa: F401
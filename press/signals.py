@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.response_cache import PRESS_CONTENT, bump_content_versions_on_commit
+
+from .models import PressItem
+
+
+@receiver([post_save, post_delete], sender=PressItem)
+def press_api_responses_handler(sender, using=None, **kwargs):
+    bump_content_versions_on_commit(PRESS_CONTENT, using=using)
@@ -211,6 +211,47 @@ class PressFeedApiTests(TestCase):
         self.assertEqual(payload["data"][0]["title"], "Gamma")
 
 
+    def test_feed_cursor_mode_walks_items_without_page_numbers(self):
+        PressItem.objects.filter(pk__in=[self.first.pk, self.second.pk]).update(created_at=timezone.now())
+
+        titles = []
+        cursor = ""
+        for _ in range(3):
+            response = self.client.get(reverse("press:feed"), {"limit": 1, "cursor": cursor})
+            self.assertEqual(response.status_code, 200)
+            payload = response.json()
+            self.assertNotIn("current_page", payload)
+            titles.extend(item["title"] for item in payload["data"])
+            cursor = payload["next_cursor"]
+            if not payload["has_next"]:
+                break
+
+        self.assertEqual(titles, ["Gamma", "Alpha", "Beta"])
+        self.assertIsNone(cursor)
+
+    def test_feed_answers_if_modified_since_with_304(self):
+        response = self.client.get(reverse("press:feed"))
+        last_modified = response["Last-Modified"]
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(reverse("press:feed"), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn("public", not_modified["Cache-Control"])
+
+        PressItem.objects.filter(pk=self.first.pk).update(updated_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(
+            self.client.get(reverse("press:feed"), HTTP_IF_MODIFIED_SINCE=last_modified).status_code,
+            200,
+        )
+
+    def test_feed_rejects_malformed_cursor(self):
+        response = self.client.get(reverse("press:feed"), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid cursor."})
+
+
 class PressAdminTests(TestCase):
     def setUp(self):
         self.user = get_user_model().objects.create_superuser(
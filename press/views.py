@@ -1,9 +1,16 @@
 from django.core.paginator import Paginator
+from django.db.models import Count, Max
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 
+from core.services.conditional_get import LIST_CACHE_CONTROL, build_content_validators, conditional_content
+from core.services.keyset_pagination import InvalidCursorError, paginate_by_keyset
+from core.services.response_cache import PRESS_CONTENT, cached_response
+
 from .models import PressItem
 
+PRESS_KEYSET_ORDERING = ("sort_order", "created_at", "pk")
+
 
 def _sanitize_limit(raw_value, default=10, max_value=100):
     try:
@@ -14,16 +21,37 @@ def _sanitize_limit(raw_value, default=10, max_value=100):
     return min(max(value, 1), max_value)
 
 
+def _press_validators(request):
+    return build_content_validators(
+        "press",
+        PressItem.objects.aggregate(changed_at=Max("updated_at"), count=Count("pk")),
+    )
+
+
 @require_GET
+@conditional_content(_press_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PRESS_CONTENT)
 def get_press_feed(request):
     page = request.GET.get("page", 1)
+    cursor = request.GET.get("cursor")
     limit = _sanitize_limit(request.GET.get("limit", 10))
 
-    items_qs = PressItem.objects.filter(is_published=True).order_by(
-        "sort_order",
-        "created_at",
-        "pk",
-    )
+    items_qs = PressItem.objects.filter(is_published=True).order_by(*PRESS_KEYSET_ORDERING)
+
+    if cursor is not None:
+        try:
+            items_page = paginate_by_keyset(items_qs, PRESS_KEYSET_ORDERING, cursor=cursor, limit=limit)
+        except InvalidCursorError:
+            return JsonResponse({"error": "Invalid cursor."}, status=400)
+
+        return JsonResponse(
+            {
+                "has_next": items_page.has_next,
+                "next_cursor": items_page.next_cursor,
+                "data": [_build_press_item(item) for item in items_page],
+            }
+        )
+
     paginator = Paginator(items_qs, limit)
     items_page = paginator.get_page(page)
     has_next_page = items_page.has_next()
@@ -33,14 +61,15 @@ def get_press_feed(request):
         "has_next": has_next_page,
         "has_previous": items_page.has_previous(),
         "next_page": items_page.next_page_number() if has_next_page else None,
-        "data": [
-            {
-                "title": item.title,
-                "description": item.description,
-                "url": item.url,
-            }
-            for item in items_page
-        ],
+        "data": [_build_press_item(item) for item in items_page],
     }
 
     return JsonResponse(payload)
+
+
+def _build_press_item(item):
+    return {
+        "title": item.title,
+        "description": item.description,
+        "url": item.url,
+    }
@@ -3,9 +3,11 @@ import re
 
 from django import forms
 from django.conf import settings
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
 from django.db import connection
 from django.http import HttpResponse, JsonResponse
+from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils.html import format_html, mark_safe
 
@@ -16,6 +18,7 @@ from blog.services.rich_text import (
     sanitize_rich_body_html,
 )
 from blog.widgets import JoditWidget
+from core.services.bulk_publication import bulk_move_projects_to_category, bulk_set_published
 from core.services.vk_cloud_storage import upload_media_to_vk_cloud
 from projects.services.project_category_seo import (
     CURRENT_YEAR_TOKEN,
@@ -294,6 +297,10 @@ class ServicePageProjectsAdminForm(forms.ModelForm):
         return cleaned_data
 
 
+class MoveProjectsToCategoryForm(forms.Form):
+    category = forms.ModelChoiceField(queryset=ProjectCategories.objects.order_by("title"), label="Category")
+
+
 def _service_page_projects_schema_ready():
     table_name = ServicePageProjects._meta.db_table
     existing_tables = connection.introspection.table_names()
@@ -438,7 +445,9 @@ class ProjectCategoriesAdmin(admin.ModelAdmin):
 class ProjectsAdmin(admin.ModelAdmin):
     list_display = ("title", "slug", "category", "is_published", "created_at", "updated_at")
     list_editable = ("is_published",)
+    list_select_related = ("category",)
     list_filter = ("category", "is_published", "created_at", "updated_at")
+    actions = ("publish_selected", "unpublish_selected", "move_to_category")
     search_fields = ("title", "slug", "customer_name", "seo_title", "seo_description", "excerpt")
     prepopulated_fields = {"slug": ("title",)}
     inlines = [ContentBlockInline]
@@ -518,6 +527,38 @@ class ProjectsAdmin(admin.ModelAdmin):
         ]
         return custom_urls + super().get_urls()
 
+    @admin.action(description="Publish selected projects")
+    def publish_selected(self, request, queryset):
+        updated = bulk_set_published(queryset, True)
+        self.message_user(request, f"Published {updated} project(s).", messages.SUCCESS)
+
+    @admin.action(description="Unpublish selected projects")
+    def unpublish_selected(self, request, queryset):
+        updated = bulk_set_published(queryset, False)
+        self.message_user(request, f"Unpublished {updated} project(s).", messages.SUCCESS)
+
+    @admin.action(description="Move selected projects to category")
+    def move_to_category(self, request, queryset):
+        if "apply" in request.POST:
+            form = MoveProjectsToCategoryForm(request.POST)
+            if form.is_valid():
+                category = form.cleaned_data["category"]
+                moved = bulk_move_projects_to_category(queryset, category)
+                self.message_user(request, f"Moved {moved} project(s) to {category}.", messages.SUCCESS)
+                return None
+        else:
+            form = MoveProjectsToCategoryForm()
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Move projects to category",
+            "opts": self.model._meta,
+            "queryset": queryset.select_related("category"),
+            "form": form,
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, "admin/projects/projects/move_to_category.html", context)
+
     def inline_image_upload_view(self, request):
         if request.method != "POST":
             return JsonResponse({"success": False, "error": "POST method is required."}, status=405)
@@ -0,0 +1,95 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from projects.models import Projects
+from projects.services.project_rendering import (
+    PROJECT_DETAIL_KEYS,
+    build_project_detail_payload,
+    build_project_render_context,
+    get_project_detail_queryset,
+)
+
+
+def _build_payload_from_render_context(slug):
+    """The detail API payload as it was built before: through the HTML page context."""
+    project = Projects.objects.get(slug=slug)
+    rendered_project = build_project_render_context(project)["project"]
+    return {
+        "id": rendered_project.id,
+        "slug": rendered_project.slug,
+        "title": rendered_project.title,
+        "category": {
+            "id": rendered_project.category_id,
+            "title": rendered_project.category.title,
+            "slug": rendered_project.category.slug,
+        },
+        "customer_name": rendered_project.customer_name,
+        "year": rendered_project.year,
+        "type": rendered_project.type,
+        "excerpt": rendered_project.excerpt,
+        "body_html": str(rendered_project.body_html),
+        "preview_image": rendered_project.preview_image,
+        "preview_image_alt": rendered_project.preview_image_alt,
+        "seo": rendered_project.seo,
+        "url": rendered_project.url,
+        "path": rendered_project.path,
+        "media": rendered_project.media,
+        "share_links": rendered_project.share_links,
+    }
+
+
+def _build_payload(slug, keys=PROJECT_DETAIL_KEYS):
+    return build_project_detail_payload(get_project_detail_queryset(keys).get(slug=slug), keys)
+
+
+class Command(BaseCommand):
+    help = "Compare the project detail API payload built from the page render context with the dedicated serializer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50, help="Payload builds per project and path.")
+        parser.add_argument("--limit", type=int, default=5, help="Published projects to sample.")
+
+    def handle(self, *args, **options):
+        iterations = max(options["iterations"], 1)
+        slugs = list(
+            Projects.objects.filter(is_published=True)
+            .order_by("-created_at")
+            .values_list("slug", flat=True)[: max(options["limit"], 1)]
+        )
+        if not slugs:
+            raise CommandError("Nothing to serialize: publish a project first.")
+
+        paths = (
+            ("render context", _build_payload_from_render_context),
+            ("serializer", _build_payload),
+            ("serializer fields=slug,title,body_html", lambda slug: _build_payload(slug, ("slug", "title", "body_html"))),
+        )
+        for slug in slugs:
+            timings = {}
+            query_counts = {}
+            payloads = {}
+            for label, build in paths:
+                with CaptureQueriesContext(connection) as queries:
+                    payloads[label] = build(slug)
+                query_counts[label] = len(queries)
+
+                started_at = perf_counter()
+                for _ in range(iterations):
+                    build(slug)
+                timings[label] = (perf_counter() - started_at) * 1000 / iterations
+
+            parity = "ok" if payloads["render context"] == payloads["serializer"] else "MISMATCH"
+            baseline = timings["render context"]
+            self.stdout.write(f"project {slug} (parity: {parity})")
+            for label, _build in paths:
+                self.stdout.write(
+                    "  {label}: {ms:.2f} ms, {queries} queries; speedup: {speedup:.2f}x".format(
+                        label=label,
+                        ms=timings[label],
+                        queries=query_counts[label],
+                        speedup=baseline / max(timings[label], 1e-9),
+                    )
+                )
@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
 
 from core.services.build_item_html import build_item_detail_static_html, delete_item_detail_static_html
+from core.services.response_cache import PROJECTS_CONTENT, bump_content_versions
 from projects.models import Projects
-from projects.services.project_listing import rebuild_projects_listing_static_html
+from projects.services.project_listing import rebuild_projects_listing_static_html, refresh_project_cards
 
 
 class Command(BaseCommand):
@@ -32,8 +33,12 @@ class Command(BaseCommand):
                 delete_item_detail_static_html(project, "projects")
                 deleted += 1
 
+        cards = refresh_project_cards()
+        bump_content_versions(PROJECTS_CONTENT)
+
         self.stdout.write(
             self.style.SUCCESS(
-                f"Rebuilt detail pages: {rebuilt}, rebuilt listing pages: {len(listing_pages)}, deleted: {deleted}"
+                f"Rebuilt detail pages: {rebuilt}, rebuilt listing pages: {len(listing_pages)}, deleted: {deleted}, "
+                f"API cards: {cards}"
             )
         )
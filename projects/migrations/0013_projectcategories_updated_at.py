@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_servicepageprojects_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectcategories',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+    ]
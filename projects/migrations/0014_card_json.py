@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0013_projectcategories_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projects',
+            name='card_images_json',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Card images JSON'),
+        ),
+        migrations.AddField(
+            model_name='projects',
+            name='card_json',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Card JSON'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def sanitize_project_bodies(apps, schema_editor):
+    from blog.services.rich_text import sanitize_rich_body_html
+
+    Projects = apps.get_model("projects", "Projects")
+    for project in Projects.objects.only("id", "body_html").iterator():
+        sanitized = sanitize_rich_body_html(project.body_html)
+        if sanitized != project.body_html:
+            # `update()` keeps `updated_at`: the visible content is what the pages already rendered.
+            Projects.objects.filter(pk=project.pk).update(body_html=sanitized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_card_json'),
+    ]
+
+    operations = [
+        migrations.RunPython(sanitize_project_bodies, migrations.RunPython.noop),
+    ]
@@ -13,6 +13,7 @@ class ProjectCategories(models.Model):
     seo_robots = models.CharField(max_length=32, blank=True, default="index,follow", verbose_name="SEO robots")
     canonical_url = models.URLField(max_length=1024, blank=True, default="", verbose_name="Canonical URL")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated at")
 
     class Meta:
         verbose_name = "Категория проектов"
@@ -47,6 +48,11 @@ class Projects(BaseContentItem):
     seo_keywords = models.CharField(max_length=500, blank=True, default="", verbose_name="SEO keywords")
     seo_robots = models.CharField(max_length=32, default="index,follow", verbose_name="SEO robots")
     canonical_url = models.URLField(max_length=1024, blank=True, default="", verbose_name="Canonical URL")
+    # List API card and its image list serialized on save; empty until the first refresh.
+    card_json = models.TextField(blank=True, default="", editable=False, verbose_name="Card JSON")
+    card_images_json = models.TextField(blank=True, default="", editable=False, verbose_name="Card images JSON")
+
+    TRACKED_FIELDS = BaseContentItem.TRACKED_FIELDS + ("category_id",)
 
     class Meta:
         verbose_name = "Проект"
@@ -1,28 +1,38 @@
 from __future__ import annotations
 
 import json
-import os
 import shutil
 from pathlib import Path
-from tempfile import NamedTemporaryFile
 from urllib.parse import urlsplit
 
 from django.conf import settings
-from django.core.paginator import Paginator
-from django.db.models import Prefetch, QuerySet
-from django.template.loader import render_to_string
+from django.db.models import Count, Max, Prefetch, Q, QuerySet
 from django.utils.safestring import mark_safe
 
 from core.services.build_item_html import (
     get_generated_pages_root,
     sync_frontend_partials_if_configured,
+    write_text_atomically,
 )
+from core.services.json_fragments import dump_json_fragment, extend_json_object
+from core.services.keyset_pagination import paginate_by_keyset
+from core.services.page_fingerprints import (
+    build_generated_page_path,
+    fingerprint_page_html,
+    forget_page_fingerprints,
+    record_page_fingerprints,
+)
+from core.services.sparse_fields import build_only_columns
+from core.services.template_rendering import render_generation_template
 
 from ..models import ProjectCategories, Projects, ProjectsContentBlock, ServicePageProjects
 from .project_category_seo import get_resolved_project_category_seo_fields
 from .project_rendering import build_public_project_path
 
 PROJECTS_LISTING_PAGE_SIZE = 3
+PROJECTS_KEYSET_ORDERING = ("-created_at", "-id")
+# Columns the list APIs read when the cards are already materialized (plus the keyset ordering).
+PROJECT_CARD_COLUMNS = ("id", "created_at", "card_json", "card_images_json")
 DEFAULT_PUBLIC_CMS_BASE_URL = "https://cms.cultnova.ru"
 PROJECTS_HERO_ALT = "Проекты Cultnova"
 PROJECTS_HERO_PRELOADS = (
@@ -116,31 +126,33 @@ def get_published_projects_queryset(
         Projects.objects.select_related("category")
         .filter(is_published=True)
         .exclude(seo_robots__icontains="noindex")
-        .order_by("-created_at")
+        .order_by(*PROJECTS_KEYSET_ORDERING)
     )
 
     if category_slug:
         queryset = queryset.filter(category__slug=category_slug)
 
     if include_images:
-        queryset = queryset.prefetch_related(
-            Prefetch(
-                "blocks",
-                queryset=(
-                    ProjectsContentBlock.objects.filter(
-                        type=ProjectsContentBlock.IMAGE,
-                        media__isnull=False,
-                    )
-                    .exclude(media="")
-                    .order_by("order")
-                ),
-                to_attr="image_blocks",
-            )
-        )
+        queryset = queryset.prefetch_related(_project_image_blocks_prefetch())
 
     return queryset
 
 
+def _project_image_blocks_prefetch() -> Prefetch:
+    return Prefetch(
+        "blocks",
+        queryset=(
+            ProjectsContentBlock.objects.filter(
+                type=ProjectsContentBlock.IMAGE,
+                media__isnull=False,
+            )
+            .exclude(media="")
+            .order_by("order")
+        ),
+        to_attr="image_blocks",
+    )
+
+
 def _build_project_images(project: Projects) -> list[dict[str, str]]:
     image_blocks = getattr(project, "image_blocks", None)
     if image_blocks is None:
@@ -170,49 +182,124 @@ def _build_project_images(project: Projects) -> list[dict[str, str]]:
     return images
 
 
+# Keys of a list API card, in response order. `images` and `category` are opt-in.
+_PROJECT_CARD_BUILDERS = {
+    "id": lambda project: project.id,
+    "title": lambda project: project.title,
+    "slug": lambda project: project.slug,
+    "customer_name": lambda project: project.customer_name,
+    "year": lambda project: project.year,
+    "type": lambda project: project.type,
+    "category_title": lambda project: _normalize_text(getattr(project.category, "title", "")),
+    "preview": lambda project: project.preview_image or None,
+    "preview_image_alt": lambda project: _normalize_text(project.preview_image_alt),
+    "excerpt": lambda project: _normalize_text(project.excerpt) or _normalize_text(project.seo_description),
+    "url": lambda project: build_public_project_path(project.slug),
+    "images": _build_project_images,
+    "category": lambda project: {
+        "id": project.category_id,
+        "title": project.category.title,
+        "slug": project.category.slug,
+    },
+}
+PROJECT_CARD_FIELDS = tuple(_PROJECT_CARD_BUILDERS)
+PROJECT_CARD_KEYS = PROJECT_CARD_FIELDS[: PROJECT_CARD_FIELDS.index("images")]
+PROJECT_CARD_INCLUDES = ("images", "category")
+PROJECT_CARD_COLUMNS_BY_KEY = {
+    "category_title": ("category__title",),
+    "preview": ("preview_image",),
+    "excerpt": ("excerpt", "seo_description"),
+    "url": ("slug",),
+    "images": ("title",),
+    "category": ("category__title", "category__slug"),
+}
+
+
 def build_project_card_payload(
     project: Projects,
     *,
     include_images: bool = False,
+    keys: tuple[str, ...] | None = None,
 ) -> dict[str, object]:
-    payload: dict[str, object] = {
-        "id": project.id,
-        "title": project.title,
-        "slug": project.slug,
-        "customer_name": project.customer_name,
-        "year": project.year,
-        "type": project.type,
-        "category_title": _normalize_text(getattr(project.category, "title", "")),
-        "preview": project.preview_image or None,
-        "preview_image_alt": _normalize_text(project.preview_image_alt),
-        "excerpt": _normalize_text(project.excerpt) or _normalize_text(project.seo_description),
-        "url": build_public_project_path(project.slug),
-    }
+    if keys is None:
+        keys = PROJECT_CARD_KEYS + (("images",) if include_images else ())
+    return {key: _PROJECT_CARD_BUILDERS[key](project) for key in keys}
 
-    if include_images:
-        payload["images"] = _build_project_images(project)
 
-    return payload
+def serialize_project_card(project: Projects) -> tuple[str, str]:
+    """The list API card and its image list, serialized separately so `images` stays opt-in."""
+    return (
+        dump_json_fragment(build_project_card_payload(project)),
+        dump_json_fragment(_build_project_images(project)),
+    )
 
 
-def build_paginated_projects_payload(
-    projects_page,
-    *,
-    page_key: str = "current_page",
-    include_images: bool = False,
-) -> dict[str, object]:
-    has_next_page = projects_page.has_next()
+def refresh_project_cards(project_ids=None) -> int:
+    """Re-serialize the list cards of `project_ids` (all projects when None) with one prefetch."""
+    queryset = (
+        Projects.objects.select_related("category")
+        .prefetch_related(_project_image_blocks_prefetch())
+        .order_by("pk")
+    )
+    if project_ids is not None:
+        queryset = queryset.filter(pk__in=list(project_ids))
 
-    return {
-        page_key: projects_page.number,
-        "has_next": has_next_page,
-        "has_previous": projects_page.has_previous(),
-        "next_page": projects_page.next_page_number() if has_next_page else None,
-        "data": [
-            build_project_card_payload(project, include_images=include_images)
-            for project in projects_page
-        ],
-    }
+    projects = list(queryset)
+    for project in projects:
+        project.card_json, project.card_images_json = serialize_project_card(project)
+    Projects.objects.bulk_update(projects, ["card_json", "card_images_json"], batch_size=500)
+    return len(projects)
+
+
+def get_published_project_cards_queryset(*, category_slug: str | None = None) -> QuerySet[Projects]:
+    return (
+        get_published_projects_queryset(category_slug=category_slug)
+        .select_related(None)
+        .only(*PROJECT_CARD_COLUMNS)
+    )
+
+
+def get_published_sparse_projects_queryset(
+    keys: tuple[str, ...],
+    *,
+    category_slug: str | None = None,
+) -> QuerySet[Projects]:
+    """Published projects loaded with just the columns (and prefetches) the card `keys` need."""
+    columns = build_only_columns(
+        keys,
+        PROJECT_CARD_COLUMNS_BY_KEY,
+        always=tuple(field.lstrip("-") for field in PROJECTS_KEYSET_ORDERING),
+    )
+    queryset = get_published_projects_queryset(category_slug=category_slug, include_images="images" in keys)
+    if not any(column.startswith("category__") for column in columns):
+        queryset = queryset.select_related(None)
+    return queryset.only(*columns)
+
+
+def get_project_card_fragments(projects, *, include_images: bool = False) -> list[str]:
+    """
+    Serialized cards of `projects`, loaded with `PROJECT_CARD_COLUMNS` only.
+
+    Rows saved before cards were materialized are built in one extra query.
+    """
+    projects = list(projects)
+    missing_ids = [project.pk for project in projects if not project.card_json]
+    built_cards = {}
+    if missing_ids:
+        queryset = Projects.objects.select_related("category").prefetch_related(_project_image_blocks_prefetch())
+        for project in queryset.filter(pk__in=missing_ids):
+            built_cards[project.pk] = serialize_project_card(project)
+
+    fragments = []
+    for project in projects:
+        if project.card_json:
+            card_json, images_json = project.card_json, project.card_images_json or "[]"
+        elif project.pk in built_cards:
+            card_json, images_json = built_cards[project.pk]
+        else:
+            continue
+        fragments.append(extend_json_object(card_json, "images", images_json) if include_images else card_json)
+    return fragments
 
 
 def _is_visible_project(project: Projects) -> bool:
@@ -453,19 +540,46 @@ def _build_projects_collection_json_ld(
     return mark_safe(json.dumps(payload, ensure_ascii=False))
 
 
+def get_project_categories() -> list[ProjectCategories]:
+    """Categories in listing order, as the category tabs of the listing pages show them."""
+    return list(ProjectCategories.objects.order_by("-created_at", "title"))
+
+
+def get_project_categories_with_counts() -> list[ProjectCategories]:
+    """
+    Categories in listing order, in one query, each annotated with
+    `published_projects_count` and `projects_updated_at` of the projects the
+    public listing shows (published and indexable).
+
+    The join over all projects is only worth it for `include=counts`; the
+    listing pages do not show the counts and use `get_project_categories()`.
+    """
+    listed = Q(projects__is_published=True) & ~Q(projects__seo_robots__icontains="noindex")
+    return list(
+        ProjectCategories.objects.annotate(
+            published_projects_count=Count("projects", filter=listed),
+            projects_updated_at=Max("projects__updated_at", filter=listed),
+        ).order_by("-created_at", "title")
+    )
+
+
 def build_projects_listing_context(
     *,
     active_category: ProjectCategories | None = None,
     page_size: int = PROJECTS_LISTING_PAGE_SIZE,
+    categories: list[ProjectCategories] | None = None,
 ) -> dict[str, object]:
-    categories = list(ProjectCategories.objects.order_by("-created_at", "title"))
-    projects_page = Paginator(
+    if categories is None:
+        categories = get_project_categories()
+    projects_page = paginate_by_keyset(
         get_published_projects_queryset(
             category_slug=active_category.slug if active_category else None,
             include_images=False,
         ),
-        page_size,
-    ).get_page(1)
+        PROJECTS_KEYSET_ORDERING,
+        cursor=None,
+        limit=page_size,
+    )
     projects = [build_project_card_payload(project) for project in projects_page.object_list]
 
     if active_category is None:
@@ -521,13 +635,13 @@ def build_projects_listing_context(
         for category in categories
     )
 
-    has_next_page = projects_page.has_next()
     initial_feed = {
         "endpoint": api_endpoint,
         "page_size": page_size,
-        "current_page": projects_page.number,
-        "next_page": projects_page.next_page_number() if has_next_page else "",
-        "has_next": has_next_page,
+        "current_page": 1,
+        "next_page": 2 if projects_page.has_next else "",
+        "next_cursor": projects_page.next_cursor or "",
+        "has_next": projects_page.has_next,
     }
 
     page_image = projects[0]["preview"] if projects else "/images/projects/projects.png"
@@ -570,17 +684,6 @@ def build_projects_listing_context(
     }
 
 
-def _write_text_atomically(target_path: Path, content: str) -> None:
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with NamedTemporaryFile("w", encoding="utf-8", dir=target_path.parent, delete=False) as temp_file:
-        temp_file.write(content)
-        temp_path = Path(temp_file.name)
-
-    temp_path.replace(target_path)
-    os.chmod(target_path, 0o644)
-
-
 def _get_projects_listing_output_path() -> Path:
     return get_generated_pages_root() / "projects" / "index.html"
 
@@ -593,18 +696,22 @@ def build_projects_listing_static_html(
     *,
     active_category: ProjectCategories | None = None,
     sync_partials: bool = True,
+    categories: list[ProjectCategories] | None = None,
 ) -> Path:
     if sync_partials:
         sync_frontend_partials_if_configured()
 
-    context = build_projects_listing_context(active_category=active_category)
-    html_content = render_to_string("projects_listing.html", context)
+    context = build_projects_listing_context(active_category=active_category, categories=categories)
+    html_content = render_generation_template("projects_listing.html", context)
     output_path = (
         _get_project_category_output_path(active_category.slug)
         if active_category is not None
         else _get_projects_listing_output_path()
     )
-    _write_text_atomically(output_path, html_content)
+    write_text_atomically(output_path, html_content)
+    record_page_fingerprints(
+        {build_generated_page_path(output_path, get_generated_pages_root()): fingerprint_page_html(html_content)}
+    )
     return output_path
 
 
@@ -615,6 +722,7 @@ def delete_project_category_listing_static_html(slug: str) -> None:
 
     if output_path.exists():
         output_path.unlink()
+    forget_page_fingerprints([build_public_project_category_path(slug)])
 
     if category_dir.exists() and not any(category_dir.iterdir()):
         category_dir.rmdir()
@@ -629,12 +737,15 @@ def prune_stale_project_category_listing_pages(valid_slugs: list[str] | set[str]
         return
 
     valid_slug_set = {slug for slug in valid_slugs if slug}
+    stale_paths = []
     for path in category_root.iterdir():
         if not path.is_dir():
             continue
         if path.name in valid_slug_set:
             continue
         shutil.rmtree(path, ignore_errors=True)
+        stale_paths.append(build_public_project_category_path(path.name))
+    forget_page_fingerprints(stale_paths)
 
     if category_root.exists() and not any(category_root.iterdir()):
         category_root.rmdir()
@@ -648,15 +759,18 @@ def rebuild_projects_listing_static_html(
 ) -> list[Path]:
     sync_frontend_partials_if_configured()
 
-    written_paths = [build_projects_listing_static_html(sync_partials=False)]
+    # Every page lists all categories: read them once for the whole rebuild.
+    categories = get_project_categories()
+    categories_by_slug = {category.slug: category for category in categories}
+    written_paths = [build_projects_listing_static_html(sync_partials=False, categories=categories)]
 
     if category_slugs is None:
-        categories = list(ProjectCategories.objects.order_by("-created_at", "title"))
         for category in categories:
             written_paths.append(
                 build_projects_listing_static_html(
                     active_category=category,
                     sync_partials=False,
+                    categories=categories,
                 )
             )
 
@@ -667,7 +781,7 @@ def rebuild_projects_listing_static_html(
 
     normalized_category_slugs = sorted({slug for slug in category_slugs if slug})
     for slug in normalized_category_slugs:
-        category = ProjectCategories.objects.filter(slug=slug).first()
+        category = categories_by_slug.get(slug)
         if category is None:
             delete_project_category_listing_static_html(slug)
             continue
@@ -676,11 +790,12 @@ def rebuild_projects_listing_static_html(
             build_projects_listing_static_html(
                 active_category=category,
                 sync_partials=False,
+                categories=categories,
             )
         )
 
     for slug in {slug for slug in stale_category_slugs if slug}:
-        if ProjectCategories.objects.filter(slug=slug).exists():
+        if slug in categories_by_slug:
             continue
         delete_project_category_listing_static_html(slug)
 
@@ -1,10 +1,15 @@
 ﻿import json
 
 from django.conf import settings
+from django.db.models import Prefetch
 from django.utils.safestring import mark_safe
 
 from blog.services.article_rendering import build_share_links
 from blog.services.rich_text import sanitize_rich_body_html
+from core.services.resource_hints import build_page_resource_hints, get_media_preview_url
+from core.services.sparse_fields import build_only_columns
+
+from ..models import Projects, ProjectsContentBlock
 
 
 def build_public_project_path(slug: str) -> str:
@@ -25,11 +30,19 @@ def _normalize_text(value: str) -> str:
     return value.strip()
 
 
+def _get_ordered_blocks(project):
+    # Batch lookups prefetch the blocks already ordered; a single project queries them.
+    ordered_blocks = getattr(project, "ordered_blocks", None)
+    if ordered_blocks is None:
+        ordered_blocks = project.blocks.all().order_by("order")
+    return ordered_blocks
+
+
 def _build_project_media(project):
     media_list = []
     has_video = False
 
-    for block in project.blocks.all().order_by("order"):
+    for block in _get_ordered_blocks(project):
         if block.type == "image" and block.media:
             media_list.append(
                 {
@@ -72,7 +85,8 @@ def _split_feature_media(media_list):
 
 def _build_related_projects(project, limit=6):
     same_category = (
-        project.__class__.objects.filter(is_published=True, category_id=project.category_id)
+        Projects.objects.select_related("category")
+        .filter(is_published=True, category_id=project.category_id)
         .exclude(pk=project.pk)
         .order_by("-created_at")
     )
@@ -96,27 +110,139 @@ def _build_related_projects(project, limit=6):
     return payload
 
 
+def _build_project_seo(project) -> dict[str, str]:
+    seo_title = _normalize_text(project.seo_title) or project.title
+    seo_description = _normalize_text(project.seo_description) or _normalize_text(project.excerpt) or project.title
+    og_image = project.preview_image or ""
+    og_image_alt = _normalize_text(project.preview_image_alt) or project.title
+
+    return {
+        "title": seo_title,
+        "description": seo_description,
+        "keywords": _normalize_text(project.seo_keywords),
+        "robots": _normalize_text(project.seo_robots) or "index,follow",
+        "canonical": _normalize_text(project.canonical_url) or build_public_project_url(project.slug),
+        "og_title": seo_title,
+        "og_description": seo_description,
+        "og_image": og_image,
+        "og_image_alt": og_image_alt,
+        "twitter_card": "summary_large_image" if og_image else "summary",
+        "twitter_title": seo_title,
+        "twitter_description": seo_description,
+        "twitter_image": og_image,
+        "twitter_image_alt": og_image_alt,
+    }
+
+
+def build_project_blocks_payload(project) -> list[dict[str, object]]:
+    blocks = []
+    for block in _get_ordered_blocks(project):
+        block_payload = {"type": block.type}
+        if block.type == "image":
+            block_payload["content"] = block.media if block.media else None
+            block_payload["media_alt"] = _normalize_text(block.media_alt)
+            block_payload["caption"] = _normalize_text(block.caption)
+        elif block.type == "video":
+            block_payload["content"] = block.media if block.media else None
+            block_payload["first_video_frame"] = block.first_video_frame if block.first_video_frame else None
+            block_payload["caption"] = _normalize_text(block.caption)
+        elif block.type in {"text", "heading"}:
+            block_payload["content"] = block.text
+        blocks.append(block_payload)
+    return blocks
+
+
+# Keys of the full project detail API, in response order, with what each one costs to build.
+_PROJECT_DETAIL_BUILDERS = {
+    "id": lambda project: project.id,
+    "slug": lambda project: project.slug,
+    "title": lambda project: project.title,
+    "category": lambda project: {
+        "id": project.category_id,
+        "title": project.category.title,
+        "slug": project.category.slug,
+    },
+    "customer_name": lambda project: project.customer_name,
+    "year": lambda project: project.year,
+    "type": lambda project: project.type,
+    "excerpt": lambda project: project.excerpt,
+    # Sanitized when the project is saved (see `projects.signals`).
+    "body_html": lambda project: project.body_html,
+    "preview_image": lambda project: project.preview_image,
+    "preview_image_alt": lambda project: project.preview_image_alt,
+    "seo": _build_project_seo,
+    "url": lambda project: build_public_project_url(project.slug),
+    "path": lambda project: build_public_project_path(project.slug),
+    "media": lambda project: _build_project_media(project)[0],
+    "share_links": lambda project: build_share_links(
+        build_public_project_url(project.slug),
+        _normalize_text(project.seo_title) or project.title,
+    ),
+    "blocks": build_project_blocks_payload,
+    "related": _build_related_projects,
+}
+PROJECT_DETAIL_INCLUDES = ("blocks", "related")
+PROJECT_DETAIL_KEYS = tuple(key for key in _PROJECT_DETAIL_BUILDERS if key not in PROJECT_DETAIL_INCLUDES)
+_SEO_COLUMNS = (
+    "title",
+    "slug",
+    "excerpt",
+    "preview_image",
+    "preview_image_alt",
+    "seo_title",
+    "seo_description",
+    "seo_keywords",
+    "seo_robots",
+    "canonical_url",
+)
+PROJECT_DETAIL_COLUMNS_BY_KEY = {
+    "category": ("category__title", "category__slug"),
+    "body_html": ("body_html",),
+    "seo": _SEO_COLUMNS,
+    "url": ("slug",),
+    "path": ("slug",),
+    "media": ("title",),
+    "share_links": ("slug", "seo_title", "title"),
+    "blocks": (),
+    "related": ("category",),
+}
+
+
+def get_project_detail_queryset(keys=PROJECT_DETAIL_KEYS):
+    """Projects loaded with what the detail API `keys` need: their columns, the category join, ordered blocks."""
+    queryset = Projects.objects.only(*build_only_columns(keys, PROJECT_DETAIL_COLUMNS_BY_KEY, always=("id", "slug")))
+    if "category" in keys:
+        queryset = queryset.select_related("category")
+    if "media" in keys or "blocks" in keys:
+        queryset = queryset.prefetch_related(
+            Prefetch("blocks", queryset=ProjectsContentBlock.objects.order_by("order"), to_attr="ordered_blocks")
+        )
+    return queryset
+
+
+def build_project_detail_payload(project, keys=PROJECT_DETAIL_KEYS) -> dict[str, object]:
+    """
+    The project detail API payload, without going through the page render context.
+
+    Only `keys` are built: SEO, media and share links can be left out with
+    `fields`, related projects are only queried when included.
+    """
+    return {key: _PROJECT_DETAIL_BUILDERS[key](project) for key in keys}
+
+
 def build_project_render_context(project):
     sanitized_body_html = sanitize_rich_body_html(getattr(project, "body_html", ""))
     media_list, has_video = _build_project_media(project)
     feature_media, gallery_media = _split_feature_media(media_list)
     related_projects = _build_related_projects(project)
+    resource_hints = build_page_resource_hints(
+        hero_image=get_media_preview_url(feature_media),
+        media_urls=[get_media_preview_url(item) for item in gallery_media],
+    )
 
     project_path = build_public_project_path(project.slug)
     project_url = build_public_project_url(project.slug)
-
-    seo_title = _normalize_text(project.seo_title) or project.title
-    seo_description = _normalize_text(project.seo_description) or _normalize_text(project.excerpt) or project.title
-    seo_keywords = _normalize_text(project.seo_keywords)
-    seo_robots = _normalize_text(project.seo_robots) or "index,follow"
-    canonical_url = _normalize_text(project.canonical_url) or project_url
-
-    og_title = seo_title
-    og_description = seo_description
-    og_image = project.preview_image or ""
-    og_image_alt = _normalize_text(project.preview_image_alt) or project.title
-
-    twitter_card = "summary_large_image" if og_image else "summary"
+    seo = _build_project_seo(project)
 
     project.body_html = mark_safe(sanitized_body_html)
     project.media = media_list
@@ -125,38 +251,22 @@ def build_project_render_context(project):
     project.has_video = has_video
     project.url = project_url
     project.path = project_path
-    project.share_links = build_share_links(project_url, seo_title)
-
-    project.seo = {
-        "title": seo_title,
-        "description": seo_description,
-        "keywords": seo_keywords,
-        "robots": seo_robots,
-        "canonical": canonical_url,
-        "og_title": og_title,
-        "og_description": og_description,
-        "og_image": og_image,
-        "og_image_alt": og_image_alt,
-        "twitter_card": twitter_card,
-        "twitter_title": og_title,
-        "twitter_description": og_description,
-        "twitter_image": og_image,
-        "twitter_image_alt": og_image_alt,
-    }
+    project.share_links = build_share_links(project_url, seo["title"])
+    project.seo = seo
 
     project_json_ld = {
         "@context": "https://schema.org",
         "@type": "CreativeWork",
-        "name": seo_title,
-        "description": seo_description,
+        "name": seo["title"],
+        "description": seo["description"],
         "url": project_url,
-        "mainEntityOfPage": canonical_url,
+        "mainEntityOfPage": seo["canonical"],
         "creator": {"@type": "Organization", "name": "Cultnova"},
-        "keywords": seo_keywords,
+        "keywords": seo["keywords"],
     }
 
-    if og_image:
-        project_json_ld["image"] = og_image
+    if seo["og_image"]:
+        project_json_ld["image"] = seo["og_image"]
 
     if getattr(project, "created_at", None):
         project_json_ld["dateCreated"] = project.created_at.isoformat()
@@ -166,5 +276,6 @@ def build_project_render_context(project):
     return {
         "project": project,
         "related_projects": related_projects,
+        "resource_hints": resource_hints,
         "project_json_ld": mark_safe(json.dumps(project_json_ld, ensure_ascii=False)),
     }
@@ -1,30 +1,17 @@
-from django.db import connections, transaction
+from django.db import connections
 from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
 from django.dispatch import receiver
-from django.utils import timezone
 
-from core.services.build_item_html import build_item_detail_static_html, delete_item_detail_static_html
-from core.services.sitemap import build_public_sitemaps
+from blog.services.rich_text import sanitize_rich_body_html
+from core.services.regeneration import regeneration_batch
+from core.services.response_cache import PROJECTS_CONTENT
 
 from .models import ProjectCategories, Projects, ProjectsContentBlock, ServicePageProjects
-from .services.project_listing import rebuild_projects_listing_static_html
 
 
-def _resolve_category_slug(category_id: int | None) -> str | None:
-    if not category_id:
-        return None
-    return ProjectCategories.objects.filter(pk=category_id).values_list("slug", flat=True).first()
-
-
-def _schedule_listing_rebuild(*, category_slugs=None, prune_stale=False):
-    def callback():
-        rebuild_projects_listing_static_html(
-            category_slugs=category_slugs,
-            prune_stale=prune_stale,
-        )
-        build_public_sitemaps()
-
-    transaction.on_commit(callback)
+def _schedule_listing_rebuild(*, prune_stale=False):
+    with regeneration_batch() as batch:
+        batch.add_all_project_listings(prune_stale=prune_stale)
 
 
 def _schedule_project_rebuild(
@@ -32,48 +19,22 @@ def _schedule_project_rebuild(
     *,
     previous_slug=None,
     previous_is_published=False,
-    previous_category_slug=None,
+    previous_category_id=None,
     force_delete=False,
 ):
-    current_category_slug = _resolve_category_slug(instance.category_id)
-    category_slugs = {
-        slug
-        for slug in (current_category_slug, previous_category_slug)
-        if slug
-    }
-
-    def callback():
+    with regeneration_batch() as batch:
         if previous_slug and previous_slug != instance.slug and previous_is_published:
-            delete_item_detail_static_html(instance, "projects", slug_override=previous_slug)
-
-        if force_delete or not instance.is_published:
-            delete_item_detail_static_html(instance, "projects")
-        else:
-            build_item_detail_static_html(instance, "project_detail.html", "projects")
-
-        rebuild_projects_listing_static_html(category_slugs=category_slugs)
-        build_public_sitemaps()
-
-    transaction.on_commit(callback)
-
-
-def _schedule_project_rebuild_by_id(project_id: int):
-    def callback():
-        project = Projects.objects.select_related("category").filter(pk=project_id).first()
-        if not project:
-            build_public_sitemaps()
-            return
+            batch.remove_project_page(instance, previous_slug)
 
-        if project.is_published:
-            build_item_detail_static_html(project, "project_detail.html", "projects")
+        if force_delete:
+            batch.remove_project_page(instance, category_ids=(instance.category_id,))
         else:
-            delete_item_detail_static_html(project, "projects")
+            batch.add_project(instance.pk, saved=True, category_ids=(previous_category_id,))
 
-        category_slugs = {_resolve_category_slug(project.category_id)} if project.category_id else set()
-        rebuild_projects_listing_static_html(category_slugs=category_slugs)
-        build_public_sitemaps()
 
-    transaction.on_commit(callback)
+def _schedule_project_touch(project_id: int):
+    with regeneration_batch() as batch:
+        batch.touch_project(project_id)
 
 
 @receiver(pre_save, sender=Projects)
@@ -81,29 +42,37 @@ def project_pre_save_handler(sender, instance, **kwargs):
     if not instance.pk:
         instance._previous_slug = None
         instance._previous_is_published = False
-        instance._previous_category_slug = None
+        instance._previous_category_id = None
         return
 
-    previous = sender.objects.filter(pk=instance.pk).values("slug", "is_published", "category__slug").first()
-    if not previous:
-        instance._previous_slug = None
-        instance._previous_is_published = False
-        instance._previous_category_slug = None
-        return
+    previous = instance.get_loaded_values()
+    if not set(Projects.TRACKED_FIELDS) <= previous.keys():
+        # Built by hand or loaded with deferred fields: ask the database.
+        previous = sender.objects.filter(pk=instance.pk).values("slug", "is_published", "category_id").first() or {}
 
-    instance._previous_slug = previous["slug"]
-    instance._previous_is_published = previous["is_published"]
-    instance._previous_category_slug = previous["category__slug"]
+    instance._previous_slug = previous.get("slug")
+    instance._previous_is_published = previous.get("is_published", False)
+    instance._previous_category_id = previous.get("category_id")
+
+
+@receiver(pre_save, sender=Projects)
+def project_body_sanitize_handler(sender, instance, update_fields=None, **kwargs):
+    # The detail API serves `body_html` as stored; the admin form already sanitizes, other writers may not.
+    if update_fields is None or "body_html" in update_fields:
+        instance.body_html = sanitize_rich_body_html(instance.body_html)
 
 
 @receiver(post_save, sender=Projects)
 def project_save_handler(sender, instance, **kwargs):
+    previous_category_id = getattr(instance, "_previous_category_id", None)
     _schedule_project_rebuild(
         instance,
         previous_slug=getattr(instance, "_previous_slug", None),
         previous_is_published=getattr(instance, "_previous_is_published", False),
-        previous_category_slug=getattr(instance, "_previous_category_slug", None),
+        # The current category slug comes with the project when the batch is flushed.
+        previous_category_id=previous_category_id if previous_category_id != instance.category_id else None,
     )
+    instance.remember_tracked_fields()
 
 
 @receiver(post_delete, sender=Projects)
@@ -112,27 +81,24 @@ def project_delete_handler(sender, instance, **kwargs):
         instance,
         previous_slug=instance.slug,
         previous_is_published=instance.is_published,
-        previous_category_slug=_resolve_category_slug(instance.category_id),
         force_delete=True,
     )
 
 
 @receiver(post_save, sender=ProjectsContentBlock)
 def project_block_save_handler(sender, instance, **kwargs):
-    project_id = instance.project_id
-    Projects.objects.filter(pk=project_id).update(updated_at=timezone.now())
-    _schedule_project_rebuild_by_id(project_id)
+    _schedule_project_touch(instance.project_id)
 
 
 @receiver(post_delete, sender=ProjectsContentBlock)
 def project_block_delete_handler(sender, instance, **kwargs):
     project_id = instance.project_id
     if not project_id:
-        transaction.on_commit(build_public_sitemaps)
+        with regeneration_batch() as batch:
+            batch.add_sitemaps()
         return
 
-    Projects.objects.filter(pk=project_id).update(updated_at=timezone.now())
-    _schedule_project_rebuild_by_id(project_id)
+    _schedule_project_touch(project_id)
 
 
 @receiver(post_save, sender=ProjectCategories)
@@ -145,6 +111,15 @@ def project_category_delete_handler(sender, instance, **kwargs):
     _schedule_listing_rebuild(prune_stale=True)
 
 
+@receiver([post_save, post_delete], sender=Projects)
+@receiver([post_save, post_delete], sender=ProjectsContentBlock)
+@receiver([post_save, post_delete], sender=ProjectCategories)
+@receiver([post_save, post_delete], sender=ServicePageProjects)
+def project_api_responses_handler(sender, using=None, **kwargs):
+    with regeneration_batch(using) as batch:
+        batch.add_api_content(PROJECTS_CONTENT)
+
+
 @receiver(post_migrate)
 def service_page_projects_post_migrate_handler(sender, **kwargs):
     if sender.name != "projects":
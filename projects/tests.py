@@ -1,18 +1,24 @@
 ﻿import tempfile
 from pathlib import Path
 from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
 from unittest.mock import patch
 import json
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import connection
 from django.db.migrations.executor import MigrationExecutor
 from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from core.services.batch_lookup import BATCH_MAX_SLUGS
+from core.services.keyset_pagination import encode_cursor
 from projects.models import ProjectCategories, Projects, ProjectsContentBlock, ServicePageProjects
 from projects.services.project_category_seo import (
     CURRENT_YEAR_TOKEN,
@@ -22,6 +28,9 @@ from projects.services.project_listing import (
     PROJECTS_LISTING_PAGE_SIZE,
     build_public_project_category_path,
     build_public_projects_path,
+    build_project_card_payload,
+    rebuild_projects_listing_static_html,
+    refresh_project_cards,
 )
 from projects.services.project_rendering import build_project_render_context
 
@@ -187,6 +196,43 @@ class ProjectRenderingTests(TestCase):
         self.assertTrue(context["related_projects"])
         self.assertIn("CreativeWork", context["project_json_ld"])
 
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_build_project_render_context_builds_resource_hints_for_feature_media(self):
+        project = Projects.objects.create(
+            title="Hinted Project",
+            slug="hinted-project",
+            category=self.category,
+            customer_name="Client",
+            year=2025,
+            type="Installation",
+            body_html="<p>Body</p>",
+            seo_title="SEO title",
+            seo_description="SEO description",
+            is_published=True,
+        )
+        ProjectsContentBlock.objects.create(
+            project=project,
+            type=ProjectsContentBlock.IMAGE,
+            order=1,
+            media="https://cdn.example.net/gallery.jpg",
+            media_alt="Gallery alt",
+        )
+        ProjectsContentBlock.objects.create(
+            project=project,
+            type=ProjectsContentBlock.VIDEO,
+            order=2,
+            media="https://media.example.net/video.mp4",
+            first_video_frame="https://media.example.net/poster.jpg",
+        )
+
+        resource_hints = build_project_render_context(project)["resource_hints"]
+
+        self.assertEqual(resource_hints["hero_preload"]["href"], "https://media.example.net/poster.jpg")
+        self.assertEqual(
+            resource_hints["preconnects"],
+            ["https://media.example.net", "https://cdn.example.net"],
+        )
+
 
 class ProjectDetailViewTests(TestCase):
     def test_project_detail_includes_lightbox_assets_and_keeps_video_player_assets(self):
@@ -230,6 +276,9 @@ class ProjectDetailViewTests(TestCase):
         self.assertContains(response, '/js/lightbox.js?v=2026-04-17-1')
         self.assertContains(response, '/js/video-player.js?v=2026-03-10-1')
         self.assertContains(response, 'data-page="project"')
+        self.assertContains(response, '<link rel="preconnect" href="https://example.com" />')
+        self.assertContains(response, 'href="https://example.com/poster.jpg"')
+        self.assertContains(response, 'fetchpriority="high"', count=2)
 
 
 class PublicStaticManifestTests(TestCase):
@@ -489,7 +538,7 @@ class ProjectsListingViewTests(TestCase):
         self.assertNotIn('href="https://example.com/delta.jpg"', html)
         self.assertIn('<script src="/js/script.js" defer></script>', html)
         self.assertIn('<script src="/vendor/htmx/htmx.min.js?v=2.0.4" defer></script>', html)
-        self.assertIn('<script src="/js/projects-listing.js?v=2026-04-16-1" defer></script>', html)
+        self.assertIn('<script src="/js/projects-listing.js?v=2026-10-19-1" defer></script>', html)
         self.assertIn("requestIdleCallback", html)
         self.assertIn("https://mc.yandex.ru/metrika/tag.js", html)
 
@@ -520,6 +569,78 @@ class ProjectsListingViewTests(TestCase):
         )
         self.assertContains(response, 'id="projectsEmpty"')
 
+    def test_categories_endpoint_includes_listed_project_counts_from_one_query(self):
+        Projects.objects.filter(pk=self.fourth_project.pk).update(seo_robots="noindex,follow")
+        Projects.objects.filter(pk=self.second_project.pk).update(is_published=False)
+
+        plain = self.client.get(reverse("projects:get_all_categories")).json()
+        # Validators and the annotated categories.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("projects:get_all_categories"), {"include": "counts"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = {item["slug"]: item for item in response.json()}
+        self.assertEqual(set(plain[0]), {"id", "title", "slug", "created_at"})
+        self.assertEqual(payload["museums"]["published_projects_count"], 1)
+        self.assertEqual(payload["education"]["published_projects_count"], 1)
+        self.assertEqual(payload["empty"]["published_projects_count"], 0)
+        self.assertIsNone(payload["empty"]["projects_updated_at"])
+        self.assertEqual(
+            payload["museums"]["projects_updated_at"],
+            DjangoJSONEncoder().default(Projects.objects.get(pk=self.first_project.pk).updated_at),
+        )
+
+        sparse = self.client.get(reverse("projects:get_all_categories"), {"fields": "slug", "include": "counts"}).json()
+        self.assertEqual(set(sparse[0]), {"slug", "published_projects_count", "projects_updated_at"})
+        aliased = self.client.get(reverse("projects:get_all_categories"), {"fields": "slug,counts"}).json()
+        self.assertEqual(aliased, sparse)
+
+    def test_static_first_listing_views_serve_generated_pages(self):
+        root_url = reverse("projects:projects_list")
+        category_url = reverse("projects:projects_category_list", kwargs={"slug": self.museums.slug})
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(
+            GENERATED_HTML_PAGES_PATH=temp_dir,
+            STATIC_FIRST_VIEWS_ENABLED=True,
+        ):
+            # Missing pages are rendered by the views; only the requested page is written after the response.
+            with (
+                patch("core.services.regeneration.request_sitemap_rebuild") as sitemap_rebuild_mock,
+                patch("core.services.regeneration.bump_content_versions") as bump_versions_mock,
+            ):
+                root_missed = self.client.get(root_url)
+                self.assertTrue((Path(temp_dir) / "projects" / "index.html").is_file())
+                self.assertFalse((Path(temp_dir) / "projects" / "category").exists())
+                category_missed = self.client.get(category_url)
+            sitemap_rebuild_mock.assert_not_called()
+            bump_versions_mock.assert_not_called()
+            root_response = self.client.get(root_url)
+            category_response = self.client.get(category_url)
+            with override_settings(STATIC_PAGES_ACCEL_REDIRECT_PREFIX="/_generated", API_RESPONSE_CACHE_ENABLED=True):
+                handed_off = self.client.get(root_url)
+                handed_off_again = self.client.get(root_url)
+
+            self.assertFalse(root_missed.streaming)
+            self.assertContains(category_missed, "Museum Alpha")
+            root_html = b"".join(root_response.streaming_content).decode("utf-8")
+            self.assertEqual(root_html, (Path(temp_dir) / "projects" / "index.html").read_text(encoding="utf-8"))
+            self.assertIn("Museum Alpha", b"".join(category_response.streaming_content).decode("utf-8"))
+            self.assertTrue((Path(temp_dir) / "projects" / "category" / "museums" / "index.html").is_file())
+            self.assertEqual(handed_off["X-Accel-Redirect"], "/_generated/projects/index.html")
+            # Empty hand-off bodies are never stored in the response cache.
+            self.assertEqual(handed_off_again["X-Response-Cache"], "miss")
+            self.assertEqual(handed_off_again["X-Accel-Redirect"], "/_generated/projects/index.html")
+
+    def test_listing_rebuild_reads_categories_once_for_all_pages(self):
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+            with CaptureQueriesContext(connection) as queries:
+                written_paths = rebuild_projects_listing_static_html()
+
+        self.assertEqual(len(written_paths), 4)
+        category_reads = [query for query in queries if query["sql"].startswith('SELECT "projects_projectcategories"')]
+        self.assertEqual(len(category_reads), 1)
+        # The listing pages do not show project counts: no aggregate join over all projects.
+        self.assertNotIn("COUNT(", category_reads[0]["sql"])
+
 
 class ProjectApiTests(TestCase):
     def setUp(self):
@@ -614,6 +735,9 @@ class ProjectApiTests(TestCase):
             caption="Video caption",
         )
 
+        refresh_project_cards()
+
+        # Validators, COUNT and the page of materialized cards: no prefetch, no join.
         with self.assertNumQueries(3):
             response = self.client.get(reverse("projects:get_all_projects"))
 
@@ -681,6 +805,134 @@ class ProjectApiTests(TestCase):
         self.assertEqual(len(payload_page_2["data"]), 1)
         self.assertEqual(payload_page_2["data"][0]["slug"], self.project.slug)
 
+    def test_all_projects_endpoint_cursor_mode_breaks_created_at_ties_by_id(self):
+        created_at = timezone.now() - timedelta(minutes=5)
+        extra_projects = [
+            Projects.objects.create(
+                title=f"Tied {index}",
+                slug=f"tied-project-{index}",
+                category=self.category,
+                customer_name="Client",
+                year=2025,
+                type="Type",
+                body_html="<p>Body</p>",
+                seo_title="SEO",
+                seo_description="SEO",
+                is_published=True,
+            )
+            for index in range(3)
+        ]
+        Projects.objects.filter(pk__in=[project.pk for project in extra_projects]).update(created_at=created_at)
+        Projects.objects.filter(pk=self.project.pk).update(created_at=created_at + timedelta(minutes=1))
+
+        slugs = []
+        cursor = ""
+        refresh_project_cards()
+
+        # Two pages of validators and one SELECT of materialized cards each: no COUNT query.
+        with self.assertNumQueries(4):
+            for _ in range(3):
+                response = self.client.get(reverse("projects:get_all_projects"), {"limit": 2, "cursor": cursor})
+                payload = response.json()
+                slugs.extend(entry["slug"] for entry in payload["data"])
+                cursor = payload["next_cursor"]
+                if not payload["has_next"]:
+                    break
+
+        self.assertEqual(
+            slugs,
+            [self.project.slug] + [project.slug for project in reversed(extra_projects)],
+        )
+        self.assertIsNone(cursor)
+        self.assertIn("images", payload["data"][0])
+
+    def test_projects_by_category_cursor_mode_rejects_malformed_cursor(self):
+        response = self.client.get(
+            reverse("projects:get_projects_by_category", kwargs={"slug": self.category.slug}),
+            {"cursor": "bm90LWpzb24"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_all_projects_endpoint_cursor_mode_rejects_badly_typed_cursor_values(self):
+        for cursor in (["2026-01-01T00:00:00+00:00", "abc"], [1, 2]):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse("projects:get_all_projects"), {"cursor": encode_cursor(cursor)})
+
+                self.assertEqual(response.status_code, 400)
+
+    def test_all_projects_endpoint_answers_matching_etag_with_304_in_one_query(self):
+        url = reverse("projects:get_all_projects")
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("max-age=60", response["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertIn("max-age=60", not_modified["Cache-Control"])
+
+        # Cards show the category title, so renaming the category is a change too.
+        self.category.title = "Museums and galleries"
+        self.category.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertEqual(changed.json()["data"][0]["category_title"], "Museums and galleries")
+
+        self.hidden_project.delete()
+        self.assertNotEqual(self.client.get(url)["ETag"], changed["ETag"])
+
+    def test_project_detail_etag_follows_the_project_not_the_table(self):
+        url = reverse("projects:get_project_detail_full", kwargs={"slug": self.project.slug})
+        etag = self.client.get(url)["ETag"]
+
+        self.hidden_project.title = "Renamed elsewhere"
+        self.hidden_project.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Related projects come from the whole table, so they are validated against it.
+        self.assertNotEqual(self.client.get(url, {"include": "related"})["ETag"], etag)
+
+        self.project.title = "Renamed"
+        self.project.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["title"], "Renamed")
+
+    def test_project_page_etag_changes_when_a_project_of_its_category_is_published(self):
+        url = reverse("projects:project_detail", kwargs={"slug": self.project.slug})
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.hidden_project.is_published = True
+        self.hidden_project.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertContains(changed, "Hidden")
+
+        # Projects of other categories are not listed on the page.
+        other_category = ProjectCategories.objects.create(title="Parks", slug="parks")
+        Projects.objects.create(
+            title="Elsewhere",
+            slug="elsewhere-project",
+            category=other_category,
+            customer_name="Client",
+            year=2025,
+            type="Type",
+            is_published=True,
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=changed["ETag"]).status_code, 304)
+
     def test_projects_by_category_filters_unpublished_and_returns_string_preview(self):
         Projects.objects.create(
             title="Category Noindex",
@@ -797,6 +1049,202 @@ class ProjectApiTests(TestCase):
         self.assertIn("body_html", payload)
         self.assertIn("seo", payload)
 
+    def test_project_full_detail_endpoint_matches_render_context(self):
+        response = self.client.get(f"/api/projects/detail/{self.project.slug}/full")
+
+        rendered_project = build_project_render_context(Projects.objects.get(pk=self.project.pk))["project"]
+        payload = response.json()
+        self.assertEqual(
+            list(payload),
+            [
+                "id", "slug", "title", "category", "customer_name", "year", "type", "excerpt", "body_html",
+                "preview_image", "preview_image_alt", "seo", "url", "path", "media", "share_links",
+            ],
+        )
+        self.assertEqual(payload["category"], {"id": self.category.id, "title": "Museums", "slug": "museums"})
+        self.assertEqual(payload["body_html"], str(rendered_project.body_html))
+        self.assertEqual(payload["seo"], rendered_project.seo)
+        self.assertEqual(payload["media"], rendered_project.media)
+        self.assertEqual(payload["share_links"], rendered_project.share_links)
+        self.assertEqual(payload["url"], rendered_project.url)
+
+    def test_project_full_detail_endpoint_builds_only_requested_fields(self):
+        # Validators and one narrow row: no blocks query for media, no category join.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/projects/detail/{self.project.slug}/full?fields=slug,title,seo")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(list(payload), ["slug", "title", "seo"])
+        self.assertEqual(payload["seo"]["title"], "SEO")
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("body_html", queries[1]["sql"])
+        self.assertNotIn("projects_projectcategories", queries[1]["sql"])
+
+    def test_project_full_detail_endpoint_includes_blocks_on_request(self):
+        response = self.client.get(f"/api/projects/detail/{self.project.slug}/full?fields=id&include=blocks")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": self.project.id,
+                "blocks": [
+                    {"type": "image", "content": "https://example.com/image.jpg", "media_alt": "Alt", "caption": "Caption"}
+                ],
+            },
+        )
+
+    def test_project_body_is_sanitized_on_save_and_served_as_stored(self):
+        self.project.body_html = "<p>Body</p><script>alert(1)</script>"
+        self.project.save()
+        self.assertEqual(Projects.objects.get(pk=self.project.pk).body_html, "<p>Body</p>")
+
+        with patch("blog.services.rich_text.nh3.clean") as clean_mock:
+            response = self.client.get(f"/api/projects/detail/{self.project.slug}/full", {"fields": "body_html"})
+
+        clean_mock.assert_not_called()
+        self.assertEqual(response.json(), {"body_html": "<p>Body</p>"})
+
+    def test_project_full_detail_endpoint_includes_related_projects_on_request(self):
+        for index in range(3):
+            Projects.objects.create(
+                title=f"Related {index}",
+                slug=f"related-{index}",
+                category=self.category,
+                customer_name="Client",
+                year=2025,
+                type="Type",
+                body_html="<p>Body</p>",
+                is_published=True,
+            )
+
+        default_payload = self.client.get(f"/api/projects/detail/{self.project.slug}/full").json()
+        # Validators, the project and the related projects with their categories.
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                f"/api/projects/detail/{self.project.slug}/full",
+                {"fields": "slug", "include": "related"},
+            )
+
+        self.assertNotIn("related", default_payload)
+        related = response.json()["related"]
+        self.assertEqual([item["slug"] for item in related], ["related-2", "related-1", "related-0"])
+        self.assertEqual({item["category_title"] for item in related}, {"Museums"})
+
+    def test_benchmark_project_detail_api_reports_parity(self):
+        stdout = StringIO()
+        call_command("benchmark_project_detail_api", "--iterations", "1", "--limit", "1", stdout=stdout)
+
+        self.assertIn(f"project {self.project.slug} (parity: ok)", stdout.getvalue())
+
+    def test_project_full_detail_endpoint_rejects_unknown_fields(self):
+        response = self.client.get(f"/api/projects/detail/{self.project.slug}/full?fields=slug,password")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Unknown fields: password."})
+
+    def test_all_projects_endpoint_returns_sparse_cards_with_included_category(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("projects:get_all_projects"),
+                {"fields": "slug,title", "include": "category", "cursor": ""},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"],
+            [
+                {
+                    "title": "Visible",
+                    "slug": "visible-project",
+                    "category": {"id": self.category.id, "title": "Museums", "slug": "museums"},
+                }
+            ],
+        )
+        # Validators and the page; `fields` without `images` drops the image prefetch.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("card_json", queries[1]["sql"])
+        self.assertNotIn("body_html", queries[1]["sql"])
+
+    def test_projects_by_category_endpoint_includes_images_on_request(self):
+        response = self.client.get(
+            reverse("projects:get_projects_by_category", kwargs={"slug": self.category.slug}),
+            {"include": "images"},
+        )
+
+        item = response.json()["data"][0]
+        self.assertEqual(item["images"], [{"url": "https://example.com/image.jpg", "alt": "Alt"}])
+        self.assertEqual(item["category_title"], "Museums")
+
+    def test_projects_list_endpoints_reject_unknown_fields_and_includes(self):
+        fields_response = self.client.get(reverse("projects:get_all_projects"), {"fields": "slug,body_html"})
+        include_response = self.client.get(reverse("projects:get_all_projects"), {"include": "blocks"})
+
+        self.assertEqual(fields_response.status_code, 400)
+        self.assertEqual(fields_response.json(), {"error": "Unknown fields: body_html."})
+        self.assertEqual(include_response.status_code, 400)
+        self.assertEqual(include_response.json(), {"error": "Unknown include: blocks."})
+
+    def test_projects_batch_endpoint_keeps_requested_order_and_reports_missing_slugs(self):
+        second = Projects.objects.create(
+            title="Second",
+            slug="second-project",
+            category=self.category,
+            customer_name="Client",
+            year=2024,
+            type="Type",
+            body_html="<p>Second</p>",
+            is_published=True,
+        )
+        ProjectsContentBlock.objects.create(
+            project=second,
+            type=ProjectsContentBlock.IMAGE,
+            order=1,
+            media="https://example.com/second.jpg",
+            media_alt="Second alt",
+        )
+        slugs = f"{second.slug},unknown-project,{self.hidden_project.slug},{self.project.slug},{second.slug}"
+
+        # Validators, the projects with their categories, and the blocks of all of them.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("projects:get_projects_batch"), {"slugs": slugs})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual([item["slug"] for item in payload["data"]], [second.slug, self.project.slug])
+        self.assertEqual(payload["missing"], ["unknown-project", self.hidden_project.slug])
+        self.assertEqual(
+            payload["data"][0],
+            self.client.get(f"/api/projects/detail/{second.slug}/full").json(),
+        )
+        self.assertEqual(payload["data"][1]["media"][0]["url"], "https://example.com/image.jpg")
+
+    def test_projects_batch_endpoint_accepts_fields_and_validates_slugs(self):
+        sparse = self.client.get(
+            reverse("projects:get_projects_batch"),
+            {"slugs": self.project.slug, "fields": "title"},
+        )
+        empty = self.client.get(reverse("projects:get_projects_batch"), {"slugs": " , "})
+        too_many = self.client.get(
+            reverse("projects:get_projects_batch"),
+            {"slugs": ",".join(f"project-{index}" for index in range(BATCH_MAX_SLUGS + 1))},
+        )
+
+        self.assertEqual(sparse.json(), {"missing": [], "data": [{"title": "Visible"}]})
+        self.assertEqual(empty.status_code, 400)
+        self.assertEqual(too_many.status_code, 400)
+        self.assertEqual(too_many.json(), {"error": f"At most {BATCH_MAX_SLUGS} slugs per request."})
+
+    def test_category_slug_batch_reaches_the_category_projects_endpoint(self):
+        self.category.slug = "batch"
+        self.category.save()
+
+        response = self.client.get("/api/projects/batch")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["slug"] for item in response.json()["data"]], [self.project.slug])
+
     def test_project_html_detail_route_available(self):
         response = self.client.get(f"/projects/{self.project.slug}/")
 
@@ -864,6 +1312,102 @@ class ProjectAdminInlineImageUploadTests(TestCase):
         upload_mock.assert_called_once()
 
 
+class ProjectBulkActionsAdminTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            username="bulk-admin",
+            email="bulk-admin@example.com",
+            password="password123",
+        )
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            override_settings(GENERATED_HTML_PAGES_PATH=temp_dir),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.category = ProjectCategories.objects.create(title="Museums", slug="museums")
+            self.other_category = ProjectCategories.objects.create(title="Parks", slug="parks")
+            self.projects = [
+                Projects.objects.create(
+                    title=f"Bulk Project {index}",
+                    slug=f"bulk-project-{index}",
+                    category=self.category,
+                    customer_name="Client",
+                    year=2025,
+                    type="Type",
+                    body_html="<p>Body</p>",
+                    seo_title="SEO",
+                    seo_description="SEO",
+                )
+                for index in range(3)
+            ]
+        self.changelist_url = reverse("admin:projects_projects_changelist")
+        self.client.force_login(self.user)
+
+    def _post_action(self, action, **extra):
+        return self.client.post(
+            self.changelist_url,
+            {
+                "action": action,
+                "_selected_action": [project.pk for project in self.projects],
+                **extra,
+            },
+        )
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_publish_action_updates_rows_and_regenerates_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                with (
+                    patch(
+                        "core.services.regeneration.rebuild_projects_listing_static_html",
+                    ) as listing_mock,
+                    patch("core.services.regeneration.request_sitemap_rebuild") as sitemaps_mock,
+                ):
+                    with self.captureOnCommitCallbacks(execute=True):
+                        response = self._post_action("publish_selected")
+
+                self.assertEqual(response.status_code, 302)
+                self.assertEqual(Projects.objects.filter(is_published=True).count(), 3)
+                for project in self.projects:
+                    self.assertTrue((Path(temp_dir) / "projects" / project.slug / "index.html").exists())
+                listing_mock.assert_called_once_with(category_slugs={"museums"})
+                sitemaps_mock.assert_called_once_with(
+                    {
+                        "/projects/",
+                        "/projects/category/museums/",
+                        "/projects/bulk-project-0/",
+                        "/projects/bulk-project-1/",
+                        "/projects/bulk-project-2/",
+                    }
+                )
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    self._post_action("unpublish_selected")
+
+                self.assertFalse(Projects.objects.filter(is_published=True).exists())
+                self.assertFalse((Path(temp_dir) / "projects" / "bulk-project-0" / "index.html").exists())
+
+    def test_move_to_category_action_asks_for_category_then_moves_projects(self):
+        response = self._post_action("move_to_category")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Move projects to category")
+        self.assertFalse(Projects.objects.filter(category=self.other_category).exists())
+
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            override_settings(GENERATED_HTML_PAGES_PATH=temp_dir),
+            patch("core.services.regeneration.rebuild_projects_listing_static_html") as listing_mock,
+            patch("core.services.regeneration.request_sitemap_rebuild"),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self._post_action("move_to_category", apply="Move", category=self.other_category.pk)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Projects.objects.filter(category=self.other_category).count(), 3)
+        listing_mock.assert_called_once_with(category_slugs={"museums", "parks"})
+
+
 class ProjectCategoryAdminTests(TestCase):
     def setUp(self):
         self.user = get_user_model().objects.create_superuser(
@@ -1143,6 +1687,80 @@ class ProjectStaticGenerationSignalTests(TestCase):
                 self.assertIn(project.updated_at.isoformat(timespec="seconds"), sitemap)
                 self.assertIn("/projects/updated-project/", sitemap)
 
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_block_saves_in_one_transaction_regenerate_project_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                category = ProjectCategories.objects.create(title="Cat", slug="cat")
+                with self.captureOnCommitCallbacks(execute=True):
+                    project = Projects.objects.create(
+                        title="Batched Project",
+                        slug="batched-project",
+                        category=category,
+                        customer_name="Client",
+                        year=2025,
+                        type="Type",
+                        body_html="<p>Body</p>",
+                        seo_title="SEO",
+                        seo_description="SEO",
+                        is_published=True,
+                    )
+
+                with (
+                    patch("core.services.regeneration.build_items_detail_static_html") as build_mock,
+                    patch("core.services.regeneration.rebuild_projects_listing_static_html") as listing_mock,
+                    patch("core.services.regeneration.request_sitemap_rebuild") as sitemaps_mock,
+                ):
+                    with self.captureOnCommitCallbacks(execute=True):
+                        project.save()
+                        for order in range(1, 6):
+                            ProjectsContentBlock.objects.create(
+                                project=project,
+                                type=ProjectsContentBlock.IMAGE,
+                                order=order,
+                                media=f"https://example.com/image-{order}.jpg",
+                                media_alt="Image alt",
+                            )
+
+                build_mock.assert_called_once()
+                listing_mock.assert_called_once_with(category_slugs={"cat"})
+                sitemaps_mock.assert_called_once_with(
+                    {"/projects/", "/projects/category/cat/", "/projects/batched-project/"}
+                )
+
+    def test_project_and_block_saves_run_no_extra_queries(self):
+        category = ProjectCategories.objects.create(title="Cat", slug="cat")
+        other_category = ProjectCategories.objects.create(title="Other", slug="other")
+        Projects.objects.create(
+            title="Query Project",
+            slug="query-project",
+            category=category,
+            customer_name="Client",
+            year=2025,
+            type="Type",
+            seo_title="SEO",
+            seo_description="SEO",
+        )
+        project = Projects.objects.select_related("category").get(slug="query-project")
+
+        with self.captureOnCommitCallbacks():
+            with self.assertNumQueries(1):
+                project.category = other_category
+                project.is_published = True
+                project.save()
+            with self.assertNumQueries(3):
+                for order in range(1, 4):
+                    ProjectsContentBlock.objects.create(
+                        project=project,
+                        type=ProjectsContentBlock.TEXT,
+                        order=order,
+                        text="Text",
+                    )
+
+        self.assertEqual(project._previous_category_id, category.pk)
+        self.assertFalse(project._previous_is_published)
+        self.assertEqual(project.get_loaded_values()["category_id"], other_category.pk)
+
     @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
     def test_category_slug_change_rebuilds_category_page(self):
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -1284,3 +1902,50 @@ class ProjectStaticGenerationSignalTests(TestCase):
 
                 self.assertNotIn("Moved Project", old_category_page.read_text(encoding="utf-8"))
                 self.assertIn("Moved Project", new_category_page.read_text(encoding="utf-8"))
+
+    @override_settings(SITE_PUBLIC_BASE_URL="https://example.com")
+    def test_saved_project_card_is_materialized_and_follows_blocks_and_category_title(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GENERATED_HTML_PAGES_PATH=temp_dir):
+                category = ProjectCategories.objects.create(title="Museums", slug="museums")
+                with self.captureOnCommitCallbacks(execute=True):
+                    project = Projects.objects.create(
+                        title="Card Project",
+                        slug="card-project",
+                        category=category,
+                        customer_name="Client",
+                        year=2025,
+                        type="Type",
+                        body_html="<p>Body</p>",
+                        excerpt="Excerpt",
+                        seo_title="SEO",
+                        seo_description="SEO",
+                        is_published=True,
+                    )
+                with self.captureOnCommitCallbacks(execute=True):
+                    ProjectsContentBlock.objects.create(
+                        project=project,
+                        type=ProjectsContentBlock.IMAGE,
+                        order=1,
+                        media="https://example.com/card.jpg",
+                        media_alt="Card alt",
+                    )
+
+                project.refresh_from_db()
+                self.assertEqual(json.loads(project.card_json), build_project_card_payload(project))
+                self.assertEqual(
+                    json.loads(project.card_images_json),
+                    [{"url": "https://example.com/card.jpg", "alt": "Card alt"}],
+                )
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    category.title = "Galleries"
+                    category.save()
+
+                payload = self.client.get(reverse("projects:get_all_projects")).json()
+                self.assertEqual(payload["data"][0]["category_title"], "Galleries")
+                self.assertEqual(payload["data"][0]["images"], [{"url": "https://example.com/card.jpg", "alt": "Card alt"}])
+                self.assertEqual(
+                    json.loads(Projects.objects.get(pk=project.pk).card_json)["category_title"],
+                    "Galleries",
+                )
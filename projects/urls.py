@@ -8,6 +8,7 @@ app_name = "projects"
 urlpatterns = [
     path("api/projects/categories", views.get_all_categories, name="get_all_categories"),
     path("api/projects/", views.get_all_projects, name="get_all_projects"),
+    path("api/batch/projects/", views.get_projects_batch, name="get_projects_batch"),
     path(
         "api/projects/service-page/<slug:slug>/",
         views.get_service_page_projects,
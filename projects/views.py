@@ -1,16 +1,52 @@
 from django.core.paginator import Paginator
+from django.db.models import Count, Max
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 
+from core.services.batch_lookup import InvalidBatchError, order_by_slugs, parse_batch_slugs
+from core.services.build_item_html import build_item_detail_static_html
+from core.services.conditional_get import (
+    DETAIL_CACHE_CONTROL,
+    LIST_CACHE_CONTROL,
+    build_content_validators,
+    conditional_content,
+)
+from core.services.json_fragments import build_json_list_response, dump_json_fragment
+from core.services.keyset_pagination import InvalidCursorError, paginate_by_keyset
+from core.services.response_cache import PROJECTS_CONTENT, cached_response
+from core.services.sparse_fields import InvalidFieldsError, select_fields
+from core.services.static_first import serve_generated_page
 from projects.services.project_listing import (
-    build_paginated_projects_payload,
+    PROJECT_CARD_FIELDS,
+    PROJECT_CARD_INCLUDES,
+    PROJECT_CARD_KEYS,
+    PROJECTS_KEYSET_ORDERING,
+    build_project_card_payload,
     build_projects_listing_context,
+    build_projects_listing_static_html,
+    build_public_project_category_path,
+    build_public_projects_path,
     build_service_page_projects_payload,
-    get_published_projects_queryset,
+    get_project_card_fragments,
+    get_project_categories_with_counts,
+    get_published_project_cards_queryset,
+    get_published_sparse_projects_queryset,
+)
+from projects.services.project_rendering import (
+    PROJECT_DETAIL_INCLUDES,
+    PROJECT_DETAIL_KEYS,
+    build_project_blocks_payload,
+    build_project_detail_payload,
+    build_project_render_context,
+    build_public_project_path,
+    get_project_detail_queryset,
 )
-from projects.services.project_rendering import build_project_render_context
 
-from .models import ProjectCategories, Projects, ProjectsContentBlock, ServicePageProjects
+from .models import ProjectCategories, Projects, ServicePageProjects
+
+
+CATEGORY_KEYS = ("id", "title", "slug", "created_at")
+CATEGORY_INCLUDES = ("counts",)
 
 
 def _sanitize_limit(raw_value, default=10, max_value=100):
@@ -21,67 +57,177 @@ def _sanitize_limit(raw_value, default=10, max_value=100):
     return min(max(value, 1), max_value)
 
 
+def _get_projects_aggregates():
+    # One query over categories joined with their projects: project cards show the category title, and
+    # block edits bump the project's `updated_at`.
+    return ProjectCategories.objects.aggregate(
+        categories_changed_at=Max("updated_at"),
+        categories_count=Count("pk", distinct=True),
+        projects_changed_at=Max("projects__updated_at"),
+        projects_count=Count("projects", distinct=True),
+    )
+
+
+def _projects_validators(request, *args, **kwargs):
+    return build_content_validators("projects", _get_projects_aggregates())
+
+
+def _project_detail_validators(request, slug):
+    # The requested project and its category (the page shows the category title), not the whole table.
+    return build_content_validators(
+        f"project:{slug}",
+        Projects.objects.filter(slug=slug).aggregate(
+            changed_at=Max("updated_at"),
+            category_changed_at=Max("category__updated_at"),
+            count=Count("pk"),
+        ),
+    )
+
+
+def _project_page_validators(request, slug):
+    # The HTML page also lists the other published projects of its category: validate against the whole
+    # category (the project included), so publishing, unpublishing or editing one of them changes it.
+    return build_content_validators(
+        f"project-page:{slug}",
+        Projects.objects.filter(category__projects__slug=slug).aggregate(
+            changed_at=Max("updated_at"),
+            category_changed_at=Max("category__updated_at"),
+            count=Count("pk"),
+        ),
+    )
+
+
+def _project_detail_full_validators(request, slug):
+    # `include=related` lists other projects, so only then does the whole table matter.
+    if "related" in (name.strip() for name in request.GET.get("include", "").split(",")):
+        return _projects_validators(request, slug)
+    return _project_detail_validators(request, slug)
+
+
+def _service_page_projects_validators(request, slug):
+    return build_content_validators(
+        "service-page-projects",
+        _get_projects_aggregates(),
+        ServicePageProjects.objects.filter(slug=slug).aggregate(changed_at=Max("updated_at"), count=Count("pk")),
+    )
+
+
+@conditional_content(_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_all_categories(request):
-    categories = ProjectCategories.objects.all()
+    try:
+        selection = select_fields(
+            request,
+            available=CATEGORY_KEYS + CATEGORY_INCLUDES,
+            default=CATEGORY_KEYS,
+            includable=CATEGORY_INCLUDES,
+        )
+    except InvalidFieldsError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    with_counts = "counts" in selection
+    categories = get_project_categories_with_counts() if with_counts else ProjectCategories.objects.all()
 
     payload = []
     for category in categories:
-        payload.append(
-            {
-                "id": category.id,
-                "title": category.title,
-                "slug": category.slug,
-                "created_at": category.created_at,
-            }
-        )
+        item = {key: getattr(category, key) for key in selection.keys if key != "counts"}
+        if with_counts:
+            item["published_projects_count"] = category.published_projects_count
+            item["projects_updated_at"] = category.projects_updated_at
+        payload.append(item)
 
     return JsonResponse(payload, safe=False)
 
 
+@conditional_content(_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_projects_list(request):
-    context = build_projects_listing_context()
-    return render(request, "projects_listing.html", context)
+    return serve_generated_page(
+        request,
+        build_public_projects_path(),
+        render_page=lambda: render(request, "projects_listing.html", build_projects_listing_context()),
+        write_page=build_projects_listing_static_html,
+    )
 
 
+@conditional_content(_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_projects_category_list(request, slug):
     category = get_object_or_404(ProjectCategories, slug=slug)
-    context = build_projects_listing_context(active_category=category)
-    return render(request, "projects_listing.html", context)
+    return serve_generated_page(
+        request,
+        build_public_project_category_path(category.slug),
+        render_page=lambda: render(
+            request,
+            "projects_listing.html",
+            build_projects_listing_context(active_category=category),
+        ),
+        write_page=lambda: build_projects_listing_static_html(active_category=category),
+    )
 
 
+@conditional_content(_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_all_projects(request):
-    page = request.GET.get("page", 1)
-    limit = _sanitize_limit(request.GET.get("limit", 10))
+    return _get_projects_cards_response(request, page_key="current_page", include_images=True)
 
-    projects_qs = get_published_projects_queryset(include_images=True)
-    paginator = Paginator(projects_qs, limit)
-    projects_page = paginator.get_page(page)
 
-    payload = build_paginated_projects_payload(
-        projects_page,
-        page_key="current_page",
-        include_images=True,
-    )
-
-    return JsonResponse(payload, safe=False)
+@conditional_content(_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
+def get_projects_by_category(request, slug):
+    return _get_projects_cards_response(request, category_slug=slug, page_key="page")
 
 
-def get_projects_by_category(request, slug):
+def _get_projects_cards_response(request, *, category_slug=None, page_key, include_images=False):
     page = request.GET.get("page", 1)
+    cursor = request.GET.get("cursor")
     limit = _sanitize_limit(request.GET.get("limit", 10))
+    try:
+        selection = select_fields(
+            request,
+            available=PROJECT_CARD_FIELDS,
+            default=PROJECT_CARD_KEYS + (("images",) if include_images else ()),
+            includable=PROJECT_CARD_INCLUDES,
+        )
+    except InvalidFieldsError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    if selection.is_default:
+        projects_qs = get_published_project_cards_queryset(category_slug=category_slug)
+    else:
+        projects_qs = get_published_sparse_projects_queryset(selection.keys, category_slug=category_slug)
+    if cursor is not None:
+        try:
+            projects_page = paginate_by_keyset(projects_qs, PROJECTS_KEYSET_ORDERING, cursor=cursor, limit=limit)
+        except InvalidCursorError:
+            return JsonResponse({"error": "Invalid cursor."}, status=400)
+
+        payload = {
+            "has_next": projects_page.has_next,
+            "next_cursor": projects_page.next_cursor,
+        }
+    else:
+        projects_page = Paginator(projects_qs, limit).get_page(page)
+        has_next_page = projects_page.has_next()
+        payload = {
+            page_key: projects_page.number,
+            "has_next": has_next_page,
+            "has_previous": projects_page.has_previous(),
+            "next_page": projects_page.next_page_number() if has_next_page else None,
+        }
 
-    projects_qs = get_published_projects_queryset(category_slug=slug)
-    paginator = Paginator(projects_qs, limit)
-    projects_page = paginator.get_page(page)
-
-    payload = build_paginated_projects_payload(
-        projects_page,
-        page_key="page",
-    )
-
-    return JsonResponse(payload, safe=False)
+    if selection.is_default:
+        fragments = get_project_card_fragments(projects_page, include_images=include_images)
+    else:
+        fragments = [
+            dump_json_fragment(build_project_card_payload(project, keys=selection.keys))
+            for project in projects_page
+        ]
+    return build_json_list_response(payload, fragments)
 
 
+@conditional_content(_service_page_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_service_page_projects(request, slug):
     service_page = get_object_or_404(
         ServicePageProjects.objects.select_related(
@@ -95,64 +241,59 @@ def get_service_page_projects(request, slug):
     return JsonResponse(payload, safe=False)
 
 
+@conditional_content(_project_detail_validators, cache_control=DETAIL_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_projects_details(request, slug):
-    project = get_object_or_404(Projects, slug=slug, is_published=True)
+    project = get_object_or_404(Projects.objects.only("id"), slug=slug, is_published=True)
+    return JsonResponse(build_project_blocks_payload(project), safe=False)
 
-    data = []
-    for block in project.blocks.all().order_by("order"):
-        block_object_data = {
-            "type": block.type,
-        }
 
-        if block.type == ProjectsContentBlock.IMAGE:
-            block_object_data["content"] = block.media if block.media else None
-            block_object_data["media_alt"] = (block.media_alt or "").strip()
-            block_object_data["caption"] = (block.caption or "").strip()
-        elif block.type == ProjectsContentBlock.VIDEO:
-            block_object_data["content"] = block.media if block.media else None
-            block_object_data["first_video_frame"] = block.first_video_frame if block.first_video_frame else None
-            block_object_data["caption"] = (block.caption or "").strip()
-        elif block.type in {ProjectsContentBlock.TEXT, ProjectsContentBlock.HEADING}:
-            block_object_data["content"] = block.text
+@conditional_content(_project_detail_full_validators, cache_control=DETAIL_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
+def get_project_detail_full(request, slug):
+    try:
+        selection = _select_project_detail_fields(request)
+    except InvalidFieldsError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
 
-        data.append(block_object_data)
+    project = get_object_or_404(get_project_detail_queryset(selection.keys), slug=slug, is_published=True)
+    return JsonResponse(build_project_detail_payload(project, selection.keys), safe=False)
 
-    return JsonResponse(data, safe=False)
 
+@conditional_content(_projects_validators, cache_control=LIST_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
+def get_projects_batch(request):
+    try:
+        slugs = parse_batch_slugs(request.GET.get("slugs"))
+        selection = _select_project_detail_fields(request)
+    except (InvalidBatchError, InvalidFieldsError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    projects = get_project_detail_queryset(selection.keys).filter(slug__in=slugs, is_published=True)
+    projects, missing = order_by_slugs(projects, slugs)
+    return build_json_list_response(
+        {"missing": missing},
+        [dump_json_fragment(build_project_detail_payload(project, selection.keys)) for project in projects],
+    )
 
-def get_project_detail_full(request, slug):
-    project = get_object_or_404(Projects, slug=slug, is_published=True)
 
-    context = build_project_render_context(project)
-    rendered_project = context["project"]
-
-    payload = {
-        "id": rendered_project.id,
-        "slug": rendered_project.slug,
-        "title": rendered_project.title,
-        "category": {
-            "id": rendered_project.category_id,
-            "title": rendered_project.category.title,
-            "slug": rendered_project.category.slug,
-        },
-        "customer_name": rendered_project.customer_name,
-        "year": rendered_project.year,
-        "type": rendered_project.type,
-        "excerpt": rendered_project.excerpt,
-        "body_html": str(rendered_project.body_html),
-        "preview_image": rendered_project.preview_image,
-        "preview_image_alt": rendered_project.preview_image_alt,
-        "seo": rendered_project.seo,
-        "url": rendered_project.url,
-        "path": rendered_project.path,
-        "media": rendered_project.media,
-        "share_links": rendered_project.share_links,
-    }
+def _select_project_detail_fields(request):
+    return select_fields(
+        request,
+        available=PROJECT_DETAIL_KEYS + PROJECT_DETAIL_INCLUDES,
+        default=PROJECT_DETAIL_KEYS,
+        includable=PROJECT_DETAIL_INCLUDES,
+    )
 
-    return JsonResponse(payload, safe=False)
 
 
+@conditional_content(_project_page_validators, cache_control=DETAIL_CACHE_CONTROL)
+@cached_response(PROJECTS_CONTENT)
 def get_project_detail(request, slug):
     project = get_object_or_404(Projects, slug=slug, is_published=True)
-    context = build_project_render_context(project)
-    return render(request, "project_detail.html", context)
+    return serve_generated_page(
+        request,
+        build_public_project_path(project.slug),
+        render_page=lambda: render(request, "project_detail.html", build_project_render_context(project)),
+        write_page=lambda: build_item_detail_static_html(project, "project_detail.html", "projects"),
+    )
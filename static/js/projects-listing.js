@@ -104,6 +104,7 @@
         this.state = {
             page: parseInteger(shellElement?.dataset.projectsCurrentPage, 1),
             nextPage: parseInteger(shellElement?.dataset.projectsNextPage, null),
+            nextCursor: shellElement?.dataset.projectsNextCursor || "",
             hasNext: parseBoolean(shellElement?.dataset.projectsHasNext),
             isLoading: false,
             itemsCount: this.feedElement ? this.feedElement.children.length : 0,
@@ -139,7 +140,7 @@
         if (
             this.state.isLoading ||
             !this.state.hasNext ||
-            !Number.isFinite(this.state.nextPage)
+            (!this.state.nextCursor && !Number.isFinite(this.state.nextPage))
         ) {
             return;
         }
@@ -151,11 +152,12 @@
         this.clearMessage();
 
         try {
-            var payload = await this.fetchPayload(this.state.nextPage);
+            var payload = await this.fetchPayload(this.state.nextPage, this.state.nextCursor);
             var result = this.normalizePayload(payload, this.state.nextPage);
 
             this.state.page = result.page;
             this.state.nextPage = result.nextPage;
+            this.state.nextCursor = result.nextCursor;
             this.state.hasNext = result.hasNext;
             this.state.isLoading = false;
 
@@ -181,10 +183,16 @@
         this.updateLoadMoreButton();
     };
 
-    ProjectsListingController.prototype.fetchPayload = async function (page) {
+    ProjectsListingController.prototype.fetchPayload = async function (page, cursor) {
         var requestUrl = new URL(this.endpoint, window.location.origin);
         requestUrl.searchParams.set("limit", String(this.pageSize));
-        requestUrl.searchParams.set("page", String(page));
+
+        // Cursor pages skip the COUNT/OFFSET scan; page numbers stay for pages rendered before cursors existed.
+        if (cursor) {
+            requestUrl.searchParams.set("cursor", cursor);
+        } else {
+            requestUrl.searchParams.set("page", String(page));
+        }
 
         var response = await fetch(requestUrl.toString(), {
             headers: {
@@ -206,12 +214,14 @@
         var nextPage = hasNext
             ? parseInteger(payload?.next_page ?? payload?.nextPage, currentPage + 1)
             : null;
+        var nextCursor = hasNext ? payload?.next_cursor || "" : "";
 
         return {
             items: items,
             page: currentPage,
             hasNext: hasNext,
             nextPage: nextPage,
+            nextCursor: nextCursor,
         };
     };
 
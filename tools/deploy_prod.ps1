@@ -1173,7 +1173,7 @@ try {
     Invoke-Remote -Command $rebuildSitemapCmd -Description "Deploy: rebuilding sitemap.xml and sitemap page"
 
     if ($generatedPagesRoot -ne $remoteSiteRoot) {
-        $copySitemapCmd = 'set -e; generated_root="{0}"; site_root="{1}"; test -f "$generated_root/sitemap.xml"; test -f "$generated_root/sitemap/index.html"; mkdir -p "$site_root" "$site_root/sitemap"; cp "$generated_root/sitemap.xml" "$site_root/sitemap.xml"; cp "$generated_root/sitemap/index.html" "$site_root/sitemap/index.html"; chmod 644 "$site_root/sitemap.xml" "$site_root/sitemap/index.html"' -f $generatedPagesRoot, $remoteSiteRoot
+        $copySitemapCmd = 'set -e; generated_root="{0}"; site_root="{1}"; test -f "$generated_root/sitemap.xml"; test -f "$generated_root/sitemap/index.html"; mkdir -p "$site_root"; cp "$generated_root/sitemap.xml" "$site_root/sitemap.xml"; rm -rf "$site_root/sitemap"; cp -Rp "$generated_root/sitemap" "$site_root/sitemap"; chmod 644 "$site_root/sitemap.xml"; find "$site_root/sitemap" -type f -name index.html -exec chmod 644 {{}} +; rm -f "$site_root"/sitemap-*.xml "$site_root"/sitemap-*.xml.gz; for section_file in "$generated_root"/sitemap-*.xml "$generated_root"/sitemap-*.xml.gz; do [ ! -f "$section_file" ] || cp "$section_file" "$site_root/"; done' -f $generatedPagesRoot, $remoteSiteRoot
         Invoke-Remote -Command $copySitemapCmd -Description "Deploy: copying sitemap.xml and sitemap page to public site root"
     }
     else {
@@ -1182,7 +1182,7 @@ try {
 
     $chmodSitemapCmd = 'set -e; site_root="{0}"; test -f "$site_root/sitemap.xml"; chmod 644 "$site_root/sitemap.xml"' -f $remoteSiteRoot
     Invoke-Remote -Command $chmodSitemapCmd -Description "Deploy: setting public permissions on sitemap.xml"
-    $chmodSitemapPageCmd = 'set -e; site_root="{0}"; test -f "$site_root/sitemap/index.html"; chmod 644 "$site_root/sitemap/index.html"' -f $remoteSiteRoot
+    $chmodSitemapPageCmd = 'set -e; site_root="{0}"; test -f "$site_root/sitemap/index.html"; find "$site_root/sitemap" -type f -name index.html -exec chmod 644 {{}} +' -f $remoteSiteRoot
     Invoke-Remote -Command $chmodSitemapPageCmd -Description "Deploy: setting public permissions on sitemap page"
 
     Sync-PublicStaticAssets -PackageDir $packageDir -ManifestInfo $publicStaticManifest -RemoteAppRoot $remoteAppRoot -RemoteSiteRoot $remoteSiteRoot -Timestamp $timestamp
@@ -1234,10 +1234,18 @@ try {
         }
         Write-Step "CORS header is valid."
 
-        if ($sitemapResponse.Content -notmatch [regex]::Escape("<loc>{0}/</loc>" -f $remoteDomainSite)) {
+        if ($sitemapResponse.Content -match "<sitemapindex") {
+            if ($sitemapResponse.Content -notmatch [regex]::Escape("<loc>{0}/sitemap-pages-1.xml" -f $remoteDomainSite)) {
+                Fail ("Sitemap check failed. Static pages section is missing in sitemap index {0}" -f $sitemapUrl)
+            }
+            Write-Step "Sitemap index lists the static pages section."
+        }
+        elseif ($sitemapResponse.Content -notmatch [regex]::Escape("<loc>{0}/</loc>" -f $remoteDomainSite)) {
             Fail ("Sitemap check failed. Home page entry is missing in {0}" -f $sitemapUrl)
         }
-        Write-Step "Sitemap contains the home page."
+        else {
+            Write-Step "Sitemap contains the home page."
+        }
 
         if (
             $sitemapPageResponse.Content -notmatch [regex]::Escape('data-page="sitemap"') -or